@@ -7,7 +7,7 @@ from dotenv import load_dotenv
 
 from app.db.session import Base
 # Importa todos os modelos para o Alembic detectar
-from app.models import User, AthleteProfile, CoachProfile, Jump, Mark
+from app.models import User, AthleteProfile, CoachProfile, Jump, Mark, Event, AthleteSummary, AthleteMonthlySummary
 
 # Carrega .env
 load_dotenv()
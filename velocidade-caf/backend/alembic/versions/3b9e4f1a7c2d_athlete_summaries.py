@@ -0,0 +1,44 @@
+"""athlete summaries
+
+Revision ID: 3b9e4f1a7c2d
+Revises: 807155f6e686
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b9e4f1a7c2d'
+down_revision: Union[str, Sequence[str], None] = '807155f6e686'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('athlete_summaries',
+    sa.Column('athlete_id', sa.UUID(as_uuid=False), nullable=False, comment='ID do atleta (mesmo valor de jumps/marks.athlete_id)'),
+    sa.Column('total_saltos', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('soma_medias', sa.Numeric(precision=14, scale=2), server_default=sa.text('0'), nullable=False, comment='Soma de Jump.average (para media_geral)'),
+    sa.Column('melhor_salto', sa.Float(), nullable=True),
+    sa.Column('ultimo_salto', sa.Date(), nullable=True),
+    sa.Column('media_7', sa.Float(), nullable=True, comment='Média dos últimos 7 registros'),
+    sa.Column('media_28', sa.Float(), nullable=True, comment='Média dos últimos 28 registros'),
+    sa.Column('total_marcas', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('ultima_competicao', sa.Date(), nullable=True),
+    sa.Column('recordes', sa.JSON(), nullable=False, comment='Melhor marca por evento'),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['athlete_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('athlete_id')
+    )
+    # Para preencher a tabela com o histórico existente:
+    #   python rebuild_athlete_summaries.py
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('athlete_summaries')
@@ -0,0 +1,30 @@
+"""summary versions
+
+Revision ID: 5c1d2e3f4a6b
+Revises: 3b9e4f1a7c2d
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c1d2e3f4a6b'
+down_revision: Union[str, Sequence[str], None] = '3b9e4f1a7c2d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('athlete_summaries', sa.Column('versao_saltos', sa.Integer(), server_default=sa.text('0'), nullable=False))
+    op.add_column('athlete_summaries', sa.Column('versao_marcas', sa.Integer(), server_default=sa.text('0'), nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('athlete_summaries', 'versao_marcas')
+    op.drop_column('athlete_summaries', 'versao_saltos')
@@ -0,0 +1,40 @@
+"""monthly summaries
+
+Revision ID: 7d2e3f4a5b6c
+Revises: 5c1d2e3f4a6b
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d2e3f4a5b6c'
+down_revision: Union[str, Sequence[str], None] = '5c1d2e3f4a6b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('athlete_monthly_summaries',
+    sa.Column('athlete_id', sa.UUID(as_uuid=False), nullable=False, comment='ID do atleta (mesmo valor de jumps.athlete_id)'),
+    sa.Column('mes', sa.Date(), nullable=False, comment='Primeiro dia do mês'),
+    sa.Column('total_saltos', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('melhor_salto', sa.Float(), nullable=True),
+    sa.Column('media', sa.Float(), nullable=True, comment='Média de Jump.average no mês'),
+    sa.Column('consistencia', sa.Float(), nullable=True, comment='Média de Jump.consistency no mês'),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['athlete_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('athlete_id', 'mes')
+    )
+    # Para preencher a tabela com o histórico existente:
+    #   python rebuild_athlete_summaries.py
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('athlete_monthly_summaries')
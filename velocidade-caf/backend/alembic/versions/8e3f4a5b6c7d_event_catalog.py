@@ -0,0 +1,97 @@
+"""event catalog
+
+Revision ID: 8e3f4a5b6c7d
+Revises: 7d2e3f4a5b6c
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+import re
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e3f4a5b6c7d'
+down_revision: Union[str, Sequence[str], None] = '7d2e3f4a5b6c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Cópia de app.crud.event.EVENT_CATALOG no momento desta migração
+EVENTS = [
+    ("60m", "60m rasos", 60, "velocidade", True),
+    ("100m", "100m rasos", 100, "velocidade", True),
+    ("150m", "150m rasos", 150, "velocidade", True),
+    ("200m", "200m rasos", 200, "velocidade", True),
+    ("300m", "300m rasos", 300, "velocidade", True),
+    ("400m", "400m rasos", 400, "velocidade", True),
+    ("600m", "600m", 600, "meio_fundo", True),
+    ("800m", "800m", 800, "meio_fundo", True),
+    ("1000m", "1000m", 1000, "meio_fundo", True),
+    ("1500m", "1500m", 1500, "meio_fundo", True),
+    ("3000m", "3000m", 3000, "fundo", True),
+    ("5000m", "5000m", 5000, "fundo", True),
+    ("10000m", "10000m", 10000, "fundo", True),
+    ("60m_barreiras", "60m com barreiras", 60, "barreiras", True),
+    ("100m_barreiras", "100m com barreiras", 100, "barreiras", True),
+    ("110m_barreiras", "110m com barreiras", 110, "barreiras", True),
+    ("400m_barreiras", "400m com barreiras", 400, "barreiras", True),
+    ("2000m_obstaculos", "2000m com obstáculos", 2000, "obstaculos", True),
+    ("3000m_obstaculos", "3000m com obstáculos", 3000, "obstaculos", True),
+    ("4x100m", "Revezamento 4x100m", 400, "revezamento", True),
+    ("4x400m", "Revezamento 4x400m", 1600, "revezamento", True),
+]
+
+
+def _canonical(evento: str) -> str:
+    """Cópia de app.crud.event.canonical_event."""
+    text = evento.strip().lower()
+    text = re.sub(r"\s*metros\b", "m", text)
+    text = re.sub(r"\s*\brasos?\b", "", text)
+    text = re.sub(r"[\s_]*(com[\s_]+)?barreiras\b|(?<=m)h\b", "_barreiras", text)
+    text = re.sub(r"[\s_]*(com[\s_]+)?obst[aá]culos\b", "_obstaculos", text)
+    text = re.sub(r"\s+", "", text)
+    if re.fullmatch(r"\d+(x\d+)?", text):
+        text += "m"
+    return text
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    events = op.create_table('events',
+    sa.Column('id', sa.String(length=50), nullable=False, comment='Código canônico da prova'),
+    sa.Column('nome', sa.String(length=100), nullable=False, comment='Nome para exibição'),
+    sa.Column('distancia_m', sa.Integer(), nullable=True, comment='Distância em metros'),
+    sa.Column('disciplina', sa.String(length=30), nullable=False, comment='velocidade, barreiras, meio_fundo, fundo, obstaculos, revezamento'),
+    sa.Column('menor_melhor', sa.Boolean(), server_default=sa.true(), nullable=False, comment='Resultado menor é melhor (provas de tempo)'),
+    sa.CheckConstraint('distancia_m IS NULL OR distancia_m > 0', name='check_distancia_positive'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.bulk_insert(events, [
+        {"id": id_, "nome": nome, "distancia_m": distancia, "disciplina": disciplina, "menor_melhor": menor_melhor}
+        for id_, nome, distancia, disciplina, menor_melhor in EVENTS
+    ])
+
+    op.add_column('marks', sa.Column('event_id', sa.String(length=50), nullable=True, comment='Prova do catálogo (evento normalizado); nulo se não reconhecida'))
+    op.create_foreign_key('fk_marks_event_id', 'marks', 'events', ['event_id'], ['id'])
+    op.create_index('idx_marks_athlete_event_id', 'marks', ['athlete_id', 'event_id'], unique=False)
+
+    # Mapeia os textos livres já gravados para o catálogo
+    conn = op.get_bind()
+    codes = {id_ for id_, *_ in EVENTS}
+    for (evento,) in conn.execute(sa.text("SELECT DISTINCT evento FROM marks")).fetchall():
+        code = _canonical(evento)
+        if code in codes:
+            conn.execute(sa.text("UPDATE marks SET event_id = :code WHERE evento = :evento"), {"code": code, "evento": evento})
+    # Os recordes em athlete_summaries passam a usar o código da prova:
+    #   python rebuild_athlete_summaries.py
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_marks_athlete_event_id', table_name='marks')
+    op.drop_constraint('fk_marks_event_id', 'marks', type_='foreignkey')
+    op.drop_column('marks', 'event_id')
+    op.drop_table('events')
@@ -0,0 +1,42 @@
+"""mark leaderboards
+
+Revision ID: 9f4a5b6c7d8e
+Revises: 8e3f4a5b6c7d
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9f4a5b6c7d8e'
+down_revision: Union[str, Sequence[str], None] = '8e3f4a5b6c7d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Colunas guardadas nos índices de ranking (STORING no CockroachDB)
+STORED_COLUMNS = ['athlete_id', 'data', 'tipo', 'vento_legal']
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('marks', sa.Column('vento_legal', sa.Boolean(), server_default=sa.true(), nullable=False, comment='Vento até WIND_LIMIT ou não informado (mantido a partir de vento)'))
+    # Mesma regra de Mark.WIND_LIMIT (2.0 m/s)
+    op.execute("UPDATE marks SET vento_legal = false WHERE vento > 2.0")
+
+    # (evento, resultado) cobre o antigo idx_marks_evento
+    op.drop_index('idx_marks_evento', table_name='marks')
+    op.create_index('idx_marks_evento_resultado', 'marks', ['evento', 'resultado'], unique=False, postgresql_include=STORED_COLUMNS)
+    op.create_index('idx_marks_event_id_resultado', 'marks', ['event_id', 'resultado'], unique=False, postgresql_include=STORED_COLUMNS)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_marks_event_id_resultado', table_name='marks')
+    op.drop_index('idx_marks_evento_resultado', table_name='marks')
+    op.create_index('idx_marks_evento', 'marks', ['evento'], unique=False)
+    op.drop_column('marks', 'vento_legal')
@@ -0,0 +1,50 @@
+"""offline sync
+
+Revision ID: a1b2c3d4e5f6
+Revises: 9f4a5b6c7d8e
+Create Date: 2026-10-17 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a1b2c3d4e5f6'
+down_revision: Union[str, Sequence[str], None] = '9f4a5b6c7d8e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('tombstones',
+    sa.Column('id', sa.UUID(as_uuid=False), server_default=sa.text('gen_random_uuid()'), nullable=False),
+    sa.Column('tipo', sa.String(length=10), nullable=False, comment='salto ou marca'),
+    sa.Column('record_id', sa.UUID(as_uuid=False), nullable=False, comment='ID do registro removido'),
+    sa.Column('athlete_id', sa.UUID(as_uuid=False), nullable=False, comment='Dono do registro (mesmo valor de jumps/marks.athlete_id)'),
+    sa.Column('deleted_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_tombstones_athlete_deleted', 'tombstones', ['athlete_id', 'tipo', 'deleted_at'], unique=False)
+
+    op.create_table('applied_mutations',
+    sa.Column('user_id', sa.UUID(as_uuid=False), nullable=False),
+    sa.Column('chave', sa.String(length=100), nullable=False, comment='Chave de idempotência do cliente'),
+    sa.Column('tipo', sa.String(length=10), nullable=False, comment='salto ou marca'),
+    sa.Column('status', sa.String(length=20), nullable=False, comment='aplicada, conflito ou erro'),
+    sa.Column('record_id', sa.UUID(as_uuid=False), nullable=True, comment='ID do registro afetado'),
+    sa.Column('motivo', sa.String(length=255), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'chave')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('applied_mutations')
+    op.drop_index('idx_tombstones_athlete_deleted', table_name='tombstones')
+    op.drop_table('tombstones')
@@ -0,0 +1,55 @@
+"""changes feeds
+
+Revision ID: b7c8d9e0f1a2
+Revises: a1b2c3d4e5f6
+Create Date: 2026-10-17 22:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7c8d9e0f1a2'
+down_revision: Union[str, Sequence[str], None] = 'a1b2c3d4e5f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('idx_jumps_athlete_updated', 'jumps', ['athlete_id', 'updated_at'], unique=False)
+    op.create_index('idx_marks_athlete_updated', 'marks', ['athlete_id', 'updated_at'], unique=False)
+    op.drop_index('idx_athlete_coach_id', table_name='athlete_profiles')
+    op.create_index('idx_athlete_coach_updated', 'athlete_profiles', ['coach_id', 'updated_at'], unique=False)
+    op.alter_column('tombstones', 'tipo',
+               existing_type=sa.String(length=10),
+               comment='salto, marca ou atleta',
+               existing_comment='salto ou marca',
+               existing_nullable=False)
+    op.alter_column('tombstones', 'athlete_id',
+               existing_type=sa.UUID(as_uuid=False),
+               comment='Dono do registro: jumps/marks.athlete_id, ou o treinador (athlete_profiles.coach_id) para atletas',
+               existing_comment='Dono do registro (mesmo valor de jumps/marks.athlete_id)',
+               existing_nullable=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column('tombstones', 'athlete_id',
+               existing_type=sa.UUID(as_uuid=False),
+               comment='Dono do registro (mesmo valor de jumps/marks.athlete_id)',
+               existing_comment='Dono do registro: jumps/marks.athlete_id, ou o treinador (athlete_profiles.coach_id) para atletas',
+               existing_nullable=False)
+    op.alter_column('tombstones', 'tipo',
+               existing_type=sa.String(length=10),
+               comment='salto ou marca',
+               existing_comment='salto, marca ou atleta',
+               existing_nullable=False)
+    op.execute("DELETE FROM tombstones WHERE tipo = 'atleta'")
+    op.drop_index('idx_athlete_coach_updated', table_name='athlete_profiles')
+    op.create_index('idx_athlete_coach_id', 'athlete_profiles', ['coach_id'], unique=False)
+    op.drop_index('idx_marks_athlete_updated', table_name='marks')
+    op.drop_index('idx_jumps_athlete_updated', table_name='jumps')
@@ -1,42 +1,152 @@
 """
 Dependências para rotas da API.
 """
-from typing import Generator, Optional
-from fastapi import Depends, HTTPException, status
-from sqlalchemy.orm import Session
+import secrets
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncGenerator, AsyncIterator, Optional, Tuple
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.security.utils import get_authorization_scheme_param
 
-from app.db.session import SessionLocal
+from app.config import settings
+
+from app.db.session import AsyncReadSessionLocal, AsyncSessionLocal, DBSession, ReadSessionLocal, SessionLocal, session_slot
 from app.core.security import oauth2_scheme, verify_token
-from app.crud import user as crud_user
+from app.core.token_cache import token_cache
+from app.crud.aio import athlete as crud_athlete, user as crud_user
+from app.crud.user import user_snapshot
 from app.models.user import User
 
 
-def get_db() -> Generator:
-    """Dependência para obter sessão do banco."""
-    db = SessionLocal()
-    try:
+@asynccontextmanager
+async def open_db(read_only: bool = False) -> AsyncIterator[DBSession]:
+    """
+    Abre uma sessão do banco fora do ciclo de dependências.
+    
+    Retorna uma AsyncSession quando settings.DB_ASYNC está ativo; caso
+    contrário, uma Session síncrona (as chamadas de CRUD rodam no
+    threadpool, ver app.db.session.run_db). O número de sessões abertas
+    é limitado ao tamanho do pool (ver session_slot).
+    
+    Com ``read_only`` a sessão usa a engine de leitura (réplica ou
+    follower reads, se configuradas).
+    """
+    async with session_slot(read_only):
+        async_factory = AsyncReadSessionLocal if read_only else AsyncSessionLocal
+        if async_factory is not None:
+            async with async_factory() as db:
+                yield db
+            return
+        
+        db = ReadSessionLocal() if read_only else SessionLocal()
+        try:
+            yield db
+        finally:
+            await run_in_threadpool(db.close)
+
+
+async def get_db() -> AsyncGenerator[DBSession, None]:
+    """Dependência para obter sessão do banco (ver open_db)."""
+    async with open_db() as db:
         yield db
-    finally:
-        db.close()
 
 
-def get_current_user(
-    db: Session = Depends(get_db),
-    token: str = Depends(oauth2_scheme)
-) -> User:
+async def get_read_db() -> AsyncGenerator[DBSession, None]:
     """
-    Obtém o usuário atual autenticado.
+    Sessão somente leitura para rotas GET de listagem e análise.
     
-    Args:
-        db: Sessão do banco
-        token: Token JWT do header Authorization
+    Com READ_DATABASE_URL ou DB_FOLLOWER_READS os dados podem estar
+    alguns segundos atrás do primário. Escritas e leituras que precisam
+    ver a própria escrita (perfil, registro por ID) continuam em get_db.
+    """
+    async with open_db(read_only=True) as db:
+        yield db
+
+
+@dataclass(frozen=True)
+class Principal:
+    """
+    Identidade da requisição: usuário, papel e IDs dos perfis.
     
-    Returns:
-        Usuário autenticado
+    Resolvida uma única vez por requisição (o FastAPI guarda o resultado
+    de ``get_principal`` para todas as dependências que o usam), com uma
+    única consulta ou a partir do cache de tokens.
     
-    Raises:
-        HTTPException: Se o token for inválido ou usuário não existir
+    Vinda do cache, a identidade pode estar até TOKEN_CACHE_TTL_SECONDS
+    atrasada em relação a alterações feitas por outro processo (o CRUD só
+    invalida o cache do próprio processo). Em particular, se o atleta
+    trocar de treinador em outro worker, ``athlete_coach_id`` continua
+    apontando para o treinador anterior nesse intervalo e os eventos em
+    tempo real das gravações do atleta vão para ele; o painel do novo
+    treinador vê as alterações ao consultar /coaches/me/changes.
     """
+    user: User
+    athlete_id: Optional[str] = None  # ID do perfil de atleta (marcas)
+    coach_id: Optional[str] = None  # ID do perfil de treinador
+    athlete_coach_id: Optional[str] = None  # treinador do atleta (eventos em tempo real)
+    
+    @property
+    def id(self) -> str:
+        """USER_ID (saltos são gravados com ele)."""
+        return self.user.id
+    
+    @property
+    def role(self) -> str:
+        return self.user.role
+    
+    @property
+    def is_coach(self) -> bool:
+        return self.user.role == "treinador"
+    
+    def require_athlete_profile(self) -> str:
+        """ID do perfil de atleta; 404 se o perfil ainda não foi criado."""
+        if self.athlete_id is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Perfil de atleta não encontrado"
+            )
+        return self.athlete_id
+    
+    def require_coach_profile(self) -> str:
+        """ID do perfil de treinador; 404 se o perfil ainda não foi criado."""
+        if self.coach_id is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Perfil de treinador não encontrado"
+            )
+        return self.coach_id
+    
+    def can_view_athlete(self, athlete_id: str) -> bool:
+        """Treinadores veem qualquer atleta; atletas, apenas o próprio perfil."""
+        return self.is_coach or athlete_id == self.athlete_id
+
+
+async def resolve_athlete_user_id(db: DBSession, principal: Principal, athlete_id: str, forbidden_detail: str) -> str:
+    """
+    USER_ID do atleta ``athlete_id`` (ID do perfil) que o principal pode ver.
+    
+    O próprio atleta é resolvido sem consulta; treinadores fazem uma
+    consulta para confirmar que o perfil existe.
+    """
+    if athlete_id == principal.athlete_id:
+        return principal.id
+    if not principal.can_view_athlete(athlete_id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=forbidden_detail
+        )
+    user_id = await crud_athlete.get_athlete_user_id(db, athlete_id)
+    if user_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Atleta não encontrado"
+        )
+    return user_id
+
+
+def _token_user_id(token: str) -> Tuple[str, dict]:
+    """Valida o token e retorna (ID do usuário, payload)."""
     payload = verify_token(token)
     user_id: Optional[str] = payload.get("sub")
     
@@ -46,9 +156,10 @@ def get_current_user(
             detail="Token inválido",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    
-    user = crud_user.get_user_by_id(db, user_id=user_id)
-    
+    return user_id, payload
+
+
+def _check_user(user: Optional[User]) -> User:
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -60,51 +171,142 @@ def get_current_user(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Usuário inativo"
         )
-    
     return user
 
 
-def get_current_active_athlete(
-    current_user: User = Depends(get_current_user)
-) -> User:
+async def _resolve_principal(db: DBSession, token: str) -> Principal:
     """
-    Verifica se o usuário atual é um atleta ativo.
+    Valida o token e carrega usuário e IDs dos perfis em uma consulta
+    (ver crud.user.get_user_with_profiles).
     
-    Args:
-        current_user: Usuário autenticado
+    Tokens já verificados são atendidos pelo cache (app.core.token_cache),
+    sem decodificar o JWT nem consultar o banco.
+    """
+    cached = token_cache.get(token)
+    if cached is not None:
+        user = await crud_user.attach_user(db, cached["user"])
+        return Principal(user, cached["athlete_id"], cached["coach_id"], cached["athlete_coach_id"])
     
-    Returns:
-        Usuário atleta
+    user_id, payload = _token_user_id(token)
+    row = await crud_user.get_user_with_profiles(db, user_id)
+    user, athlete_id, coach_id, athlete_coach_id = row if row is not None else (None, None, None, None)
+    _check_user(user)
+    
+    token_cache.set(
+        token,
+        {
+            "id": user.id,
+            "user": user_snapshot(user),
+            "athlete_id": athlete_id,
+            "coach_id": coach_id,
+            "athlete_coach_id": athlete_coach_id,
+        },
+        payload.get("exp"),
+    )
+    return Principal(user, athlete_id, coach_id, athlete_coach_id)
+
+
+async def get_principal(
+    db: DBSession = Depends(get_db),
+    token: str = Depends(oauth2_scheme)
+) -> Principal:
+    """
+    Obtém a identidade da requisição (usuário autenticado e perfis).
+    
+    Carrega apenas as colunas do usuário; saltos e marcas não são
+    carregados. Rotas que precisam do histórico o consultam pelo CRUD
+    (com paginação) a partir de ``principal.id``.
+    
+    Raises:
+        HTTPException: Se o token for inválido ou usuário não existir
+    """
+    return await _resolve_principal(db, token)
+
+
+async def principal_from_token(token: str) -> Principal:
+    """
+    Resolve a identidade com uma sessão própria, já devolvida ao pool.
+    
+    Para rotas de longa duração (streams), que não devem manter uma
+    conexão do banco aberta enquanto a resposta é enviada.
+    """
+    async with open_db() as db:
+        return await _resolve_principal(db, token)
+
+
+async def get_current_user(principal: Principal = Depends(get_principal)) -> User:
+    """Obtém o usuário atual autenticado (ver get_principal)."""
+    return principal.user
+
+
+async def get_athlete_principal(
+    principal: Principal = Depends(get_principal)
+) -> Principal:
+    """
+    Verifica se o usuário atual é um atleta ativo.
     
     Raises:
         HTTPException: Se não for um atleta
     """
-    if current_user.role != "atleta":
+    if principal.role != "atleta":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Acesso permitido apenas para atletas"
         )
-    return current_user
+    return principal
 
 
-def get_current_active_coach(
-    current_user: User = Depends(get_current_user)
-) -> User:
+async def get_coach_principal(
+    principal: Principal = Depends(get_principal)
+) -> Principal:
     """
     Verifica se o usuário atual é um treinador ativo.
     
-    Args:
-        current_user: Usuário autenticado
-    
-    Returns:
-        Usuário treinador
-    
     Raises:
         HTTPException: Se não for um treinador
     """
-    if current_user.role != "treinador":
+    if not principal.is_coach:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Acesso permitido apenas para treinadores"
         )
-    return current_user
\ No newline at end of file
+    return principal
+
+
+async def get_current_active_athlete(
+    principal: Principal = Depends(get_athlete_principal)
+) -> User:
+    """Usuário atleta autenticado (ver get_athlete_principal)."""
+    return principal.user
+
+
+async def get_current_active_coach(
+    principal: Principal = Depends(get_coach_principal)
+) -> User:
+    """Usuário treinador autenticado (ver get_coach_principal)."""
+    return principal.user
+
+
+async def require_metrics_token(request: Request) -> None:
+    """
+    Autoriza o coletor de métricas pelo METRICS_TOKEN.
+    
+    Sem METRICS_TOKEN configurado a rota responde 404, como se não
+    existisse.
+    
+    Raises:
+        HTTPException: Se as métricas estiverem desativadas ou o token não conferir
+    """
+    if not settings.METRICS_TOKEN:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Not Found"
+        )
+    
+    scheme, token = get_authorization_scheme_param(request.headers.get("Authorization"))
+    if scheme.lower() != "bearer" or not secrets.compare_digest(token.encode(), settings.METRICS_TOKEN.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token de métricas inválido",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
@@ -4,7 +4,7 @@ API v1 endpoints.
 
 from fastapi import APIRouter
 
-from app.api.v1 import users, athletes, coaches, jumps, marks
+from app.api.v1 import users, athletes, coaches, jumps, marks, events, export, metrics, sync, realtime
 
 api_router = APIRouter()
 
@@ -12,4 +12,9 @@ api_router.include_router(users.router, prefix="/users", tags=["users"])
 api_router.include_router(athletes.router, prefix="/athletes", tags=["athletes"])
 api_router.include_router(coaches.router, prefix="/coaches", tags=["coaches"])
 api_router.include_router(jumps.router, prefix="/jumps", tags=["jumps"])
-api_router.include_router(marks.router, prefix="/marks", tags=["marks"])
\ No newline at end of file
+api_router.include_router(marks.router, prefix="/marks", tags=["marks"])
+api_router.include_router(events.router, prefix="/events", tags=["events"])
+api_router.include_router(export.router, prefix="/export", tags=["export"])
+api_router.include_router(metrics.router, prefix="/metrics", tags=["metrics"])
+api_router.include_router(sync.router, prefix="/sync", tags=["sync"])
+api_router.include_router(realtime.router, prefix="/realtime", tags=["realtime"])
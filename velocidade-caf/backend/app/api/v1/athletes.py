@@ -1,48 +1,48 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 
-from app.api.deps import get_db, get_current_user, get_current_active_athlete
+from app.config import settings
+from app.db.session import DBSession
+from app.core.fastjson import fast_json
+from app.api.deps import Principal, get_db, get_read_db, get_principal, get_athlete_principal
 from app.schemas import (
     AthleteProfileCreate,
     AthleteProfileUpdate,
     AthleteProfileResponse
 )
-from app.crud import athlete as crud_athlete
-from app.models.user import User
+from app.crud.aio import athlete as crud_athlete
 
 router = APIRouter()
 
 
 @router.post("/", response_model=AthleteProfileResponse, status_code=status.HTTP_201_CREATED)
-def create_athlete_profile(
+async def create_athlete_profile(
     athlete_in: AthleteProfileCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_athlete)
+    db: DBSession = Depends(get_db),
+    principal: Principal = Depends(get_athlete_principal)
 ):
     """Cria perfil de atleta (apenas atletas podem criar seu próprio perfil)."""
     # Verifica se já existe perfil
-    existing = crud_athlete.get_athlete_by_user_id(db, current_user.id)
-    if existing:
+    if principal.athlete_id is not None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Perfil de atleta já existe"
         )
     
     # Força o user_id do usuário autenticado
-    athlete_in.user_id = current_user.id
+    athlete_in.user_id = principal.id
     
-    athlete = crud_athlete.create_athlete(db, athlete_in)
+    athlete = await crud_athlete.create_athlete(db, athlete_in)
     return athlete
 
 
 @router.get("/me", response_model=AthleteProfileResponse)
-def get_my_profile(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_athlete)
+async def get_my_profile(
+    db: DBSession = Depends(get_db),
+    principal: Principal = Depends(get_athlete_principal)
 ):
     """Retorna perfil do atleta autenticado."""
-    athlete = crud_athlete.get_athlete_by_user_id(db, current_user.id)
+    athlete = await crud_athlete.get_athlete_by_id(db, principal.require_athlete_profile())
     if not athlete:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -52,60 +52,62 @@ def get_my_profile(
 
 
 @router.put("/me", response_model=AthleteProfileResponse)
-def update_my_profile(
+async def update_my_profile(
     athlete_in: AthleteProfileUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_athlete)
+    db: DBSession = Depends(get_db),
+    principal: Principal = Depends(get_athlete_principal)
 ):
     """Atualiza perfil do atleta autenticado."""
-    athlete = crud_athlete.get_athlete_by_user_id(db, current_user.id)
+    athlete = await crud_athlete.update_athlete(db, principal.require_athlete_profile(), athlete_in)
     if not athlete:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Perfil de atleta não encontrado"
         )
-    
-    athlete = crud_athlete.update_athlete(db, athlete, athlete_in)
     return athlete
 
 
 @router.get("/{athlete_id}", response_model=AthleteProfileResponse)
-def get_athlete(
+async def get_athlete(
     athlete_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: DBSession = Depends(get_db),
+    principal: Principal = Depends(get_principal)
 ):
     """Busca atleta por ID (treinadores podem ver qualquer atleta)."""
-    athlete = crud_athlete.get_athlete_by_id(db, athlete_id)
-    if not athlete:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Atleta não encontrado"
-        )
-    
     # Apenas treinador ou o próprio atleta podem ver
-    if current_user.role != "treinador" and athlete.user_id != current_user.id:
+    if not principal.can_view_athlete(athlete_id):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Sem permissão para visualizar este atleta"
         )
     
+    athlete = await crud_athlete.get_athlete_by_id(db, athlete_id)
+    if not athlete:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Atleta não encontrado"
+        )
+    
     return athlete
 
 
 @router.get("/", response_model=List[AthleteProfileResponse])
-def list_athletes(
+async def list_athletes(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: DBSession = Depends(get_read_db),
+    principal: Principal = Depends(get_principal)
 ):
     """Lista atletas (apenas treinadores)."""
-    if current_user.role != "treinador":
+    if not principal.is_coach:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Apenas treinadores podem listar atletas"
         )
     
-    athletes = crud_athlete.get_athletes(db, skip=skip, limit=limit)
+    if settings.FAST_JSON_RESPONSES:
+        return fast_json(await crud_athlete.get_athlete_rows(db, skip=skip, limit=limit), response)
+    
+    athletes = await crud_athlete.get_athletes(db, skip=skip, limit=limit)
     return athletes
\ No newline at end of file
@@ -1,49 +1,50 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 
-from app.api.deps import get_db, get_current_user, get_current_active_coach
+from app.db.session import DBSession
+from app.api.deps import Principal, get_db, get_read_db, get_principal, get_coach_principal
 from app.schemas import (
     CoachProfileCreate,
     CoachProfileUpdate,
     CoachProfileResponse,
-    AthleteProfileResponse
+    AthleteProfileResponse,
+    CoachDashboardResponse,
+    RosterChanges,
 )
-from app.crud import coach as crud_coach, athlete as crud_athlete
-from app.models.user import User
+from app.crud.aio import coach as crud_coach, athlete as crud_athlete
+from app.services import sync as sync_service
 
 router = APIRouter()
 
 
 @router.post("/", response_model=CoachProfileResponse, status_code=status.HTTP_201_CREATED)
-def create_coach_profile(
+async def create_coach_profile(
     coach_in: CoachProfileCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_coach)
+    db: DBSession = Depends(get_db),
+    principal: Principal = Depends(get_coach_principal)
 ):
     """Cria perfil de treinador."""
     # Verifica se já existe perfil
-    existing = crud_coach.get_coach_by_user_id(db, current_user.id)
-    if existing:
+    if principal.coach_id is not None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Perfil de treinador já existe"
         )
     
     # Força o user_id do usuário autenticado
-    coach_in.user_id = current_user.id
+    coach_in.user_id = principal.id
     
-    coach = crud_coach.create_coach(db, coach_in)
+    coach = await crud_coach.create_coach(db, coach_in)
     return coach
 
 
 @router.get("/me", response_model=CoachProfileResponse)
-def get_my_profile(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_coach)
+async def get_my_profile(
+    db: DBSession = Depends(get_db),
+    principal: Principal = Depends(get_coach_principal)
 ):
     """Retorna perfil do treinador autenticado."""
-    coach = crud_coach.get_coach_by_user_id(db, current_user.id)
+    coach = await crud_coach.get_coach_by_id(db, principal.require_coach_profile())
     if not coach:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -53,50 +54,71 @@ def get_my_profile(
 
 
 @router.put("/me", response_model=CoachProfileResponse)
-def update_my_profile(
+async def update_my_profile(
     coach_in: CoachProfileUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_coach)
+    db: DBSession = Depends(get_db),
+    principal: Principal = Depends(get_coach_principal)
 ):
     """Atualiza perfil do treinador autenticado."""
-    coach = crud_coach.get_coach_by_user_id(db, current_user.id)
+    coach = await crud_coach.update_coach(db, principal.require_coach_profile(), coach_in)
     if not coach:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Perfil de treinador não encontrado"
         )
-    
-    coach = crud_coach.update_coach(db, coach, coach_in)
     return coach
 
 
 @router.get("/me/athletes", response_model=List[AthleteProfileResponse])
-def get_my_athletes(
+async def get_my_athletes(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_coach)
+    db: DBSession = Depends(get_read_db),
+    principal: Principal = Depends(get_coach_principal)
 ):
     """Lista atletas do treinador autenticado."""
-    coach = crud_coach.get_coach_by_user_id(db, current_user.id)
-    if not coach:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Perfil de treinador não encontrado"
-        )
-    
-    athletes = crud_athlete.get_athletes_by_coach(db, coach.id, skip=skip, limit=limit)
+    athletes = await crud_athlete.get_athletes_by_coach(db, principal.require_coach_profile(), skip=skip, limit=limit)
     return athletes
 
 
+@router.get("/me/dashboard", response_model=CoachDashboardResponse)
+async def get_my_dashboard(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=200),
+    db: DBSession = Depends(get_read_db),
+    principal: Principal = Depends(get_coach_principal)
+):
+    """
+    Painel do treinador: elenco paginado com último salto, estatísticas
+    de saltos e recordes de cada atleta em uma única chamada.
+    """
+    return await crud_coach.get_coach_dashboard(db, principal.require_coach_profile(), skip=skip, limit=limit)
+
+
+@router.get("/me/changes", response_model=RosterChanges)
+async def get_my_roster_changes(
+    since: Optional[str] = Query(None, description="Token devolvido na consulta anterior"),
+    db: DBSession = Depends(get_db),
+    principal: Principal = Depends(get_coach_principal)
+):
+    """
+    Alterações no elenco do treinador autenticado desde ``since``:
+    atletas que entraram, mudaram ou saíram e seus saltos e marcas.
+    
+    Para atualizar o painel sem recarregá-lo: sem alterações, custa uma
+    única consulta indexada. Sem ``since``, traz o elenco inteiro.
+    """
+    return await sync_service.roster_changes(db, principal.require_coach_profile(), since)
+
+
 @router.get("/{coach_id}", response_model=CoachProfileResponse)
-def get_coach(
+async def get_coach(
     coach_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: DBSession = Depends(get_db),
+    principal: Principal = Depends(get_principal)
 ):
     """Busca treinador por ID."""
-    coach = crud_coach.get_coach_by_id(db, coach_id)
+    coach = await crud_coach.get_coach_by_id(db, coach_id)
     if not coach:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -106,12 +128,12 @@ def get_coach(
 
 
 @router.get("/", response_model=List[CoachProfileResponse])
-def list_coaches(
+async def list_coaches(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: DBSession = Depends(get_read_db),
+    principal: Principal = Depends(get_principal)
 ):
     """Lista todos os treinadores."""
-    coaches = crud_coach.get_coaches(db, skip=skip, limit=limit)
+    coaches = await crud_coach.get_coaches(db, skip=skip, limit=limit)
     return coaches
\ No newline at end of file
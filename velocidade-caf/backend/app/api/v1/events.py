@@ -0,0 +1,18 @@
+from typing import List
+from fastapi import APIRouter, Depends
+
+from app.db.session import DBSession
+from app.api.deps import Principal, get_read_db, get_principal
+from app.schemas import EventResponse
+from app.crud.aio import event as crud_event
+
+router = APIRouter()
+
+
+@router.get("/", response_model=List[EventResponse])
+async def list_events(
+    db: DBSession = Depends(get_read_db),
+    principal: Principal = Depends(get_principal)
+):
+    """Lista o catálogo de provas (código, distância, disciplina)."""
+    return await crud_event.get_events(db)
@@ -0,0 +1,52 @@
+from fastapi import APIRouter, Depends, Query
+
+from app.api.deps import Principal, get_athlete_principal, get_coach_principal
+from app.crud import jump as crud_jump_sql, mark as crud_mark_sql
+from app.services.export import export_response
+
+router = APIRouter()
+
+FORMATO = Query("csv", pattern="^(csv|ndjson)$", description="Formato do arquivo")
+
+
+@router.get("/jumps")
+async def export_my_jumps(
+    formato: str = FORMATO,
+    principal: Principal = Depends(get_athlete_principal)
+):
+    """Exporta todo o histórico de saltos do atleta autenticado."""
+    principal.require_athlete_profile()
+
+    # Usa USER_ID, não profile ID
+    stmt = crud_jump_sql.get_export_statement(athlete_id=principal.id)
+    return export_response(stmt, formato, "saltos")
+
+
+@router.get("/marks")
+async def export_my_marks(
+    formato: str = FORMATO,
+    principal: Principal = Depends(get_athlete_principal)
+):
+    """Exporta todo o histórico de marcas do atleta autenticado."""
+    stmt = crud_mark_sql.get_export_statement(athlete_id=principal.require_athlete_profile())
+    return export_response(stmt, formato, "marcas")
+
+
+@router.get("/roster/jumps")
+async def export_roster_jumps(
+    formato: str = FORMATO,
+    principal: Principal = Depends(get_coach_principal)
+):
+    """Exporta os saltos de todos os atletas do treinador autenticado."""
+    stmt = crud_jump_sql.get_export_statement(coach_id=principal.require_coach_profile())
+    return export_response(stmt, formato, "saltos-equipe")
+
+
+@router.get("/roster/marks")
+async def export_roster_marks(
+    formato: str = FORMATO,
+    principal: Principal = Depends(get_coach_principal)
+):
+    """Exporta as marcas de todos os atletas do treinador autenticado."""
+    stmt = crud_mark_sql.get_export_statement(coach_id=principal.require_coach_profile())
+    return export_response(stmt, formato, "marcas-equipe")
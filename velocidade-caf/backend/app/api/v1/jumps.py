@@ -1,91 +1,143 @@
-from typing import List
+from typing import List, Optional
 from datetime import date
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
 
-from app.api.deps import get_db, get_current_user, get_current_active_athlete
-from app.schemas import JumpCreate, JumpUpdate, JumpResponse
-from app.crud import jump as crud_jump, athlete as crud_athlete
-from app.models.user import User
+from app.config import settings
+from app.db.session import DBSession
+from app.core.conditional import not_modified, summary_etag
+from app.core.fastjson import fast_json
+from app.core.pagination import decode_cursor, set_next_cursor
+from app.core.realtime import publish_athlete_event
+from app.api.deps import (
+    Principal,
+    get_db,
+    get_read_db,
+    get_principal,
+    get_athlete_principal,
+    resolve_athlete_user_id,
+)
+from app.schemas import JumpCreate, JumpUpdate, JumpResponse, JumpImportResult, JumpTrends, JumpCalendar, JumpChanges
+from app.crud.aio import jump as crud_jump, summary as crud_summary
+from app.services import jump_import, trends, sync as sync_service
 
 router = APIRouter()
 
 
 @router.post("/", response_model=JumpResponse, status_code=status.HTTP_201_CREATED)
-def create_jump(
+async def create_jump(
     jump_in: JumpCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_athlete)
+    db: DBSession = Depends(get_db),
+    principal: Principal = Depends(get_athlete_principal)
 ):
-    """Cria registro de salto."""
-    # Verifica se o atleta existe e pertence ao usuário
-    athlete = crud_athlete.get_athlete_by_user_id(db, current_user.id)
-    if not athlete:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Perfil de atleta não encontrado"
-        )
+    """Cria registro de salto (um novo envio no mesmo dia sobrescreve o registro do dia)."""
+    # Verifica se o atleta tem perfil
+    principal.require_athlete_profile()
     
     # Força o athlete_id com o USER_ID (não o profile ID)
-    jump_in.athlete_id = current_user.id
+    jump_in.athlete_id = principal.id
     
-    jump = crud_jump.create_jump(db, jump_in)
+    jump = await crud_jump.create_jump(db, jump_in)
+    await publish_athlete_event(principal.athlete_coach_id, principal.athlete_id, "salto", "criar", [jump.id])
     return jump
 
 
+@router.post("/import", response_model=JumpImportResult)
+async def import_jumps(
+    request: Request,
+    formato: Optional[str] = Query(None, pattern="^(csv|ndjson)$", description="Padrão: deduzido do Content-Type"),
+    atualizar_existentes: bool = Query(True, description="Sobrescreve saltos de dias já registrados"),
+    db: DBSession = Depends(get_db),
+    principal: Principal = Depends(get_athlete_principal)
+):
+    """
+    Importa saltos em lote a partir de CSV ou NDJSON (corpo da requisição).
+    
+    As linhas são validadas e gravadas em lotes; o relatório lista as
+    linhas rejeitadas e o motivo.
+    """
+    principal.require_athlete_profile()
+    
+    # Usa USER_ID, não profile ID
+    result = await jump_import.import_jumps(
+        db,
+        principal.id,
+        request.stream(),
+        formato or jump_import.detect_format(request.headers.get("content-type")),
+        update_existing=atualizar_existentes,
+    )
+    if result.gravadas:
+        await publish_athlete_event(principal.athlete_coach_id, principal.athlete_id, "salto", "importar")
+    return result
+
+
 @router.get("/me", response_model=List[JumpResponse])
-def get_my_jumps(
+async def get_my_jumps(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_athlete)
+    cursor: Optional[str] = Query(None, description="Cursor da próxima página (header X-Next-Cursor)"),
+    db: DBSession = Depends(get_read_db),
+    principal: Principal = Depends(get_athlete_principal)
 ):
-    """Lista saltos do atleta autenticado."""
-    athlete = crud_athlete.get_athlete_by_user_id(db, current_user.id)
-    if not athlete:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Perfil de atleta não encontrado"
-        )
+    """
+    Lista saltos do atleta autenticado.
+    
+    Paginação por ``skip`` ou, preferencialmente, por ``cursor``: o
+    cursor da próxima página vem no header X-Next-Cursor.
+    """
+    principal.require_athlete_profile()
+    
+    cached = not_modified(request, response, summary_etag(await crud_summary.get_summary(db, principal.id), "saltos"))
+    if cached:
+        return cached
     
     # Usa USER_ID, não profile ID
-    jumps = crud_jump.get_jumps_by_athlete(db, current_user.id, skip=skip, limit=limit)
+    if settings.FAST_JSON_RESPONSES:
+        rows = await crud_jump.get_jump_rows_by_athlete(db, principal.id, skip=skip, limit=limit, after=decode_cursor(cursor))
+        set_next_cursor(response, rows, limit, "date")
+        return fast_json(rows, response)
+    
+    jumps = await crud_jump.get_jumps_by_athlete(db, principal.id, skip=skip, limit=limit, after=decode_cursor(cursor))
+    set_next_cursor(response, jumps, limit, "date")
     return jumps
 
 
 @router.get("/me/statistics")
-def get_my_jump_statistics(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_athlete)
+async def get_my_jump_statistics(
+    request: Request,
+    response: Response,
+    db: DBSession = Depends(get_read_db),
+    principal: Principal = Depends(get_athlete_principal)
 ):
     """Retorna estatísticas dos saltos do atleta autenticado."""
-    athlete = crud_athlete.get_athlete_by_user_id(db, current_user.id)
-    if not athlete:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Perfil de atleta não encontrado"
-        )
+    principal.require_athlete_profile()
+    
+    cached = not_modified(request, response, summary_etag(await crud_summary.get_summary(db, principal.id), "saltos"))
+    if cached:
+        return cached
     
     # Usa USER_ID, não profile ID
-    stats = crud_jump.get_jump_statistics(db, current_user.id)
+    stats = await crud_summary.get_jump_statistics(db, principal.id)
     return stats
 
 
 @router.get("/me/best", response_model=JumpResponse)
-def get_my_best_jump(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_athlete)
+async def get_my_best_jump(
+    request: Request,
+    response: Response,
+    db: DBSession = Depends(get_read_db),
+    principal: Principal = Depends(get_athlete_principal)
 ):
     """Retorna o melhor salto do atleta autenticado."""
-    athlete = crud_athlete.get_athlete_by_user_id(db, current_user.id)
-    if not athlete:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Perfil de atleta não encontrado"
-        )
+    principal.require_athlete_profile()
+    
+    cached = not_modified(request, response, summary_etag(await crud_summary.get_summary(db, principal.id), "saltos"))
+    if cached:
+        return cached
     
     # Usa USER_ID, não profile ID
-    best_jump = crud_jump.get_best_jump(db, current_user.id)
+    best_jump = await crud_jump.get_best_jump(db, principal.id)
     if not best_jump:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -95,106 +147,208 @@ def get_my_best_jump(
     return best_jump
 
 
+def _check_period(inicio: Optional[date], fim: Optional[date]) -> None:
+    if inicio and fim and inicio > fim:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Data inicial deve ser anterior à data final"
+        )
+
+
+@router.get("/me/trends", response_model=JumpTrends)
+async def get_my_jump_trends(
+    request: Request,
+    response: Response,
+    inicio: Optional[date] = Query(None, description="Início do período (padrão: todo o histórico)"),
+    fim: Optional[date] = Query(None, description="Fim do período"),
+    db: DBSession = Depends(get_read_db),
+    principal: Principal = Depends(get_athlete_principal)
+):
+    """
+    Tendências dos saltos do atleta autenticado: médias móveis de 7 e 28
+    dias, melhor salto e consistência por dia e inclinação por semana.
+    """
+    _check_period(inicio, fim)
+    
+    cached = not_modified(request, response, summary_etag(await crud_summary.get_summary(db, principal.id), "saltos"))
+    if cached:
+        return cached
+    
+    # Usa USER_ID, não profile ID
+    return fast_json(await trends.get_jump_trends(db, principal.id, inicio, fim), response)
+
+
+@router.get("/me/calendar", response_model=JumpCalendar)
+async def get_my_jump_calendar(
+    request: Request,
+    response: Response,
+    ano: Optional[int] = Query(None, ge=1900, le=2100, description="Ano (padrão: ano atual)"),
+    db: DBSession = Depends(get_read_db),
+    principal: Principal = Depends(get_athlete_principal)
+):
+    """Calendário/heatmap anual dos saltos do atleta autenticado, lido dos agregados mensais."""
+    year = ano or date.today().year
+    # O ano entra no ETag: sem ``ano``, a mesma URL muda de ano na virada
+    cached = not_modified(request, response, summary_etag(await crud_summary.get_summary(db, principal.id), "saltos", str(year)))
+    if cached:
+        return cached
+    
+    # Usa USER_ID, não profile ID
+    return await crud_summary.get_jump_calendar(db, principal.id, year)
+
+
+@router.get("/me/changes", response_model=JumpChanges)
+async def get_my_jump_changes(
+    since: Optional[str] = Query(None, description="Token devolvido na consulta anterior"),
+    db: DBSession = Depends(get_db),
+    principal: Principal = Depends(get_athlete_principal)
+):
+    """
+    Saltos do atleta autenticado alterados ou removidos desde ``since``.
+    
+    Sem alterações, custa uma única consulta indexada. Sem ``since``,
+    traz todos os saltos. Lê do primário: uma réplica atrasada perderia
+    alterações anteriores ao novo token.
+    """
+    principal.require_athlete_profile()
+    # Usa USER_ID, não profile ID
+    return await sync_service.jump_changes(db, principal.id, since)
+
+
 @router.get("/athlete/{athlete_id}", response_model=List[JumpResponse])
-def get_athlete_jumps(
+async def get_athlete_jumps(
     athlete_id: str,
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    cursor: Optional[str] = Query(None, description="Cursor da próxima página (header X-Next-Cursor)"),
+    db: DBSession = Depends(get_read_db),
+    principal: Principal = Depends(get_principal)
 ):
-    """Lista saltos de um atleta (treinadores podem ver qualquer atleta)."""
-    athlete = crud_athlete.get_athlete_by_id(db, athlete_id)
-    if not athlete:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Atleta não encontrado"
-        )
+    """
+    Lista saltos de um atleta (treinadores podem ver qualquer atleta).
     
+    Paginação por ``skip`` ou, preferencialmente, por ``cursor``: o
+    cursor da próxima página vem no header X-Next-Cursor.
+    """
     # Apenas treinador ou o próprio atleta podem ver
-    if current_user.role != "treinador" and athlete.user_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Sem permissão para visualizar saltos deste atleta"
-        )
+    athlete_user_id = await resolve_athlete_user_id(db, principal, athlete_id, "Sem permissão para visualizar saltos deste atleta")
+    
+    # Saltos são gravados com o USER_ID do atleta
+    cached = not_modified(request, response, summary_etag(await crud_summary.get_summary(db, athlete_user_id), "saltos"))
+    if cached:
+        return cached
+    
+    if settings.FAST_JSON_RESPONSES:
+        rows = await crud_jump.get_jump_rows_by_athlete(db, athlete_user_id, skip=skip, limit=limit, after=decode_cursor(cursor))
+        set_next_cursor(response, rows, limit, "date")
+        return fast_json(rows, response)
     
-    jumps = crud_jump.get_jumps_by_athlete(db, athlete_id, skip=skip, limit=limit)
+    jumps = await crud_jump.get_jumps_by_athlete(db, athlete_user_id, skip=skip, limit=limit, after=decode_cursor(cursor))
+    set_next_cursor(response, jumps, limit, "date")
     return jumps
 
 
+@router.get("/athlete/{athlete_id}/trends", response_model=JumpTrends)
+async def get_athlete_jump_trends(
+    athlete_id: str,
+    request: Request,
+    response: Response,
+    inicio: Optional[date] = Query(None, description="Início do período (padrão: todo o histórico)"),
+    fim: Optional[date] = Query(None, description="Fim do período"),
+    db: DBSession = Depends(get_read_db),
+    principal: Principal = Depends(get_principal)
+):
+    """Tendências dos saltos de um atleta (ID do perfil; treinadores podem ver qualquer atleta)."""
+    _check_period(inicio, fim)
+    
+    # Apenas treinador ou o próprio atleta podem ver
+    athlete_user_id = await resolve_athlete_user_id(db, principal, athlete_id, "Sem permissão para visualizar saltos deste atleta")
+    
+    # Saltos são gravados com o USER_ID do atleta
+    cached = not_modified(request, response, summary_etag(await crud_summary.get_summary(db, athlete_user_id), "saltos"))
+    if cached:
+        return cached
+    
+    return fast_json(await trends.get_jump_trends(db, athlete_user_id, inicio, fim), response)
+
+
+@router.get("/athlete/{athlete_id}/calendar", response_model=JumpCalendar)
+async def get_athlete_jump_calendar(
+    athlete_id: str,
+    request: Request,
+    response: Response,
+    ano: Optional[int] = Query(None, ge=1900, le=2100, description="Ano (padrão: ano atual)"),
+    db: DBSession = Depends(get_read_db),
+    principal: Principal = Depends(get_principal)
+):
+    """Calendário/heatmap anual dos saltos de um atleta (ID do perfil)."""
+    # Apenas treinador ou o próprio atleta podem ver
+    athlete_user_id = await resolve_athlete_user_id(db, principal, athlete_id, "Sem permissão para visualizar saltos deste atleta")
+    
+    year = ano or date.today().year
+    # Saltos são gravados com o USER_ID do atleta; o ano entra no ETag
+    cached = not_modified(request, response, summary_etag(await crud_summary.get_summary(db, athlete_user_id), "saltos", str(year)))
+    if cached:
+        return cached
+    
+    return await crud_summary.get_jump_calendar(db, athlete_user_id, year)
+
+
 @router.get("/{jump_id}", response_model=JumpResponse)
-def get_jump(
+async def get_jump(
     jump_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: DBSession = Depends(get_db),
+    principal: Principal = Depends(get_principal)
 ):
-    """Busca salto por ID."""
-    jump = crud_jump.get_jump_by_id(db, jump_id)
+    """Busca salto por ID (treinadores veem qualquer salto; atletas, só os próprios)."""
+    # Saltos são gravados com o USER_ID do atleta
+    jump = await crud_jump.get_jump_by_id(db, jump_id, None if principal.is_coach else principal.id)
     if not jump:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Salto não encontrado"
         )
     
-    # Verifica permissão
-    athlete = crud_athlete.get_athlete_by_id(db, jump.athlete_id)
-    if current_user.role != "treinador" and athlete.user_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Sem permissão para visualizar este salto"
-        )
-    
     return jump
 
 
 @router.put("/{jump_id}", response_model=JumpResponse)
-def update_jump(
+async def update_jump(
     jump_id: str,
     jump_in: JumpUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_athlete)
+    db: DBSession = Depends(get_db),
+    principal: Principal = Depends(get_athlete_principal)
 ):
     """Atualiza registro de salto."""
-    jump = crud_jump.get_jump_by_id(db, jump_id)
+    principal.require_athlete_profile()
+    
+    # Atualiza só entre os saltos do usuário (não do perfil)
+    jump = await crud_jump.update_jump(db, jump_id, jump_in, principal.id)
     if not jump:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Salto não encontrado"
         )
-    
-    # Verifica se o salto pertence ao usuário (não ao perfil)
-    athlete = crud_athlete.get_athlete_by_user_id(db, current_user.id)
-    if not athlete or jump.athlete_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Sem permissão para editar este salto"
-        )
-    
-    jump = crud_jump.update_jump(db, jump, jump_in)
+    await publish_athlete_event(principal.athlete_coach_id, principal.athlete_id, "salto", "atualizar", [jump.id])
     return jump
 
 
 @router.delete("/{jump_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_jump(
+async def delete_jump(
     jump_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_athlete)
+    db: DBSession = Depends(get_db),
+    principal: Principal = Depends(get_athlete_principal)
 ):
     """Deleta registro de salto."""
-    jump = crud_jump.get_jump_by_id(db, jump_id)
-    if not jump:
+    principal.require_athlete_profile()
+    
+    # Apaga só entre os saltos do usuário (não do perfil)
+    if not await crud_jump.delete_jump(db, jump_id, principal.id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Salto não encontrado"
         )
-    
-    # Verifica se o salto pertence ao usuário (não ao perfil)
-    athlete = crud_athlete.get_athlete_by_user_id(db, current_user.id)
-    if not athlete or jump.athlete_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Sem permissão para deletar este salto"
-        )
-    
-    crud_jump.delete_jump(db, jump_id)
-    return None
\ No newline at end of file
+    await publish_athlete_event(principal.athlete_coach_id, principal.athlete_id, "salto", "remover", [jump_id])
+    return None
@@ -1,198 +1,280 @@
-from typing import List
+from typing import List, Optional
 from datetime import date
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
 
-from app.api.deps import get_db, get_current_user, get_current_active_athlete
-from app.schemas import MarkCreate, MarkUpdate, MarkResponse
-from app.crud import mark as crud_mark, athlete as crud_athlete
-from app.models.user import User
+from app.config import settings
+from app.db.session import DBSession
+from app.core.conditional import not_modified, summary_etag
+from app.core.fastjson import fast_json
+from app.core.pagination import decode_cursor, set_next_cursor
+from app.core.realtime import publish_athlete_event
+from app.api.deps import (
+    Principal,
+    get_db,
+    get_read_db,
+    get_principal,
+    get_athlete_principal,
+    get_coach_principal,
+    resolve_athlete_user_id,
+)
+from app.schemas import MarkCreate, MarkUpdate, MarkResponse, MarkChanges, PersonalRecord, Leaderboard
+from app.crud.aio import mark as crud_mark, summary as crud_summary
+from app.services import sync as sync_service
 
 router = APIRouter()
 
 
 @router.post("/", response_model=MarkResponse, status_code=status.HTTP_201_CREATED)
-def create_mark(
+async def create_mark(
     mark_in: MarkCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_athlete)
+    db: DBSession = Depends(get_db),
+    principal: Principal = Depends(get_athlete_principal)
 ):
     """Cria registro de marca."""
-    athlete = crud_athlete.get_athlete_by_user_id(db, current_user.id)
-    if not athlete:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Perfil de atleta não encontrado"
-        )
+    athlete_id = principal.require_athlete_profile()
     
     # Força o athlete_id do usuário autenticado
-    mark_in.athlete_id = athlete.id
+    mark_in.athlete_id = athlete_id
     
-    mark = crud_mark.create_mark(db, mark_in)
+    mark = await crud_mark.create_mark(db, mark_in)
+    await publish_athlete_event(principal.athlete_coach_id, athlete_id, "marca", "criar", [mark.id])
     return mark
 
 
 @router.get("/me", response_model=List[MarkResponse])
-def get_my_marks(
+async def get_my_marks(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description="Cursor da próxima página (header X-Next-Cursor)"),
     evento: str = Query(None, description="Filtrar por evento"),
     tipo: str = Query(None, pattern="^(competicao|teste)$", description="Filtrar por tipo"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_athlete)
+    db: DBSession = Depends(get_read_db),
+    principal: Principal = Depends(get_athlete_principal)
 ):
-    """Lista marcas do atleta autenticado."""
-    athlete = crud_athlete.get_athlete_by_user_id(db, current_user.id)
-    if not athlete:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Perfil de atleta não encontrado"
-        )
+    """
+    Lista marcas do atleta autenticado.
+    
+    Paginação por ``skip`` ou, preferencialmente, por ``cursor``: o
+    cursor da próxima página vem no header X-Next-Cursor.
+    """
+    athlete_id = principal.require_athlete_profile()
+    
+    cached = not_modified(request, response, summary_etag(await crud_summary.get_summary(db, athlete_id), "marcas"))
+    if cached:
+        return cached
     
     if evento:
-        marks = crud_mark.get_marks_by_event(db, athlete.id, evento)
+        marks = await crud_mark.get_marks_by_event(db, athlete_id, evento)
     elif tipo:
-        marks = crud_mark.get_marks_by_type(db, athlete.id, tipo)
+        marks = await crud_mark.get_marks_by_type(db, athlete_id, tipo)
+    elif settings.FAST_JSON_RESPONSES:
+        rows = await crud_mark.get_mark_rows_by_athlete(db, athlete_id, skip=skip, limit=limit, after=decode_cursor(cursor))
+        set_next_cursor(response, rows, limit, "data")
+        return fast_json(rows, response)
     else:
-        marks = crud_mark.get_marks_by_athlete(db, athlete.id, skip=skip, limit=limit)
+        marks = await crud_mark.get_marks_by_athlete(db, athlete_id, skip=skip, limit=limit, after=decode_cursor(cursor))
+        set_next_cursor(response, marks, limit, "data")
     
     return marks
 
 
 @router.get("/me/statistics")
-def get_my_mark_statistics(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_athlete)
+async def get_my_mark_statistics(
+    request: Request,
+    response: Response,
+    db: DBSession = Depends(get_read_db),
+    principal: Principal = Depends(get_athlete_principal)
 ):
     """Retorna estatísticas das marcas do atleta autenticado."""
-    athlete = crud_athlete.get_athlete_by_user_id(db, current_user.id)
-    if not athlete:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Perfil de atleta não encontrado"
-        )
+    athlete_id = principal.require_athlete_profile()
+    
+    cached = not_modified(request, response, summary_etag(await crud_summary.get_summary(db, athlete_id), "marcas"))
+    if cached:
+        return cached
     
-    stats = crud_mark.get_mark_statistics(db, athlete.id)
+    stats = await crud_summary.get_mark_statistics(db, athlete_id)
     return stats
 
 
 @router.get("/me/records")
-def get_my_personal_records(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_athlete)
+async def get_my_personal_records(
+    request: Request,
+    response: Response,
+    db: DBSession = Depends(get_read_db),
+    principal: Principal = Depends(get_athlete_principal)
 ):
     """Retorna recordes pessoais do atleta autenticado."""
-    athlete = crud_athlete.get_athlete_by_user_id(db, current_user.id)
-    if not athlete:
+    athlete_id = principal.require_athlete_profile()
+    
+    cached = not_modified(request, response, summary_etag(await crud_summary.get_summary(db, athlete_id), "marcas"))
+    if cached:
+        return cached
+    
+    records = await crud_summary.get_personal_records(db, athlete_id)
+    return records
+
+
+@router.get("/me/pace", response_model=List[PersonalRecord])
+async def get_my_records_by_pace(
+    request: Request,
+    response: Response,
+    db: DBSession = Depends(get_read_db),
+    principal: Principal = Depends(get_athlete_principal)
+):
+    """
+    Recordes pessoais ordenados pelo ritmo por 100 m (comparação entre
+    provas). Só entram provas com distância no catálogo.
+    """
+    athlete_id = principal.require_athlete_profile()
+    
+    cached = not_modified(request, response, summary_etag(await crud_summary.get_summary(db, athlete_id), "marcas"))
+    if cached:
+        return cached
+    
+    return await crud_mark.get_records_by_pace(db, athlete_id)
+
+
+@router.get("/me/changes", response_model=MarkChanges)
+async def get_my_mark_changes(
+    since: Optional[str] = Query(None, description="Token devolvido na consulta anterior"),
+    db: DBSession = Depends(get_db),
+    principal: Principal = Depends(get_athlete_principal)
+):
+    """
+    Marcas do atleta autenticado alteradas ou removidas desde ``since``.
+    
+    Sem alterações, custa uma única consulta indexada. Sem ``since``,
+    traz todas as marcas.
+    """
+    return await sync_service.mark_changes(db, principal.require_athlete_profile(), since)
+
+
+@router.get("/leaderboard", response_model=Leaderboard)
+async def get_leaderboard(
+    evento: str = Query(..., max_length=100, description="Prova (código do catálogo ou texto do evento)"),
+    temporada: Optional[int] = Query(None, ge=1900, le=2100, description="Ano da temporada (atalho para inicio/fim)"),
+    inicio: Optional[date] = Query(None, description="Marcas a partir desta data"),
+    fim: Optional[date] = Query(None, description="Marcas até esta data"),
+    tipo: Optional[str] = Query(None, pattern="^(competicao|teste)$", description="Filtrar por tipo"),
+    categoria: Optional[str] = Query(None, max_length=50, description="Filtrar por categoria do atleta"),
+    vento_legal: bool = Query(False, description="Apenas marcas com vento legal (até 2.0 m/s ou não informado)"),
+    limit: int = Query(10, ge=1, le=100, description="Quantidade de atletas no ranking"),
+    db: DBSession = Depends(get_read_db),
+    principal: Principal = Depends(get_coach_principal)
+):
+    """
+    Ranking dos atletas do treinador autenticado em uma prova: a melhor
+    marca de cada atleta (recorde pessoal, ou melhor da temporada com
+    ``temporada``/``inicio``/``fim``).
+    """
+    if temporada is not None:
+        inicio = inicio or date(temporada, 1, 1)
+        fim = fim or date(temporada, 12, 31)
+    if inicio and fim and inicio > fim:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Perfil de atleta não encontrado"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Data inicial deve ser anterior à data final"
         )
     
-    records = crud_mark.get_personal_records(db, athlete.id)
-    return records
+    return await crud_mark.get_leaderboard(
+        db,
+        principal.require_coach_profile(),
+        evento,
+        tipo=tipo,
+        start_date=inicio,
+        end_date=fim,
+        categoria=categoria,
+        wind_legal=vento_legal,
+        limit=limit,
+    )
 
 
 @router.get("/athlete/{athlete_id}", response_model=List[MarkResponse])
-def get_athlete_marks(
+async def get_athlete_marks(
     athlete_id: str,
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    cursor: Optional[str] = Query(None, description="Cursor da próxima página (header X-Next-Cursor)"),
+    db: DBSession = Depends(get_read_db),
+    principal: Principal = Depends(get_principal)
 ):
-    """Lista marcas de um atleta (treinadores podem ver qualquer atleta)."""
-    athlete = crud_athlete.get_athlete_by_id(db, athlete_id)
-    if not athlete:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Atleta não encontrado"
-        )
+    """
+    Lista marcas de um atleta (treinadores podem ver qualquer atleta).
     
+    Paginação por ``skip`` ou, preferencialmente, por ``cursor``: o
+    cursor da próxima página vem no header X-Next-Cursor.
+    """
     # Apenas treinador ou o próprio atleta podem ver
-    if current_user.role != "treinador" and athlete.user_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Sem permissão para visualizar marcas deste atleta"
-        )
+    await resolve_athlete_user_id(db, principal, athlete_id, "Sem permissão para visualizar marcas deste atleta")
+    
+    cached = not_modified(request, response, summary_etag(await crud_summary.get_summary(db, athlete_id), "marcas"))
+    if cached:
+        return cached
+    
+    if settings.FAST_JSON_RESPONSES:
+        rows = await crud_mark.get_mark_rows_by_athlete(db, athlete_id, skip=skip, limit=limit, after=decode_cursor(cursor))
+        set_next_cursor(response, rows, limit, "data")
+        return fast_json(rows, response)
     
-    marks = crud_mark.get_marks_by_athlete(db, athlete_id, skip=skip, limit=limit)
+    marks = await crud_mark.get_marks_by_athlete(db, athlete_id, skip=skip, limit=limit, after=decode_cursor(cursor))
+    set_next_cursor(response, marks, limit, "data")
     return marks
 
 
 @router.get("/{mark_id}", response_model=MarkResponse)
-def get_mark(
+async def get_mark(
     mark_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: DBSession = Depends(get_db),
+    principal: Principal = Depends(get_principal)
 ):
-    """Busca marca por ID."""
-    mark = crud_mark.get_mark_by_id(db, mark_id)
+    """Busca marca por ID (treinadores veem qualquer marca; atletas, só as próprias)."""
+    # Marcas são gravadas com o ID do perfil do atleta
+    owner_id = None if principal.is_coach else principal.require_athlete_profile()
+    mark = await crud_mark.get_mark_by_id(db, mark_id, owner_id)
     if not mark:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Marca não encontrada"
         )
     
-    # Verifica permissão
-    athlete = crud_athlete.get_athlete_by_id(db, mark.athlete_id)
-    if current_user.role != "treinador" and athlete.user_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Sem permissão para visualizar esta marca"
-        )
-    
     return mark
 
 
 @router.put("/{mark_id}", response_model=MarkResponse)
-def update_mark(
+async def update_mark(
     mark_id: str,
     mark_in: MarkUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_athlete)
+    db: DBSession = Depends(get_db),
+    principal: Principal = Depends(get_athlete_principal)
 ):
     """Atualiza registro de marca."""
-    mark = crud_mark.get_mark_by_id(db, mark_id)
+    # Atualiza só entre as marcas do perfil do atleta
+    mark = await crud_mark.update_mark(db, mark_id, mark_in, principal.require_athlete_profile())
     if not mark:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Marca não encontrada"
         )
-    
-    # Verifica se a marca pertence ao atleta
-    athlete = crud_athlete.get_athlete_by_user_id(db, current_user.id)
-    if not athlete or mark.athlete_id != athlete.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Sem permissão para editar esta marca"
-        )
-    
-    mark = crud_mark.update_mark(db, mark, mark_in)
+    await publish_athlete_event(principal.athlete_coach_id, principal.athlete_id, "marca", "atualizar", [mark.id])
     return mark
 
 
 @router.delete("/{mark_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_mark(
+async def delete_mark(
     mark_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_athlete)
+    db: DBSession = Depends(get_db),
+    principal: Principal = Depends(get_athlete_principal)
 ):
     """Deleta registro de marca."""
-    mark = crud_mark.get_mark_by_id(db, mark_id)
-    if not mark:
+    # Apaga só entre as marcas do perfil do atleta
+    if not await crud_mark.delete_mark(db, mark_id, principal.require_athlete_profile()):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Marca não encontrada"
         )
-    
-    # Verifica se a marca pertence ao atleta
-    athlete = crud_athlete.get_athlete_by_user_id(db, current_user.id)
-    if not athlete or mark.athlete_id != athlete.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Sem permissão para deletar esta marca"
-        )
-    
-    crud_mark.delete_mark(db, mark_id)
-    return None
\ No newline at end of file
+    await publish_athlete_event(principal.athlete_coach_id, principal.athlete_id, "marca", "remover", [mark_id])
+    return None
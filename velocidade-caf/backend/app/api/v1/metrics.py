@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Depends
+
+from app.api.deps import require_metrics_token
+from app.core.realtime import event_hub
+from app.core.token_cache import token_cache
+from app.db.session import get_pool_metrics
+
+router = APIRouter()
+
+
+@router.get("/", dependencies=[Depends(require_metrics_token)])
+async def get_metrics():
+    """
+    Métricas operacionais da API (pool de conexões, cache de tokens, eventos em tempo real).
+    
+    Exige o METRICS_TOKEN no header Authorization; sem ele configurado, a
+    rota fica desativada.
+    """
+    return {
+        "pool": get_pool_metrics(),
+        "token_cache": token_cache.stats(),
+        "realtime": event_hub.stats(),
+    }
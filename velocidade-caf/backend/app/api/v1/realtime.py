@@ -0,0 +1,109 @@
+import json
+from typing import AsyncIterator, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from fastapi.security.utils import get_authorization_scheme_param
+
+from app.config import settings
+from app.api.deps import Principal, get_coach_principal, principal_from_token
+from app.core.realtime import Subscription, TooManySubscriptions, coach_channel, event_hub
+from app.core.security import create_stream_ticket, verify_stream_ticket
+from app.schemas import StreamTicket
+
+router = APIRouter()
+
+# Intervalo de reconexão sugerido ao EventSource (ms)
+RETRY_MS = 3000
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+async def _stream(subscription: Subscription) -> AsyncIterator[str]:
+    """Envia os eventos da assinatura até o cliente desconectar ou a fila transbordar."""
+    try:
+        yield f"retry: {RETRY_MS}\n\n"
+        while not subscription.closed:
+            message = await subscription.get(settings.EVENTS_HEARTBEAT_SECONDS)
+            if subscription.dropped:
+                # O cliente deve reler o que mudou em /coaches/me/changes
+                yield _sse("perdidos", {"quantidade": subscription.dropped})
+                subscription.dropped = 0
+            if message is None:
+                yield ": ping\n\n"
+                continue
+            yield _sse(message["tipo"], message)
+    finally:
+        event_hub.unsubscribe(subscription)
+
+
+@router.post("/ticket", response_model=StreamTicket)
+async def create_ticket(principal: Principal = Depends(get_coach_principal)):
+    """
+    Ticket de curta duração para abrir o stream em /realtime/coach.
+    
+    O EventSource do navegador não envia headers; o ticket vai na query
+    string no lugar do token de acesso, que ficaria registrado nos logs.
+    Ao reconectar depois de EVENTS_TICKET_SECONDS, peça um ticket novo.
+    """
+    return StreamTicket(
+        ticket=create_stream_ticket(principal.require_coach_profile()),
+        expira_em=settings.EVENTS_TICKET_SECONDS,
+    )
+
+
+async def _coach_id_from_header(request: Request) -> str:
+    """ID do perfil do treinador autenticado pelo header Authorization."""
+    scheme, token = get_authorization_scheme_param(request.headers.get("Authorization"))
+    if scheme.lower() != "bearer" or not token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    principal = await principal_from_token(token)
+    if not principal.is_coach:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Acesso permitido apenas para treinadores"
+        )
+    return principal.require_coach_profile()
+
+
+@router.get("/coach")
+async def coach_events(
+    request: Request,
+    ticket: Optional[str] = Query(None, description="Ticket de POST /realtime/ticket (o EventSource do navegador não envia headers)"),
+):
+    """
+    Eventos em tempo real (Server-Sent Events) das gravações dos atletas
+    do treinador autenticado.
+    
+    Cada evento (``salto`` ou ``marca``) traz a operação, o ID do perfil
+    do atleta e os IDs alterados; os dados em si são lidos em
+    /coaches/me/changes. ``perdidos`` avisa que a fila da conexão
+    transbordou e eventos foram descartados. Ao reconectar, o cliente
+    também deve consultar /coaches/me/changes.
+    
+    Aceita o token de acesso no header Authorization ou um ticket de
+    POST /realtime/ticket no parâmetro ``ticket``; o token de acesso não
+    é aceito na URL. Com ticket, a abertura não consulta o banco; com o
+    header, a conexão é devolvida ao pool antes do stream começar.
+    """
+    coach_id = verify_stream_ticket(ticket) if ticket is not None else await _coach_id_from_header(request)
+
+    try:
+        subscription = await event_hub.subscribe(coach_channel(coach_id))
+    except TooManySubscriptions:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Conexões demais abertas para este treinador"
+        )
+
+    return StreamingResponse(
+        _stream(subscription),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
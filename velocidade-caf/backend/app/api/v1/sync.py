@@ -0,0 +1,59 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from app.config import settings
+from app.core.realtime import publish_athlete_event
+from app.crud.sync import DuplicateMutationKeys, MutationFailed
+from app.db.session import DBSession
+from app.api.deps import Principal, get_db, get_athlete_principal
+from app.schemas import SyncRequest, SyncResponse
+from app.services import sync as sync_service
+
+router = APIRouter()
+
+
+@router.post("/", response_model=SyncResponse)
+async def sync(
+    sync_in: SyncRequest,
+    db: DBSession = Depends(get_db),
+    principal: Principal = Depends(get_athlete_principal)
+):
+    """
+    Sincroniza saltos e marcas registrados offline.
+    
+    Aplica o lote de mutações em uma única transação (cada chave de
+    idempotência é aplicada uma só vez) e devolve o resultado de cada
+    mutação, o que mudou no servidor desde ``token`` e o novo token.
+    Sem token, o delta traz todos os saltos e marcas do atleta.
+    """
+    athlete_id = principal.require_athlete_profile()
+    
+    if len(sync_in.mutacoes) > settings.SYNC_MAX_MUTATIONS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Envie no máximo {settings.SYNC_MAX_MUTATIONS} mutações por lote"
+        )
+    
+    try:
+        # Saltos usam o USER_ID; marcas, o ID do perfil
+        response = await sync_service.sync(db, principal.id, athlete_id, sync_in)
+    except DuplicateMutationKeys:
+        # Outra sincronização gravou as mesmas chaves ao mesmo tempo
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Lote enviado em paralelo por outra sincronização; reenvie"
+        )
+    except MutationFailed as e:
+        # Dados recusados pelo banco: o lote foi desfeito e falharia de novo
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Mutação {e.chave} recusada pelo banco: {e.motivo}"
+        )
+    
+    for tipo in ("salto", "marca"):
+        ids = [
+            result.id for mutation, result in zip(sync_in.mutacoes, response.resultados)
+            if mutation.tipo == tipo and result.status == "aplicada" and not result.repetida
+        ]
+        if ids:
+            await publish_athlete_event(principal.athlete_coach_id, athlete_id, tipo, "sincronizar", ids)
+    return response
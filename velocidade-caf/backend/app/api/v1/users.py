@@ -1,37 +1,29 @@
-from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
 
-from app.api.deps import get_db, get_current_user
+from app.db.session import DBSession
+from app.api.deps import Principal, get_db, get_principal, open_db
 from app.schemas import UserCreate, UserResponse, UserLogin, Token
-from app.crud import user as crud_user
+from app.crud.aio import user as crud_user
 from app.core.security import create_access_token
+from app.services import password as password_service
 from app.models.user import User
 
 router = APIRouter()
 
 
-@router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def register_user(user_in: UserCreate, db: Session = Depends(get_db)):
-    """Registra novo usuário."""
-    # Verifica se email já existe
-    existing_user = crud_user.get_user_by_email(db, email=user_in.email)
-    if existing_user:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email já cadastrado"
-        )
+async def _authenticate(email: str, password: str) -> User:
+    """
+    Autentica o usuário e registra o login.
     
-    user = crud_user.create_user(db, user_in)
-    return user
-
-
-@router.post("/login", response_model=Token)
-def login(user_in: UserLogin, db: Session = Depends(get_db)):
-    """Login de usuário - retorna JWT token."""
-    user = crud_user.authenticate_user(db, user_in.email, user_in.password)
-    if not user:
+    O bcrypt roda no pool de processos sem sessão aberta, para não
+    segurar conexões do banco durante o hash. Se o custo configurado
+    mudou, o hash é refeito e salvo junto com last_login.
+    """
+    async with open_db() as db:
+        user = await crud_user.get_user_by_email(db, email=email)
+    
+    if not user or not user.password_hash or not await password_service.verify_password(password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Email ou senha incorretos",
@@ -44,10 +36,37 @@ def login(user_in: UserLogin, db: Session = Depends(get_db)):
             detail="Usuário inativo"
         )
     
+    new_hash = None
+    if password_service.needs_rehash(user.password_hash):
+        new_hash = await password_service.hash_password(password)
+    
     # Atualiza last_login
-    user.last_login = datetime.utcnow()
-    db.add(user)
-    db.commit()
+    async with open_db() as db:
+        return await crud_user.update_last_login(db, user, password_hash=new_hash)
+
+
+@router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
+async def register_user(user_in: UserCreate):
+    """Registra novo usuário."""
+    # Verifica se email já existe
+    async with open_db() as db:
+        existing_user = await crud_user.get_user_by_email(db, email=user_in.email)
+    if existing_user:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email já cadastrado"
+        )
+    
+    password_hash = await password_service.hash_password(user_in.password)
+    async with open_db() as db:
+        user = await crud_user.create_user(db, user_in, password_hash=password_hash)
+    return user
+
+
+@router.post("/login", response_model=Token)
+async def login(user_in: UserLogin):
+    """Login de usuário - retorna JWT token."""
+    user = await _authenticate(user_in.email, user_in.password)
     
     # Cria token JWT
     access_token = create_access_token(
@@ -62,32 +81,12 @@ def login(user_in: UserLogin, db: Session = Depends(get_db)):
 
 
 @router.post("/token")
-def login_oauth2(
-    db: Session = Depends(get_db),
-    form_data: OAuth2PasswordRequestForm = Depends()
-):
+async def login_oauth2(form_data: OAuth2PasswordRequestForm = Depends()):
     """
     Login OAuth2 para Swagger UI.
     Use seu email como username.
     """
-    user = crud_user.authenticate_user(db, form_data.username, form_data.password)
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Email ou senha incorretos",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    
-    if not user.is_active:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Usuário inativo"
-        )
-    
-    # Atualiza last_login
-    user.last_login = datetime.utcnow()
-    db.add(user)
-    db.commit()
+    user = await _authenticate(form_data.username, form_data.password)
     
     # Cria token JWT
     access_token = create_access_token(
@@ -102,25 +101,25 @@ def login_oauth2(
 
 
 @router.get("/me", response_model=UserResponse)
-def get_current_user_info(current_user: User = Depends(get_current_user)):
+async def get_current_user_info(principal: Principal = Depends(get_principal)):
     """Retorna informações do usuário autenticado."""
-    return current_user
+    return principal.user
 
 
 @router.get("/{user_id}", response_model=UserResponse)
-def get_user(
+async def get_user(
     user_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: DBSession = Depends(get_db),
+    principal: Principal = Depends(get_principal)
 ):
     """Busca usuário por ID."""
-    if current_user.role != "treinador" and current_user.id != user_id:
+    if not principal.is_coach and principal.id != user_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Sem permissão para visualizar este usuário"
         )
     
-    user = crud_user.get_user_by_id(db, user_id)
+    user = await crud_user.get_user_by_id(db, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -1,5 +1,6 @@
 import os
 import secrets
+from typing import Optional
 from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
 
@@ -16,11 +17,70 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str = os.getenv("DATABASE_URL", "cockroachdb://root@localhost:26257/caf?sslmode=disable")
+    # Modo assíncrono: rotas usam AsyncSession (asyncpg) em vez do threadpool
+    DB_ASYNC: bool = False
+    # URL do driver assíncrono; se vazia, é derivada de DATABASE_URL
+    ASYNC_DATABASE_URL: Optional[str] = None
+    
+    # Pool de conexões
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30  # segundos esperando conexão livre
+    DB_POOL_RECYCLE: int = 1800  # segundos; -1 desativa
+    # Pre-ping faz um round trip a cada checkout; com DB_POOL_RECYCLE
+    # ajustado ao timeout do balanceador pode ser desativado
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_TIMEOUT_MS: Optional[int] = None
+    
+    # Leituras (rotas GET de listagem e análise, ver api.deps.get_read_db)
+    # Réplica de leitura; se vazia, as leituras vão para DATABASE_URL
+    READ_DATABASE_URL: Optional[str] = None
+    ASYNC_READ_DATABASE_URL: Optional[str] = None
+    # CockroachDB: leituras no passado (AS OF SYSTEM TIME), atendidas pela
+    # réplica mais próxima em vez do leaseholder
+    DB_FOLLOWER_READS: bool = False
+    # Atraso das follower reads em segundos; vazio usa
+    # follower_read_timestamp() (~4.8s). Valores abaixo desse limite
+    # voltam a ser lidos no leaseholder
+    DB_READ_STALENESS_SECONDS: Optional[float] = None
     
     # Security - IMPORTANTE: Mude em produção!
     SECRET_KEY: str = os.getenv("SECRET_KEY", secrets.token_urlsafe(32))
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7  # 7 dias
+    # Token das métricas operacionais (GET /metrics, header
+    # "Authorization: Bearer <token>"); vazio desativa a rota. As métricas
+    # expõem o pool, o cache de tokens e as conexões em tempo real: use um
+    # valor próprio do coletor, diferente do SECRET_KEY
+    METRICS_TOKEN: Optional[str] = None
+    # Cache de tokens verificados (ver app.core.token_cache); 0 desativa
+    TOKEN_CACHE_MAX_ENTRIES: int = 10000
+    TOKEN_CACHE_TTL_SECONDS: float = 60
+    
+    # Senhas (bcrypt)
+    BCRYPT_ROUNDS: int = 12  # hashes com custo diferente são refeitos no login
+    PASSWORD_HASH_WORKERS: int = 2  # processos dedicados; 0 usa o threadpool
+    PASSWORD_HASH_MAX_PENDING: int = 64  # operações em fila antes de aguardar
+    
+    # Listagens grandes serializadas direto das linhas (sem ORM/Pydantic)
+    FAST_JSON_RESPONSES: bool = True
+    
+    # Importação em lote de saltos
+    IMPORT_CHUNK_SIZE: int = 1000  # linhas por INSERT
+    IMPORT_MAX_ERRORS: int = 1000  # erros listados no relatório
+    
+    # Sincronização offline (/sync)
+    SYNC_MAX_MUTATIONS: int = 500  # mutações por lote
+    SYNC_TOKEN_OVERLAP_SECONDS: int = 5  # margem para transações concorrentes ao token
+    
+    # Eventos em tempo real para treinadores (ver app.core.realtime)
+    # Broker entre processos ("modulo:Classe"); vazio entrega só no processo
+    EVENTS_BROKER: Optional[str] = None
+    EVENTS_QUEUE_SIZE: int = 100  # eventos pendentes por conexão
+    EVENTS_OVERFLOW: str = "drop_oldest"  # fila cheia: drop_oldest ou disconnect
+    EVENTS_MAX_CONNECTIONS_PER_CHANNEL: int = 10  # conexões por treinador e processo
+    EVENTS_HEARTBEAT_SECONDS: float = 15  # comentário SSE para manter a conexão aberta
+    EVENTS_TICKET_SECONDS: int = 60  # validade do ticket de abertura do stream
     
     # CORS
     BACKEND_CORS_ORIGINS: list = ["http://localhost:3000", "http://localhost:5173"]
@@ -0,0 +1,54 @@
+"""
+GET condicional (ETag / If-None-Match) nas rotas de leitura do atleta.
+
+O ETag vem dos contadores de versão do resumo materializado
+(AthleteSummary.versao_saltos / versao_marcas), incrementados pelos
+writers de app.crud na mesma transação da escrita. Verificar o ETag
+custa uma leitura por chave primária; se o cliente já tem a versão
+atual, a rota responde 304 sem consultar as tabelas de saltos e marcas.
+"""
+from typing import Optional
+
+from fastapi import Request, Response, status
+
+from app.config import settings
+from app.models.summary import AthleteSummary
+
+
+def summary_etag(summary: Optional[AthleteSummary], part: str, variant: Optional[str] = None) -> Optional[str]:
+    """
+    ETag fraco para a parte (``"saltos"`` ou ``"marcas"``) do resumo.
+
+    ``variant`` identifica parâmetros resolvidos no servidor que mudam a
+    resposta sem mudar a URL (ex.: o ano atual como padrão do
+    calendário); sem ele, a mesma URL revalidada em outro ano receberia
+    304 com os dados do ano anterior.
+
+    Sem resumo (atleta sem escritas desde a migração) não há versão
+    confiável e a rota responde normalmente.
+    """
+    if summary is None:
+        return None
+    version = getattr(summary, f"versao_{part}")
+    suffix = f"-{variant}" if variant is not None else ""
+    return f'W/"{settings.VERSION}-{summary.athlete_id}-{part}-{version}{suffix}"'
+
+
+def not_modified(request: Request, response: Response, etag: Optional[str]) -> Optional[Response]:
+    """
+    Define ETag/Cache-Control na resposta e, se ``If-None-Match`` já
+    contém o ETag atual, retorna a resposta 304 a ser devolvida pela rota.
+    """
+    if etag is None:
+        return None
+
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    response.headers.update(headers)
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        tags = {tag.strip() for tag in if_none_match.split(",")}
+        # Comparação fraca: W/"x" e "x" são equivalentes
+        if "*" in tags or etag in tags or etag[2:] in tags:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return None
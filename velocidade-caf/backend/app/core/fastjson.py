@@ -0,0 +1,44 @@
+"""
+Resposta JSON rápida para listagens grandes.
+
+As listagens em modo rápido (settings.FAST_JSON_RESPONSES) buscam só as
+colunas necessárias como linhas Core, já no formato dos schemas de
+resposta (mesmas chaves e aliases), e as serializam direto para bytes
+com orjson. Os dados vêm do banco, então a validação do response_model
+é dispensada.
+"""
+import json
+from datetime import date, datetime
+from typing import Any
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # sem orjson, usa o json da biblioteca padrão
+    orjson = None
+
+
+def _default(value: Any):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Tipo não serializável: {type(value).__name__}")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse que serializa com orjson, sem passar pelo jsonable_encoder."""
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content)
+        return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def fast_json(content: Any, response: Response) -> FastJSONResponse:
+    """
+    Resposta rápida mantendo os headers já definidos na rota (ETag,
+    X-Next-Cursor), que o FastAPI não copia quando a rota retorna uma
+    Response.
+    """
+    return FastJSONResponse(content, headers=dict(response.headers))
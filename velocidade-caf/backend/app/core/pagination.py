@@ -0,0 +1,59 @@
+"""
+Paginação por cursor (keyset) das listagens.
+
+O cursor é opaco para o cliente: codifica a chave de ordenação
+``(data, id)`` do último item da página em base64. A próxima página é
+buscada com ``WHERE (data, id) < cursor``, que usa o índice
+``(athlete_id, data)`` em vez de percorrer e descartar ``skip`` linhas.
+"""
+import base64
+import json
+from datetime import date
+from typing import Mapping, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, Response, status
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+Cursor = Tuple[date, str]
+
+
+def encode_cursor(sort_date: date, item_id: str) -> str:
+    """Gera o cursor opaco para a chave ``(data, id)``."""
+    raw = json.dumps([sort_date.isoformat(), str(item_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Cursor]:
+    """
+    Decodifica o cursor recebido na query string.
+
+    Raises:
+        HTTPException: Se o cursor for inválido
+    """
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        sort_date, item_id = json.loads(raw)
+        return date.fromisoformat(sort_date), str(item_id)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor inválido"
+        )
+
+
+def set_next_cursor(response: Response, items: Sequence, limit: int, date_attr: str) -> None:
+    """
+    Informa o cursor da próxima página no header X-Next-Cursor.
+
+    O header só é enviado quando a página veio cheia; sem ele, a
+    listagem terminou. Aceita objetos ORM ou dicts (listagens rápidas).
+    """
+    if limit > 0 and len(items) == limit:
+        last = items[-1]
+        if isinstance(last, Mapping):
+            response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last[date_attr], last["id"])
+        else:
+            response.headers[NEXT_CURSOR_HEADER] = encode_cursor(getattr(last, date_attr), last.id)
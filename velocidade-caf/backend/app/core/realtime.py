@@ -0,0 +1,216 @@
+"""
+Eventos em tempo real para os treinadores (ver api.v1.realtime).
+
+Quando um atleta grava saltos ou marcas, as rotas publicam um evento
+pequeno (tipo, operação, atleta e IDs) no canal do treinador dele. O
+painel do treinador recebe o evento pela conexão SSE aberta e busca
+apenas o que mudou em /coaches/me/changes, em vez de recarregar tudo.
+
+A entrega entre processos fica a cargo de um ``Broker``. O padrão,
+``LocalBroker``, entrega apenas às conexões do próprio processo. Com
+vários workers, EVENTS_BROKER aponta (``"modulo:Classe"``) para uma
+implementação sobre um broker compartilhado (Redis pub/sub, NATS...),
+que recebe as mensagens de todos os processos e as entrega ao hub local.
+
+Cada conexão tem uma fila limitada (EVENTS_QUEUE_SIZE). Publicar nunca
+espera por um cliente lento: com a fila cheia, EVENTS_OVERFLOW decide se
+o evento mais antigo é descartado (``drop_oldest``, o cliente recebe um
+aviso de eventos perdidos) ou se a conexão é encerrada (``disconnect``,
+o cliente reconecta e recupera o estado pelo feed de alterações).
+"""
+import asyncio
+import importlib
+from typing import Any, Callable, Dict, Optional, Sequence, Set
+
+from app.config import settings
+
+Deliver = Callable[[str, Dict[str, Any]], None]
+
+
+class Broker:
+    """
+    Transporte das mensagens entre processos.
+
+    ``start`` recebe a função que entrega uma mensagem às conexões deste
+    processo; ela deve ser chamada no event loop, uma vez por mensagem
+    publicada em qualquer processo.
+    """
+
+    async def start(self, deliver: Deliver) -> None:
+        raise NotImplementedError
+
+    async def publish(self, channel: str, message: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+
+class LocalBroker(Broker):
+    """Broker em memória: entrega só às conexões do próprio processo."""
+
+    def __init__(self):
+        self._deliver: Optional[Deliver] = None
+
+    async def start(self, deliver: Deliver) -> None:
+        self._deliver = deliver
+
+    async def publish(self, channel: str, message: Dict[str, Any]) -> None:
+        self._deliver(channel, message)
+
+
+class Subscription:
+    """Conexão assinante de um canal, com fila limitada."""
+
+    def __init__(self, channel: str, max_queue: int):
+        self.channel = channel
+        self.queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue(maxsize=max_queue)
+        self.dropped = 0  # eventos descartados ainda não avisados ao cliente
+        self.closed = False
+
+    def offer(self, message: Dict[str, Any], overflow: str) -> bool:
+        """Enfileira sem esperar; retorna False se a conexão deve ser encerrada."""
+        if self.queue.full():
+            if overflow == "disconnect":
+                self.closed = True
+                return False
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(message)
+        return True
+
+    async def get(self, timeout: float) -> Optional[Dict[str, Any]]:
+        """Próximo evento, ou None se nada chegar em ``timeout`` segundos."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class TooManySubscriptions(Exception):
+    """O canal já tem EVENTS_MAX_CONNECTIONS_PER_CHANNEL conexões."""
+
+
+class EventHub:
+    """Fan-out em processo dos eventos recebidos do broker para as conexões."""
+
+    def __init__(self, broker: Broker, max_queue: int, overflow: str, max_per_channel: int):
+        if overflow not in ("drop_oldest", "disconnect"):
+            raise ValueError(f"EVENTS_OVERFLOW inválido: {overflow!r}")
+        self.broker = broker
+        self.max_queue = max_queue
+        self.overflow = overflow
+        self.max_per_channel = max_per_channel
+        self._channels: Dict[str, Set[Subscription]] = {}
+        self._started = False
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.disconnected = 0
+
+    async def _ensure_started(self) -> None:
+        if not self._started:
+            self._started = True
+            await self.broker.start(self._deliver)
+
+    async def publish(self, channel: str, message: Dict[str, Any]) -> None:
+        """Publica no canal (em todos os processos, conforme o broker)."""
+        await self._ensure_started()
+        self.published += 1
+        await self.broker.publish(channel, message)
+
+    async def subscribe(self, channel: str) -> Subscription:
+        """
+        Abre uma assinatura do canal neste processo.
+
+        Raises:
+            TooManySubscriptions: Se o canal já estiver no limite de conexões
+        """
+        await self._ensure_started()
+        subscribers = self._channels.setdefault(channel, set())
+        if len(subscribers) >= self.max_per_channel:
+            raise TooManySubscriptions(channel)
+        subscription = Subscription(channel, self.max_queue)
+        subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscription.closed = True
+        subscribers = self._channels.get(subscription.channel)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._channels[subscription.channel]
+
+    def _deliver(self, channel: str, message: Dict[str, Any]) -> None:
+        for subscription in list(self._channels.get(channel, ())):
+            dropped = subscription.dropped
+            if subscription.offer(message, self.overflow):
+                self.delivered += 1
+                self.dropped += subscription.dropped - dropped
+            else:
+                # A conexão percebe ``closed`` e encerra o stream
+                self.unsubscribe(subscription)
+                self.disconnected += 1
+
+    async def close(self) -> None:
+        for subscription in [s for subscribers in self._channels.values() for s in subscribers]:
+            self.unsubscribe(subscription)
+        if self._started:
+            await self.broker.close()
+            self._started = False
+
+    def stats(self) -> Dict[str, Any]:
+        """Contadores expostos em /api/v1/metrics."""
+        return {
+            "broker": type(self.broker).__name__,
+            "channels": len(self._channels),
+            "connections": sum(len(subscribers) for subscribers in self._channels.values()),
+            "max_queue": self.max_queue,
+            "overflow": self.overflow,
+            "published": self.published,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "disconnected": self.disconnected,
+        }
+
+
+def coach_channel(coach_id: str) -> str:
+    """Canal dos eventos do elenco do treinador (ID do perfil)."""
+    return f"treinador:{coach_id}"
+
+
+async def publish_athlete_event(
+    coach_id: Optional[str],
+    athlete_id: Optional[str],
+    tipo: str,
+    operacao: str,
+    ids: Sequence[str] = ()
+) -> None:
+    """
+    Avisa o treinador ``coach_id`` de uma gravação do atleta (ID do
+    perfil) em registros do ``tipo`` (salto ou marca). Atletas sem
+    treinador não publicam nada.
+    """
+    if coach_id is None:
+        return
+    await event_hub.publish(
+        coach_channel(coach_id),
+        {"tipo": tipo, "operacao": operacao, "atleta_id": athlete_id, "ids": list(ids)},
+    )
+
+
+def load_broker(path: Optional[str]) -> Broker:
+    """Instancia o broker ``"modulo:Classe"``; vazio usa o LocalBroker."""
+    if not path:
+        return LocalBroker()
+    module_name, _, class_name = path.partition(":")
+    return getattr(importlib.import_module(module_name), class_name)()
+
+
+event_hub = EventHub(
+    broker=load_broker(settings.EVENTS_BROKER),
+    max_queue=settings.EVENTS_QUEUE_SIZE,
+    overflow=settings.EVENTS_OVERFLOW,
+    max_per_channel=settings.EVENTS_MAX_CONNECTIONS_PER_CHANNEL,
+)
@@ -12,6 +12,9 @@ from app.config import settings
 # OAuth2 scheme
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/users/login")
 
+# Escopo dos tickets de stream (ver create_stream_ticket)
+STREAM_TICKET_SCOPE = "realtime"
+
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
@@ -58,4 +61,49 @@ def verify_token(token: str) -> dict:
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token inválido ou expirado",
             headers={"WWW-Authenticate": "Bearer"},
-        )
\ No newline at end of file
+        )
+
+
+def create_stream_ticket(coach_id: str) -> str:
+    """
+    Cria o ticket de abertura do stream de eventos do treinador.
+    
+    O EventSource do navegador não envia headers, então a credencial vai
+    na URL e acaba nos logs de acesso e de proxies. Por isso o ticket
+    vale só EVENTS_TICKET_SECONDS, só abre o stream do treinador
+    ``coach_id`` (ID do perfil) e não tem ``sub``: não é aceito como
+    token de acesso nas demais rotas.
+    
+    Args:
+        coach_id: ID do perfil do treinador
+    
+    Returns:
+        Ticket JWT codificado
+    """
+    return create_access_token(
+        {"scope": STREAM_TICKET_SCOPE, "coach": coach_id},
+        expires_delta=timedelta(seconds=settings.EVENTS_TICKET_SECONDS),
+    )
+
+
+def verify_stream_ticket(ticket: str) -> str:
+    """
+    Verifica um ticket de stream.
+    
+    Args:
+        ticket: Ticket gerado por create_stream_ticket
+    
+    Returns:
+        ID do perfil do treinador
+    
+    Raises:
+        HTTPException: Se o ticket for inválido, expirado ou de outro escopo
+    """
+    payload = verify_token(ticket)
+    coach_id = payload.get("coach")
+    if payload.get("scope") != STREAM_TICKET_SCOPE or not coach_id:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Ticket inválido ou expirado",
+        )
+    return coach_id
@@ -0,0 +1,45 @@
+"""
+Token de sincronização (/sync).
+
+Opaco para o cliente: codifica em base64 o instante do banco em que o
+delta foi lido. Na sincronização seguinte o servidor devolve as linhas
+com ``updated_at`` (e as remoções com ``deleted_at``) posteriores a ele,
+menos SYNC_TOKEN_OVERLAP_SECONDS: transações que começaram antes do
+token e terminaram depois dele não ficam de fora. Linhas repetidas são
+inofensivas, pois o cliente as aplica pelo ID.
+"""
+import base64
+import json
+from datetime import datetime, timedelta
+from typing import Optional
+
+from fastapi import HTTPException, status
+
+from app.config import settings
+
+
+def encode_sync_token(read_at: datetime) -> str:
+    """Gera o token para o instante ``read_at``."""
+    raw = json.dumps([read_at.isoformat()], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_sync_token(token: Optional[str]) -> Optional[datetime]:
+    """
+    Instante a partir do qual o delta deve ser lido (já descontada a
+    margem), ou None sem token (sincronização completa).
+
+    Raises:
+        HTTPException: Se o token for inválido
+    """
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        (read_at,) = json.loads(raw)
+        return datetime.fromisoformat(read_at) - timedelta(seconds=settings.SYNC_TOKEN_OVERLAP_SECONDS)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Token de sincronização inválido"
+        )
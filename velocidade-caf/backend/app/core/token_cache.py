@@ -0,0 +1,126 @@
+"""
+Cache de tokens JWT já verificados.
+
+Evita decodificar o token e buscar o usuário no banco a cada requisição.
+As entradas são indexadas pelo SHA-256 do token (o token em si não fica
+em memória), expiram após TOKEN_CACHE_TTL_SECONDS ou no ``exp`` do
+token, o que vier primeiro, e são descartadas por LRU acima de
+TOKEN_CACHE_MAX_ENTRIES.
+
+O cache guarda as colunas do usuário, os IDs dos perfis de atleta e
+treinador e o treinador do atleta (ver api.deps.Principal); cada
+requisição recebe uma instância nova do usuário (ver crud.user.attach_user). Alterações no usuário e a
+criação ou remoção de perfis feitas pelo CRUD invalidam as entradas dele. Com vários processos, alterações
+feitas em outro processo só são vistas após o TTL: até lá o papel, os perfis e o treinador do atleta
+(``athlete_coach_id``, destino dos eventos em tempo real) podem estar desatualizados nos demais workers.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Set
+
+from app.config import settings
+
+
+class TokenCache:
+    """Cache LRU com TTL de token -> identidade (usuário e perfis)."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._by_user: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl_seconds > 0
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        """Retorna a identidade guardada se o token estiver em cache e válido."""
+        if not self.enabled:
+            return None
+        key = self._key(token)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, values = entry
+            if expires_at <= now:
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return values
+
+    def set(self, token: str, values: Dict[str, Any], token_exp: Optional[float] = None) -> None:
+        """Guarda a identidade resolvida a partir do token (``values["id"]`` é o ID do usuário)."""
+        if not self.enabled:
+            return
+        expires_at = time.time() + self.ttl_seconds
+        if token_exp is not None:
+            expires_at = min(expires_at, token_exp)
+        key = self._key(token)
+        user_id = values["id"]
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (expires_at, values)
+            self._by_user.setdefault(user_id, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate_user(self, user_id: str) -> None:
+        """Descarta todas as entradas de um usuário."""
+        with self._lock:
+            keys = self._by_user.pop(str(user_id), ())
+            for key in keys:
+                self._entries.pop(key, None)
+            self.invalidations += len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_user.clear()
+
+    def _remove(self, key: str) -> None:
+        _, values = self._entries.pop(key)
+        keys = self._by_user.get(values["id"])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_user[values["id"]]
+
+    def stats(self) -> Dict[str, Any]:
+        """Contadores expostos em /api/v1/metrics."""
+        total = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else None,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+token_cache = TokenCache(
+    max_entries=settings.TOKEN_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.TOKEN_CACHE_TTL_SECONDS,
+)
@@ -1,6 +1,6 @@
 """
 CRUD operations.
 """
-from app.crud import user, athlete, coach, jump, mark
+from app.crud import user, athlete, coach, jump, mark, summary, tombstone, sync, changes
 
-__all__ = ["user", "athlete", "coach", "jump", "mark"]
\ No newline at end of file
+__all__ = ["user", "athlete", "coach", "jump", "mark", "summary", "tombstone", "sync", "changes"]
\ No newline at end of file
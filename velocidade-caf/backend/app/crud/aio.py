@@ -0,0 +1,50 @@
+"""
+Versões assíncronas dos módulos de app.crud.
+
+Cada função é a mesma de app.crud, exposta como corrotina que roda com a
+sessão da requisição via ``app.db.session.run_db``::
+
+    from app.crud.aio import jump as crud_jump
+    jumps = await crud_jump.get_jumps_by_athlete(db, athlete_id)
+"""
+import functools
+from types import ModuleType
+
+from app.crud import athlete as _athlete, changes as _changes, coach as _coach, event as _event, jump as _jump, mark as _mark, summary as _summary, sync as _sync, user as _user
+from app.db.session import DBSession, run_db
+
+
+class AsyncCrudModule:
+    """Expõe as funções públicas de um módulo CRUD como corrotinas."""
+
+    def __init__(self, module: ModuleType):
+        self._module = module
+
+    def __getattr__(self, name: str):
+        fn = getattr(self._module, name)
+        if name.startswith("_") or not callable(fn) or isinstance(fn, type):
+            return fn
+
+        @functools.wraps(fn)
+        async def call(db: DBSession, *args, **kwargs):
+            return await run_db(db, fn, *args, **kwargs)
+
+        # Cache no próprio proxy para não recriar o wrapper a cada acesso
+        setattr(self, name, call)
+        return call
+
+    def __repr__(self) -> str:
+        return f"<AsyncCrudModule {self._module.__name__}>"
+
+
+user = AsyncCrudModule(_user)
+athlete = AsyncCrudModule(_athlete)
+coach = AsyncCrudModule(_coach)
+jump = AsyncCrudModule(_jump)
+mark = AsyncCrudModule(_mark)
+event = AsyncCrudModule(_event)
+summary = AsyncCrudModule(_summary)
+sync = AsyncCrudModule(_sync)
+changes = AsyncCrudModule(_changes)
+
+__all__ = ["AsyncCrudModule", "user", "athlete", "coach", "jump", "mark", "event", "summary", "sync", "changes"]
@@ -1,7 +1,11 @@
+from datetime import datetime
 from typing import List, Optional
+from sqlalchemy import and_, insert, select, update
 from sqlalchemy.orm import Session
 
-from app.models.user import AthleteProfile  # MUDANÇA AQUI
+from app.core.token_cache import token_cache
+from app.crud import tombstone as crud_tombstone
+from app.models.user import AthleteProfile, calcular_idade  # MUDANÇA AQUI
 from app.schemas import AthleteProfileCreate, AthleteProfileUpdate
 
 
@@ -10,6 +14,11 @@ def get_athlete_by_id(db: Session, athlete_id: str) -> Optional[AthleteProfile]:
     return db.query(AthleteProfile).filter(AthleteProfile.id == athlete_id).first()
 
 
+def get_athlete_user_id(db: Session, athlete_id: str) -> Optional[str]:
+    """USER_ID do atleta (ID do perfil), ou None se o perfil não existe."""
+    return db.execute(select(AthleteProfile.user_id).where(AthleteProfile.id == athlete_id)).scalar()
+
+
 def get_athlete_by_user_id(db: Session, user_id: str) -> Optional[AthleteProfile]:
     """Busca atleta por user_id."""
     return db.query(AthleteProfile).filter(AthleteProfile.user_id == user_id).first()
@@ -20,32 +29,98 @@ def get_athletes(db: Session, skip: int = 0, limit: int = 100) -> List[AthletePr
     return db.query(AthleteProfile).offset(skip).limit(limit).all()
 
 
+# Colunas de AthleteProfileResponse, na ordem do schema (idade é calculada)
+_ATHLETE_ROW_COLUMNS = (
+    AthleteProfile.nome, AthleteProfile.data_nascimento, AthleteProfile.altura_cm,
+    AthleteProfile.peso_kg, AthleteProfile.tamanho_pe, AthleteProfile.endereco,
+    AthleteProfile.telefone, AthleteProfile.prova_principal, AthleteProfile.prova_secundaria,
+    AthleteProfile.tempo_experiencia, AthleteProfile.categoria, AthleteProfile.id,
+    AthleteProfile.user_id, AthleteProfile.coach_id, AthleteProfile.tipo_sanguineo,
+    AthleteProfile.alergias, AthleteProfile.medicamentos, AthleteProfile.contato_emergencia,
+)
+
+
+def get_athlete_rows(db: Session, skip: int = 0, limit: int = 100) -> List[dict]:
+    """
+    Mesma listagem de get_athletes, já como dicts no formato de
+    AthleteProfileResponse, sem instanciar objetos ORM (ver app.core.fastjson).
+    """
+    rows = []
+    for row in db.query(*_ATHLETE_ROW_COLUMNS).offset(skip).limit(limit):
+        item = row._asdict()
+        item["idade"] = calcular_idade(item["data_nascimento"])
+        rows.append(item)
+    return rows
+
+
 def get_athletes_by_coach(db: Session, coach_id: str, skip: int = 0, limit: int = 100) -> List[AthleteProfile]:
     """Lista atletas de um treinador específico."""
     return db.query(AthleteProfile).filter(
         AthleteProfile.coach_id == coach_id
-    ).offset(skip).limit(limit).all()
+    ).order_by(AthleteProfile.nome, AthleteProfile.id).offset(skip).limit(limit).all()
+
+
+def changed_filter(coach_id: str, since: Optional[datetime]):
+    """
+    Atletas do elenco do treinador com perfil inserido ou alterado depois
+    de ``since`` (todos, sem ``since``). Usa o índice (coach_id, updated_at).
+    """
+    condition = AthleteProfile.coach_id == coach_id
+    if since is not None:
+        condition = and_(condition, AthleteProfile.updated_at > since)
+    return condition
+
+
+def get_athletes_changed_since(db: Session, coach_id: str, since: Optional[datetime] = None) -> List[AthleteProfile]:
+    """Atletas de changed_filter, na ordem das alterações."""
+    return db.query(AthleteProfile).filter(
+        changed_filter(coach_id, since)
+    ).order_by(AthleteProfile.updated_at, AthleteProfile.id).all()
+
+
+def count_athletes_by_coach(db: Session, coach_id: str) -> int:
+    """Conta os atletas de um treinador."""
+    return db.query(AthleteProfile).filter(AthleteProfile.coach_id == coach_id).count()
 
 
 def create_athlete(db: Session, athlete_in: AthleteProfileCreate) -> AthleteProfile:
-    """Cria novo perfil de atleta."""
-    athlete = AthleteProfile(**athlete_in.model_dump())
-    db.add(athlete)
+    """Cria novo perfil de atleta com ``INSERT ... RETURNING``."""
+    athlete = db.scalars(insert(AthleteProfile).values(**athlete_in.model_dump()).returning(AthleteProfile)).one()
     db.commit()
-    db.refresh(athlete)
+    # O cache de tokens guarda o ID do perfil junto com o usuário
+    token_cache.invalidate_user(athlete.user_id)
     return athlete
 
 
-def update_athlete(db: Session, athlete: AthleteProfile, athlete_in: AthleteProfileUpdate) -> AthleteProfile:
-    """Atualiza perfil de atleta."""
+def update_athlete(db: Session, athlete_id: str, athlete_in: AthleteProfileUpdate) -> Optional[AthleteProfile]:
+    """
+    Atualiza perfil de atleta com ``UPDATE ... RETURNING``, sem buscá-lo
+    antes. Retorna None se o perfil não existe.
+    
+    Se o atleta troca de treinador, a saída do elenco anterior é
+    registrada para o feed de alterações do elenco.
+    """
     update_data = athlete_in.model_dump(exclude_unset=True)
+    if not update_data:
+        return get_athlete_by_id(db, athlete_id)
     
-    for field, value in update_data.items():
-        setattr(athlete, field, value)
+    previous_coach_id = None
+    if "coach_id" in update_data:
+        previous_coach_id = db.execute(
+            select(AthleteProfile.coach_id).where(AthleteProfile.id == athlete_id)
+        ).scalar()
     
-    db.add(athlete)
+    athlete = db.scalars(
+        update(AthleteProfile).where(AthleteProfile.id == athlete_id).values(**update_data).returning(AthleteProfile),
+        execution_options={"populate_existing": True},
+    ).one_or_none()
+    coach_changed = athlete is not None and "coach_id" in update_data and previous_coach_id != athlete.coach_id
+    if coach_changed and previous_coach_id is not None:
+        crud_tombstone.record_deletion(db, "atleta", athlete.id, previous_coach_id)
     db.commit()
-    db.refresh(athlete)
+    if coach_changed:
+        # O cache de tokens guarda o treinador do atleta (ver api.deps.Principal)
+        token_cache.invalidate_user(athlete.user_id)
     return athlete
 
 
@@ -54,6 +129,9 @@ def delete_athlete(db: Session, athlete_id: str) -> bool:
     athlete = get_athlete_by_id(db, athlete_id)
     if athlete:
         db.delete(athlete)
+        if athlete.coach_id is not None:
+            crud_tombstone.record_deletion(db, "atleta", athlete.id, athlete.coach_id)
         db.commit()
+        token_cache.invalidate_user(athlete.user_id)
         return True
     return False
\ No newline at end of file
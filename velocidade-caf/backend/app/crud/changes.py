@@ -0,0 +1,97 @@
+"""
+Feeds de alterações ("o que mudou desde o token").
+
+Cada feed começa com uma única consulta que lê o instante do banco (o
+próximo token, ver app.core.sync_token) e testa com ``EXISTS`` sobre os
+índices de ``updated_at``/``deleted_at`` se há algo novo. Sem
+alterações, essa é a única ida ao banco; as listas só são buscadas
+quando o teste encontra linhas.
+"""
+from datetime import datetime
+from typing import Optional, Sequence, Tuple
+
+from sqlalchemy import exists, false, func, or_, select
+from sqlalchemy.orm import Session
+
+from app.crud import athlete as crud_athlete, jump as crud_jump, mark as crud_mark, tombstone as crud_tombstone
+
+
+def _probe(db: Session, since: Optional[datetime], conditions: Sequence) -> Tuple[datetime, bool]:
+    """
+    Instante do banco e se algum dos filtros ``conditions`` tem linhas,
+    em uma única consulta. Sem ``since`` tudo é alteração.
+    """
+    if since is None:
+        return db.execute(select(func.now())).scalar(), True
+    changed = or_(false(), *(exists().where(condition) for condition in conditions))
+    read_at, has_changes = db.execute(select(func.now(), changed)).one()
+    return read_at, bool(has_changes)
+
+
+def get_athlete_changes(
+    db: Session,
+    since: Optional[datetime] = None,
+    user_id: Optional[str] = None,
+    athlete_id: Optional[str] = None
+) -> dict:
+    """
+    Saltos (USER_ID ``user_id``) e/ou marcas (ID do perfil ``athlete_id``)
+    de um atleta inseridos, alterados ou removidos desde ``since``.
+
+    Returns:
+        ``read_at`` e, para cada tipo pedido, as linhas alteradas
+        (``saltos``/``marcas``) e os IDs removidos
+        (``saltos_removidos``/``marcas_removidas``)
+    """
+    conditions = []
+    if user_id is not None:
+        conditions += [crud_jump.changed_filter(since, user_id), crud_tombstone.deleted_filter("salto", since, user_id)]
+    if athlete_id is not None:
+        conditions += [crud_mark.changed_filter(since, athlete_id), crud_tombstone.deleted_filter("marca", since, athlete_id)]
+    read_at, has_changes = _probe(db, since, conditions)
+
+    changes = {"read_at": read_at}
+    if user_id is not None:
+        changes.update(saltos=[], saltos_removidos=[])
+        if has_changes:
+            changes["saltos"] = crud_jump.get_jumps_changed_since(db, user_id, since)
+            changes["saltos_removidos"] = crud_tombstone.get_deleted_ids(db, "salto", user_id, since)
+    if athlete_id is not None:
+        changes.update(marcas=[], marcas_removidas=[])
+        if has_changes:
+            changes["marcas"] = crud_mark.get_marks_changed_since(db, athlete_id, since)
+            changes["marcas_removidas"] = crud_tombstone.get_deleted_ids(db, "marca", athlete_id, since)
+    return changes
+
+
+def get_roster_changes(db: Session, coach_id: str, since: Optional[datetime] = None) -> dict:
+    """
+    Atletas, saltos e marcas do elenco do treinador (ID do perfil)
+    inseridos, alterados ou removidos desde ``since``.
+
+    Um atleta que entra no elenco aparece em ``atletas``; o histórico
+    anterior ao token não é reenviado e deve ser lido pelas listagens.
+    Saídas do elenco aparecem em ``atletas_removidos``.
+    """
+    read_at, has_changes = _probe(db, since, [
+        crud_athlete.changed_filter(coach_id, since),
+        crud_jump.changed_filter(since, coach_id=coach_id),
+        crud_mark.changed_filter(since, coach_id=coach_id),
+        *(crud_tombstone.deleted_filter(tipo, since, coach_id=coach_id) for tipo in ("atleta", "salto", "marca")),
+    ])
+    if not has_changes:
+        return {
+            "read_at": read_at,
+            "atletas": [], "atletas_removidos": [],
+            "saltos": [], "saltos_removidos": [],
+            "marcas": [], "marcas_removidas": [],
+        }
+    return {
+        "read_at": read_at,
+        "atletas": crud_athlete.get_athletes_changed_since(db, coach_id, since),
+        "atletas_removidos": crud_tombstone.get_deleted_ids(db, "atleta", since=since, coach_id=coach_id),
+        "saltos": crud_jump.get_jumps_changed_since(db, since=since, coach_id=coach_id),
+        "saltos_removidos": crud_tombstone.get_deleted_ids(db, "salto", since=since, coach_id=coach_id),
+        "marcas": crud_mark.get_marks_changed_since(db, since=since, coach_id=coach_id),
+        "marcas_removidas": crud_tombstone.get_deleted_ids(db, "marca", since=since, coach_id=coach_id),
+    }
@@ -1,6 +1,9 @@
 from typing import List, Optional
+from sqlalchemy import insert, update
 from sqlalchemy.orm import Session
 
+from app.core.token_cache import token_cache
+from app.crud import athlete as crud_athlete, jump as crud_jump, mark as crud_mark, summary as crud_summary
 from app.models.user import CoachProfile  # MUDANÇA AQUI
 from app.schemas import CoachProfileCreate, CoachProfileUpdate
 
@@ -21,24 +24,28 @@ def get_coaches(db: Session, skip: int = 0, limit: int = 100) -> List[CoachProfi
 
 
 def create_coach(db: Session, coach_in: CoachProfileCreate) -> CoachProfile:
-    """Cria novo perfil de treinador."""
-    coach = CoachProfile(**coach_in.model_dump())
-    db.add(coach)
+    """Cria novo perfil de treinador com ``INSERT ... RETURNING``."""
+    coach = db.scalars(insert(CoachProfile).values(**coach_in.model_dump()).returning(CoachProfile)).one()
     db.commit()
-    db.refresh(coach)
+    # O cache de tokens guarda o ID do perfil junto com o usuário
+    token_cache.invalidate_user(coach.user_id)
     return coach
 
 
-def update_coach(db: Session, coach: CoachProfile, coach_in: CoachProfileUpdate) -> CoachProfile:
-    """Atualiza perfil de treinador."""
+def update_coach(db: Session, coach_id: str, coach_in: CoachProfileUpdate) -> Optional[CoachProfile]:
+    """
+    Atualiza perfil de treinador com ``UPDATE ... RETURNING``, sem buscá-lo
+    antes. Retorna None se o perfil não existe.
+    """
     update_data = coach_in.model_dump(exclude_unset=True)
+    if not update_data:
+        return get_coach_by_id(db, coach_id)
     
-    for field, value in update_data.items():
-        setattr(coach, field, value)
-    
-    db.add(coach)
+    coach = db.scalars(
+        update(CoachProfile).where(CoachProfile.id == coach_id).values(**update_data).returning(CoachProfile),
+        execution_options={"populate_existing": True},
+    ).one_or_none()
     db.commit()
-    db.refresh(coach)
     return coach
 
 
@@ -48,5 +55,60 @@ def delete_coach(db: Session, coach_id: str) -> bool:
     if coach:
         db.delete(coach)
         db.commit()
+        token_cache.invalidate_user(coach.user_id)
         return True
-    return False
\ No newline at end of file
+    return False
+
+
+def get_coach_dashboard(db: Session, coach_id: str, skip: int = 0, limit: int = 100) -> dict:
+    """
+    Monta o painel do treinador: elenco paginado com último salto,
+    estatísticas de saltos e recordes de cada atleta.
+
+    Lê os resumos materializados (athlete_summaries) e usa um número fixo
+    de consultas agrupadas, independente do tamanho do elenco. Saltos são
+    gravados com o user_id do atleta e marcas com o ID do perfil (ver
+    rotas de jumps/marks).
+    """
+    total = crud_athlete.count_athletes_by_coach(db, coach_id)
+    athletes = crud_athlete.get_athletes_by_coach(db, coach_id, skip=skip, limit=limit)
+
+    user_ids = [a.user_id for a in athletes]
+    profile_ids = [a.id for a in athletes]
+    latest = crud_jump.get_latest_jumps(db, user_ids)
+    summaries = crud_summary.get_summaries(db, user_ids + profile_ids)
+
+    # Atletas ainda sem resumo materializado caem nas consultas agrupadas
+    missing_users = [i for i in user_ids if i not in summaries]
+    missing_profiles = [i for i in profile_ids if i not in summaries]
+    stats = crud_jump.get_jump_statistics_bulk(db, missing_users)
+    records = crud_mark.get_personal_records_bulk(db, missing_profiles)
+    for athlete_id, summary in summaries.items():
+        stats[athlete_id] = crud_summary.jump_statistics_from_summary(summary)
+        records[athlete_id] = {
+            "total_marcas": summary.total_marcas,
+            "recordes": summary.recordes,
+        }
+
+    empty_stats = {
+        "total_registros": 0,
+        "melhor_salto": None,
+        "media_geral": None,
+        "ultimo_registro": None
+    }
+
+    return {
+        "total": total,
+        "skip": skip,
+        "limit": limit,
+        "atletas": [
+            {
+                "atleta": athlete,
+                "ultimo_salto": latest.get(athlete.user_id),
+                "estatisticas_saltos": stats.get(athlete.user_id, empty_stats),
+                "total_marcas": records.get(athlete.id, {}).get("total_marcas", 0),
+                "recordes": records.get(athlete.id, {}).get("recordes", []),
+            }
+            for athlete in athletes
+        ],
+    }
@@ -0,0 +1,81 @@
+import re
+from typing import List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.models.event import Event
+
+# (código, nome, distância em metros, disciplina, menor é melhor)
+# A migração 8e3f4a5b6c7d grava esta mesma lista na tabela events.
+EVENT_CATALOG = [
+    ("60m", "60m rasos", 60, "velocidade", True),
+    ("100m", "100m rasos", 100, "velocidade", True),
+    ("150m", "150m rasos", 150, "velocidade", True),
+    ("200m", "200m rasos", 200, "velocidade", True),
+    ("300m", "300m rasos", 300, "velocidade", True),
+    ("400m", "400m rasos", 400, "velocidade", True),
+    ("600m", "600m", 600, "meio_fundo", True),
+    ("800m", "800m", 800, "meio_fundo", True),
+    ("1000m", "1000m", 1000, "meio_fundo", True),
+    ("1500m", "1500m", 1500, "meio_fundo", True),
+    ("3000m", "3000m", 3000, "fundo", True),
+    ("5000m", "5000m", 5000, "fundo", True),
+    ("10000m", "10000m", 10000, "fundo", True),
+    ("60m_barreiras", "60m com barreiras", 60, "barreiras", True),
+    ("100m_barreiras", "100m com barreiras", 100, "barreiras", True),
+    ("110m_barreiras", "110m com barreiras", 110, "barreiras", True),
+    ("400m_barreiras", "400m com barreiras", 400, "barreiras", True),
+    ("2000m_obstaculos", "2000m com obstáculos", 2000, "obstaculos", True),
+    ("3000m_obstaculos", "3000m com obstáculos", 3000, "obstaculos", True),
+    ("4x100m", "Revezamento 4x100m", 400, "revezamento", True),
+    ("4x400m", "Revezamento 4x400m", 1600, "revezamento", True),
+]
+
+
+def canonical_event(evento: str) -> str:
+    """
+    Normaliza o texto livre de Mark.evento para o código do catálogo.
+
+    Ex.: "200m rasos" -> "200m", "110 m com barreiras" -> "110m_barreiras",
+    "400mH" -> "400m_barreiras", "4x100" -> "4x100m".
+    """
+    text = evento.strip().lower()
+    text = re.sub(r"\s*metros\b", "m", text)
+    text = re.sub(r"\s*\brasos?\b", "", text)
+    text = re.sub(r"[\s_]*(com[\s_]+)?barreiras\b|(?<=m)h\b", "_barreiras", text)
+    text = re.sub(r"[\s_]*(com[\s_]+)?obst[aá]culos\b", "_obstaculos", text)
+    text = re.sub(r"\s+", "", text)
+    if re.fullmatch(r"\d+(x\d+)?", text):
+        text += "m"
+    return text
+
+
+def get_event(db: Session, event_id: str) -> Optional[Event]:
+    """Busca prova por código (fica no identity map da sessão)."""
+    return db.get(Event, event_id)
+
+
+def get_events(db: Session) -> List[Event]:
+    """Lista o catálogo de provas."""
+    return db.query(Event).order_by(Event.disciplina, Event.distancia_m, Event.id).all()
+
+
+def resolve_event_id(db: Session, evento: str) -> Optional[str]:
+    """Código do catálogo para o texto de ``evento``, ou None se a prova não existe no catálogo."""
+    event = get_event(db, canonical_event(evento))
+    return event.id if event else None
+
+
+def seed_events(db: Session) -> int:
+    """
+    Insere as provas de EVENT_CATALOG que ainda não existem (bancos criados
+    com create_all; em produção o catálogo vem da migração). Não faz commit.
+    """
+    existing = {event.id for event in db.query(Event.id)}
+    missing = [
+        Event(id=id_, nome=nome, distancia_m=distancia, disciplina=disciplina, menor_melhor=menor_melhor)
+        for id_, nome, distancia, disciplina, menor_melhor in EVENT_CATALOG
+        if id_ not in existing
+    ]
+    db.add_all(missing)
+    return len(missing)
@@ -1,27 +1,167 @@
-from typing import List, Optional
-from datetime import date
+import uuid
+from typing import Dict, List, Optional, Sequence, Tuple
+from datetime import date, datetime
+from decimal import Decimal
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, extract
+from sqlalchemy import Numeric, and_, case, cast, delete, func, select, tuple_, update
 
+from app.crud import summary as crud_summary, tombstone as crud_tombstone
+from app.db.functions import dialect_insert, greatest
 from app.models.jump import Jump  # JÁ ESTÁ CORRETO
+from app.models.user import AthleteProfile
 from app.schemas import JumpCreate, JumpUpdate
 
 
-def get_jump_by_id(db: Session, jump_id: str) -> Optional[Jump]:
-    """Busca salto por ID."""
-    return db.query(Jump).filter(Jump.id == jump_id).first()
+# Equivalentes SQL de Jump.max_jump e Jump.average
+max_jump_expr = greatest(Jump.jump1, Jump.jump2, Jump.jump3)
+mean_expr = (Jump.jump1 + Jump.jump2 + Jump.jump3) / 3.0
+average_expr = func.round(cast(mean_expr, Numeric), 2)
+
+# O ROUND do banco arredonda empates (x,xx5) para cima; o round() de
+# Jump.average arredonda o valor binário exato, com empates para o par
+# (30.125 -> 30.12). Os dois só divergem com a média a menos de 1e-6
+# centésimos de um empate: essas linhas ficam fora das somas em SQL e são
+# arredondadas em Python (ver sum_averages).
+near_tie_expr = func.abs(func.abs(mean_expr * 100 - func.round(mean_expr * 100)) - 0.5) < 1e-6
+sum_averages_expr = func.sum(case((near_tie_expr, 0), else_=average_expr))
+count_ties_expr = func.sum(case((near_tie_expr, 1), else_=0))
+CENTS = Decimal("0.01")
+
+
+def sum_averages(db: Session, partial, ties: int, *criteria) -> Decimal:
+    """
+    Soma de Jump.average das linhas que atendem a ``criteria``, igual à soma
+    feita em Python.
+    
+    ``partial`` e ``ties`` vêm de ``sum_averages_expr`` e ``count_ties_expr``
+    na mesma consulta; só havendo empates as médias dessas linhas são lidas
+    e arredondadas com round().
+    """
+    # Soma de valores com 2 casas (no SQLite a soma volta como float)
+    total = Decimal(str(partial or 0)).quantize(CENTS)
+    if ties:
+        means = db.scalars(select(mean_expr).where(*criteria, near_tie_expr))
+        total += sum(Decimal(str(round(mean, 2))) for mean in means)
+    return total
+
+
+def get_jump_by_id(db: Session, jump_id: str, athlete_id: Optional[str] = None) -> Optional[Jump]:
+    """
+    Busca salto por ID.
+    
+    Com ``athlete_id`` (USER_ID do atleta) só retorna o salto se pertencer
+    ao atleta: a verificação de dono fica no WHERE da própria busca.
+    """
+    query = db.query(Jump).filter(Jump.id == jump_id)
+    if athlete_id is not None:
+        query = query.filter(Jump.athlete_id == athlete_id)
+    return query.first()
 
 
 def get_jumps_by_athlete(
     db: Session,
     athlete_id: str,
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    after: Optional[Tuple[date, str]] = None
 ) -> List[Jump]:
-    """Lista todos os saltos de um atleta."""
-    return db.query(Jump).filter(
+    """
+    Lista todos os saltos de um atleta, do mais recente ao mais antigo.
+    
+    Com ``after`` (chave ``(date, id)`` do último item da página anterior,
+    ver app.core.pagination) a página é buscada por keyset e ``skip`` é
+    ignorado.
+    """
+    return _page_by_athlete(db.query(Jump), athlete_id, skip, limit, after).all()
+
+
+# Colunas de JumpResponse, na ordem do schema (max_jump/average são calculados)
+_JUMP_ROW_COLUMNS = (Jump.date, Jump.jump1, Jump.jump2, Jump.jump3, Jump.notes, Jump.id, Jump.athlete_id)
+
+
+def get_jump_rows_by_athlete(
+    db: Session,
+    athlete_id: str,
+    skip: int = 0,
+    limit: int = 100,
+    after: Optional[Tuple[date, str]] = None
+) -> List[dict]:
+    """
+    Mesma listagem de get_jumps_by_athlete, já como dicts no formato de
+    JumpResponse, sem instanciar objetos ORM (ver app.core.fastjson).
+    """
+    rows = _page_by_athlete(db.query(*_JUMP_ROW_COLUMNS), athlete_id, skip, limit, after)
+    return [
+        {
+            "date": jump_date,
+            "jump1": jump1,
+            "jump2": jump2,
+            "jump3": jump3,
+            "observacoes": notes,
+            "id": jump_id,
+            "athlete_id": owner_id,
+            "max_jump": max(jump1, jump2, jump3),
+            "average": round((jump1 + jump2 + jump3) / 3, 2),
+        }
+        for jump_date, jump1, jump2, jump3, notes, jump_id, owner_id in rows
+    ]
+
+
+def _page_by_athlete(query, athlete_id: str, skip: int, limit: int, after: Optional[Tuple[date, str]]):
+    """Filtro, ordenação e paginação comuns às listagens de saltos."""
+    query = query.filter(
         Jump.athlete_id == athlete_id
-    ).order_by(Jump.date.desc()).offset(skip).limit(limit).all()
+    ).order_by(Jump.date.desc(), Jump.id.desc())
+    if after is not None:
+        query = query.filter(tuple_(Jump.date, Jump.id) < tuple_(*after))
+    else:
+        query = query.offset(skip)
+    return query.limit(limit)
+
+
+def changed_filter(since: Optional[datetime], athlete_id: Optional[str] = None, coach_id: Optional[str] = None):
+    """
+    Saltos de um atleta (USER_ID) ou do elenco de um treinador (ID do
+    perfil) inseridos ou alterados depois de ``since`` (todos, sem
+    ``since``). Usa o índice (athlete_id, updated_at).
+    """
+    if coach_id is not None:
+        condition = Jump.athlete_id.in_(select(AthleteProfile.user_id).where(AthleteProfile.coach_id == coach_id))
+    else:
+        condition = Jump.athlete_id == athlete_id
+    if since is not None:
+        condition = and_(condition, Jump.updated_at > since)
+    return condition
+
+
+def get_jumps_changed_since(
+    db: Session,
+    athlete_id: Optional[str] = None,
+    since: Optional[datetime] = None,
+    coach_id: Optional[str] = None
+) -> List[Jump]:
+    """Saltos de changed_filter, na ordem das alterações."""
+    return db.query(Jump).filter(
+        changed_filter(since, athlete_id, coach_id)
+    ).order_by(Jump.updated_at, Jump.id).all()
+
+
+def get_jump_series(
+    db: Session,
+    athlete_id: str,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None
+) -> List[Tuple[date, float, float, float]]:
+    """
+    Série ``(date, jump1, jump2, jump3)`` de um atleta em ordem
+    cronológica, opcionalmente limitada a um período (ver app.services.trends).
+    """
+    stmt = select(Jump.date, Jump.jump1, Jump.jump2, Jump.jump3).where(Jump.athlete_id == athlete_id)
+    if start_date is not None:
+        stmt = stmt.where(Jump.date >= start_date)
+    if end_date is not None:
+        stmt = stmt.where(Jump.date <= end_date)
+    return db.execute(stmt.order_by(Jump.date)).all()
 
 
 def get_jumps_by_date_range(
@@ -40,6 +180,12 @@ def get_jumps_by_date_range(
     ).order_by(Jump.date.desc()).all()
 
 
+def month_bounds(year: int, month: int) -> Tuple[date, date]:
+    """Primeiro dia do mês e primeiro dia do mês seguinte (intervalo semiaberto)."""
+    start = date(year, month, 1)
+    return start, date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+
+
 def get_jumps_by_month(
     db: Session,
     athlete_id: str,
@@ -47,61 +193,238 @@ def get_jumps_by_month(
     month: int
 ) -> List[Jump]:
     """Busca saltos de um atleta em um mês específico."""
+    # Intervalo de datas (e não extract) para usar o índice (athlete_id, date)
+    start, end = month_bounds(year, month)
     return db.query(Jump).filter(
         and_(
             Jump.athlete_id == athlete_id,
-            extract('year', Jump.date) == year,
-            extract('month', Jump.date) == month
+            Jump.date >= start,
+            Jump.date < end
         )
     ).order_by(Jump.date.desc()).all()
 
 
 def get_best_jump(db: Session, athlete_id: str) -> Optional[Jump]:
     """Retorna o melhor salto de um atleta."""
-    jumps = db.query(Jump).filter(Jump.athlete_id == athlete_id).all()
-    if not jumps:
-        return None
-    # Usa a propriedade max_jump
-    return max(jumps, key=lambda j: j.max_jump)
+    return db.query(Jump).filter(
+        Jump.athlete_id == athlete_id
+    ).order_by(max_jump_expr.desc()).first()
+
+
+def upsert_jump_row(db: Session, values: dict) -> Tuple[Jump, bool]:
+    """
+    Grava um salto com ``INSERT ... ON CONFLICT (athlete_id, date) DO
+    UPDATE ... RETURNING``, sem atualizar o resumo nem fazer commit.
+    
+    O ID gerado aqui só volta no RETURNING se a linha foi inserida; senão
+    o dia já existia e o registro do dia foi sobrescrito.
+    
+    Returns:
+        O salto gravado e se a linha foi inserida
+    """
+    new_id = str(uuid.uuid4())
+    stmt = dialect_insert(db)(Jump).values(**values, id=new_id)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Jump.athlete_id, Jump.date],
+        set_={
+            "jump1": stmt.excluded.jump1,
+            "jump2": stmt.excluded.jump2,
+            "jump3": stmt.excluded.jump3,
+            "notes": stmt.excluded.notes,
+            "updated_at": func.now(),
+        },
+    )
+    jump = db.scalars(stmt.returning(Jump), execution_options={"populate_existing": True}).one()
+    return jump, jump.id == new_id
 
 
 def create_jump(db: Session, jump_in: JumpCreate) -> Jump:
-    """Cria novo registro de salto."""
-    jump = Jump(**jump_in.model_dump())
-    db.add(jump)
+    """
+    Cria registro de salto, ou sobrescreve o registro do mesmo dia, em
+    uma única instrução (ver upsert_jump_row). Um dia novo atualiza o
+    resumo de forma incremental; um dia existente o recalcula.
+    """
+    jump, inserted = upsert_jump_row(db, jump_in.model_dump())
+    if inserted:
+        crud_summary.apply_jump_created(db, jump)
+    else:
+        crud_summary.refresh_jump_summary(db, jump.athlete_id, days=[jump.date])
     db.commit()
-    db.refresh(jump)
     return jump
 
 
-def update_jump(db: Session, jump: Jump, jump_in: JumpUpdate) -> Jump:
-    """Atualiza registro de salto."""
-    update_data = jump_in.model_dump(exclude_unset=True)
+def upsert_jumps(db: Session, rows: Sequence[dict], update_existing: bool = True) -> int:
+    """
+    Grava vários saltos com ``INSERT ... ON CONFLICT (athlete_id, date)`` multi-linha.
     
-    for field, value in update_data.items():
-        setattr(jump, field, value)
+    Linhas de um dia já registrado atualizam o registro existente
+    (``update_existing``) ou são ignoradas. O resumo dos atletas (e os
+    meses dos dias gravados) é recalculado na mesma transação, de modo
+    que cada chamada deixa saltos, resumo e versão do ETag consistentes.
+    Faz commit.
     
-    db.add(jump)
+    Returns:
+        Número de linhas inseridas ou atualizadas
+    """
+    written = 0
+    if rows:
+        # executemany de uma instrução fixa: a compilação fica em cache e o
+        # driver agrupa as linhas em INSERTs multi-linha (insertmanyvalues)
+        stmt = dialect_insert(db)(Jump.__table__)
+        if update_existing:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Jump.athlete_id, Jump.date],
+                set_={
+                    "jump1": stmt.excluded.jump1,
+                    "jump2": stmt.excluded.jump2,
+                    "jump3": stmt.excluded.jump3,
+                    "notes": stmt.excluded.notes,
+                    "updated_at": func.now(),
+                },
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=[Jump.athlete_id, Jump.date])
+        result = db.execute(stmt, list(rows))
+        written = result.rowcount if result.rowcount >= 0 else len(rows)
+    if written:
+        days_by_athlete: Dict[str, set] = {}
+        for row in rows:
+            days_by_athlete.setdefault(row["athlete_id"], set()).add(row["date"])
+        for athlete_id, days in days_by_athlete.items():
+            crud_summary.refresh_jump_summary(db, athlete_id, days=days)
+    db.commit()
+    return written
+
+
+def update_jump_row(
+    db: Session,
+    jump_id: str,
+    values: dict,
+    athlete_id: Optional[str] = None,
+    expected_version: Optional[datetime] = None
+) -> Optional[Jump]:
+    """
+    ``UPDATE ... RETURNING`` de um salto, sem atualizar o resumo nem fazer
+    commit. A verificação de dono (``athlete_id``, USER_ID do atleta) e,
+    com ``expected_version``, a de que o salto não mudou depois dessa
+    versão (``updated_at``) ficam no WHERE. Retorna None se nenhuma linha
+    foi atualizada.
+    """
+    if not values:
+        return get_jump_by_id(db, jump_id, athlete_id)
+    stmt = update(Jump).where(Jump.id == jump_id)
+    if athlete_id is not None:
+        stmt = stmt.where(Jump.athlete_id == athlete_id)
+    if expected_version is not None:
+        stmt = stmt.where(Jump.updated_at <= expected_version)
+    return db.scalars(
+        stmt.values(**values).returning(Jump),
+        execution_options={"populate_existing": True},
+    ).one_or_none()
+
+
+def update_jump(
+    db: Session,
+    jump_id: str,
+    jump_in: JumpUpdate,
+    athlete_id: Optional[str] = None
+) -> Optional[Jump]:
+    """
+    Atualiza registro de salto com ``UPDATE ... RETURNING``.
+    
+    A busca, a verificação de dono e a gravação são uma única instrução
+    (ver update_jump_row). Retorna None se o salto não existe.
+    """
+    update_data = jump_in.model_dump(exclude_unset=True)
+    jump = update_jump_row(db, jump_id, update_data, athlete_id)
+    if jump is None or not update_data:
+        return jump
+    crud_summary.refresh_jump_summary(db, jump.athlete_id, days=[jump.date])
     db.commit()
-    db.refresh(jump)
     return jump
 
 
-def delete_jump(db: Session, jump_id: str) -> bool:
-    """Deleta registro de salto."""
-    jump = get_jump_by_id(db, jump_id)
-    if jump:
-        db.delete(jump)
-        db.commit()
-        return True
-    return False
+def delete_jump_row(db: Session, jump_id: str, athlete_id: Optional[str] = None) -> Optional[Tuple[str, date]]:
+    """
+    ``DELETE ... RETURNING`` de um salto, com registro da remoção (ver
+    app.crud.tombstone), sem atualizar o resumo nem fazer commit.
+    
+    Returns:
+        ``(athlete_id, date)`` do salto removido, ou None se não existe
+    """
+    stmt = delete(Jump).where(Jump.id == jump_id)
+    if athlete_id is not None:
+        stmt = stmt.where(Jump.athlete_id == athlete_id)
+    removed = db.execute(stmt.returning(Jump.athlete_id, Jump.date)).first()
+    if removed is None:
+        return None
+    crud_tombstone.record_deletion(db, "salto", jump_id, removed.athlete_id)
+    return removed.athlete_id, removed.date
+
+
+def delete_jump(db: Session, jump_id: str, athlete_id: Optional[str] = None) -> bool:
+    """Deleta registro de salto (do atleta ``athlete_id``, se informado)."""
+    removed = delete_jump_row(db, jump_id, athlete_id)
+    if removed is None:
+        return False
+    owner_id, day = removed
+    crud_summary.refresh_jump_summary(db, owner_id, days=[day])
+    db.commit()
+    return True
+
+
+def _statistics_query():
+    """Agregados de Jump.max_jump/Jump.average calculados no banco."""
+    return select(
+        func.count(Jump.id),
+        func.max(max_jump_expr),
+        sum_averages_expr,
+        count_ties_expr,
+        func.max(Jump.date),
+    )
+
+
+def _statistics_from_row(db: Session, athlete_id: str, total: int, melhor, soma, ties: int, ultimo) -> dict:
+    soma = sum_averages(db, soma, ties, Jump.athlete_id == athlete_id)
+    return {
+        "total_registros": total,
+        "melhor_salto": melhor,
+        "media_geral": round(float(soma / total), 2),
+        "ultimo_registro": ultimo
+    }
+
+
+def get_export_statement(athlete_id: Optional[str] = None, coach_id: Optional[str] = None):
+    """
+    Consulta de exportação dos saltos de um atleta (ID do usuário) ou de
+    todos os atletas de um treinador (ID do perfil), em ordem cronológica.
+    Retorna apenas colunas, para ser lida em streaming (ver db.session.stream_rows).
+    """
+    columns = [
+        Jump.date,
+        Jump.jump1,
+        Jump.jump2,
+        Jump.jump3,
+        Jump.notes.label("observacoes"),
+        max_jump_expr.label("melhor_salto"),
+        average_expr.label("media"),
+    ]
+    if coach_id is not None:
+        return select(AthleteProfile.nome.label("atleta"), *columns).join(
+            AthleteProfile, AthleteProfile.user_id == Jump.athlete_id
+        ).where(
+            AthleteProfile.coach_id == coach_id
+        ).order_by(AthleteProfile.nome, Jump.athlete_id, Jump.date, Jump.id)
+    return select(*columns).where(
+        Jump.athlete_id == athlete_id
+    ).order_by(Jump.date, Jump.id)
 
 
 def get_jump_statistics(db: Session, athlete_id: str) -> dict:
     """Retorna estatísticas dos saltos de um atleta."""
-    jumps = db.query(Jump).filter(Jump.athlete_id == athlete_id).all()
+    row = db.execute(_statistics_query().where(Jump.athlete_id == athlete_id)).one()
     
-    if not jumps:
+    if not row[0]:
         return {
             "total_registros": 0,
             "melhor_salto": None,
@@ -109,12 +432,28 @@ def get_jump_statistics(db: Session, athlete_id: str) -> dict:
             "ultimo_registro": None
         }
     
-    max_jumps = [j.max_jump for j in jumps]
-    averages = [j.average for j in jumps]
-    
-    return {
-        "total_registros": len(jumps),
-        "melhor_salto": max(max_jumps),
-        "media_geral": round(sum(averages) / len(averages), 2),
-        "ultimo_registro": max(jumps, key=lambda x: x.date).date
-    }
\ No newline at end of file
+    return _statistics_from_row(db, athlete_id, *row)
+
+
+def get_latest_jumps(db: Session, athlete_ids: Sequence[str]) -> Dict[str, Jump]:
+    """Retorna o salto mais recente de cada atleta, em uma única consulta."""
+    if not athlete_ids:
+        return {}
+    ranked = select(
+        Jump.id,
+        func.row_number().over(partition_by=Jump.athlete_id, order_by=Jump.date.desc()).label("rn"),
+    ).where(Jump.athlete_id.in_(athlete_ids)).subquery()
+    jumps = db.query(Jump).join(ranked, ranked.c.id == Jump.id).filter(ranked.c.rn == 1).all()
+    return {j.athlete_id: j for j in jumps}
+
+
+def get_jump_statistics_bulk(db: Session, athlete_ids: Sequence[str]) -> Dict[str, dict]:
+    """Estatísticas de saltos de vários atletas, agrupadas no banco."""
+    if not athlete_ids:
+        return {}
+    rows = db.execute(
+        _statistics_query().add_columns(Jump.athlete_id)
+        .where(Jump.athlete_id.in_(athlete_ids))
+        .group_by(Jump.athlete_id)
+    ).all()
+    return {athlete_id: _statistics_from_row(db, athlete_id, *stats) for *stats, athlete_id in rows}
@@ -1,27 +1,96 @@
-from typing import List, Optional
-from datetime import date
+from typing import Dict, List, Optional, Sequence, Tuple
+from datetime import date, datetime
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, extract
+from sqlalchemy import Float, Numeric, and_, case, cast, delete, false, func, insert, or_, select, true, tuple_, update
 
-from app.models.mark import Mark  # JÁ ESTÁ CORRETO
+from app.crud import event as crud_event, summary as crud_summary, tombstone as crud_tombstone
+from app.models.event import Event
+from app.models.mark import Mark, is_legal_wind  # JÁ ESTÁ CORRETO
+from app.models.user import AthleteProfile
 from app.schemas import MarkCreate, MarkUpdate
 
+# Expressões sobre marks LEFT JOIN events (ver _with_event)
+# Ritmo por 100 m com a distância do catálogo (nulo se a prova não é reconhecida)
+pace_expr = cast(func.round(cast(Mark.resultado * 100 / Event.distancia_m, Numeric), 2), Float)
+# Prova da marca: código do catálogo ou, se não reconhecida, o texto original
+event_key = func.coalesce(Mark.event_id, Mark.evento)
+# Ordenação "melhor primeiro": em provas onde maior é melhor ordena por -resultado
+rank_expr = case((Event.menor_melhor == false(), -Mark.resultado), else_=Mark.resultado)
+lower_is_better_expr = func.coalesce(Event.menor_melhor, true())
 
-def get_mark_by_id(db: Session, mark_id: str) -> Optional[Mark]:
-    """Busca marca por ID."""
-    return db.query(Mark).filter(Mark.id == mark_id).first()
+
+def _with_event(stmt):
+    return stmt.outerjoin(Event, Event.id == Mark.event_id)
+
+
+def _event_filter(evento: str):
+    """Marcas da prova ``evento``, pelo código do catálogo ou pelo texto original."""
+    return or_(Mark.event_id == crud_event.canonical_event(evento), Mark.evento == evento)
+
+
+def get_mark_by_id(db: Session, mark_id: str, athlete_id: Optional[str] = None) -> Optional[Mark]:
+    """
+    Busca marca por ID.
+    
+    Com ``athlete_id`` (ID do perfil do atleta) só retorna a marca se pertencer
+    ao atleta: a verificação de dono fica no WHERE da própria busca.
+    """
+    query = db.query(Mark).filter(Mark.id == mark_id)
+    if athlete_id is not None:
+        query = query.filter(Mark.athlete_id == athlete_id)
+    return query.first()
 
 
 def get_marks_by_athlete(
     db: Session,
     athlete_id: str,
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    after: Optional[Tuple[date, str]] = None
 ) -> List[Mark]:
-    """Lista todas as marcas de um atleta."""
-    return db.query(Mark).filter(
+    """
+    Lista todas as marcas de um atleta, da mais recente à mais antiga.
+    
+    Com ``after`` (chave ``(data, id)`` do último item da página anterior,
+    ver app.core.pagination) a página é buscada por keyset e ``skip`` é
+    ignorado.
+    """
+    return _page_by_athlete(db.query(Mark), athlete_id, skip, limit, after).all()
+
+
+# Colunas de MarkResponse, na ordem do schema
+_MARK_ROW_COLUMNS = (
+    Mark.evento, Mark.resultado, Mark.vento, Mark.data, Mark.local,
+    Mark.tipo, Mark.observacoes, Mark.id, Mark.athlete_id, Mark.event_id,
+    Mark.vento_legal,
+)
+
+
+def get_mark_rows_by_athlete(
+    db: Session,
+    athlete_id: str,
+    skip: int = 0,
+    limit: int = 100,
+    after: Optional[Tuple[date, str]] = None
+) -> List[dict]:
+    """
+    Mesma listagem de get_marks_by_athlete, já como dicts no formato de
+    MarkResponse, sem instanciar objetos ORM (ver app.core.fastjson).
+    """
+    rows = _page_by_athlete(db.query(*_MARK_ROW_COLUMNS), athlete_id, skip, limit, after)
+    return [row._asdict() for row in rows]
+
+
+def _page_by_athlete(query, athlete_id: str, skip: int, limit: int, after: Optional[Tuple[date, str]]):
+    """Filtro, ordenação e paginação comuns às listagens de marcas."""
+    query = query.filter(
         Mark.athlete_id == athlete_id
-    ).order_by(Mark.data.desc()).offset(skip).limit(limit).all()
+    ).order_by(Mark.data.desc(), Mark.id.desc())
+    if after is not None:
+        query = query.filter(tuple_(Mark.data, Mark.id) < tuple_(*after))
+    else:
+        query = query.offset(skip)
+    return query.limit(limit)
 
 
 def get_marks_by_event(
@@ -33,7 +102,7 @@ def get_marks_by_event(
     return db.query(Mark).filter(
         and_(
             Mark.athlete_id == athlete_id,
-            Mark.evento == evento
+            _event_filter(evento)
         )
     ).order_by(Mark.data.desc()).all()
 
@@ -74,51 +143,344 @@ def get_best_mark_by_event(
     evento: str
 ) -> Optional[Mark]:
     """Retorna a melhor marca de um atleta em um evento."""
-    return db.query(Mark).filter(
+    return _with_event(db.query(Mark)).filter(
         and_(
             Mark.athlete_id == athlete_id,
-            Mark.evento == evento
+            _event_filter(evento)
         )
-    ).order_by(Mark.resultado.asc()).first()  # Menor tempo = melhor
+    ).order_by(rank_expr, Mark.data.asc()).first()
+
+
+def _derived_columns(db: Session, data: dict) -> dict:
+    """
+    Colunas derivadas que o ORM preencheria (prova do catálogo e vento
+    legal), para gravações que não passam por Mark.
+    """
+    derived = {}
+    if "evento" in data:
+        derived["event_id"] = crud_event.resolve_event_id(db, data["evento"])
+    if "vento" in data:
+        derived["vento_legal"] = is_legal_wind(data["vento"])
+    return derived
+
+
+def changed_filter(since: Optional[datetime], athlete_id: Optional[str] = None, coach_id: Optional[str] = None):
+    """
+    Marcas de um atleta ou do elenco de um treinador (IDs de perfil)
+    inseridas ou alteradas depois de ``since`` (todas, sem ``since``).
+    Usa o índice (athlete_id, updated_at).
+    """
+    if coach_id is not None:
+        condition = Mark.athlete_id.in_(select(AthleteProfile.id).where(AthleteProfile.coach_id == coach_id))
+    else:
+        condition = Mark.athlete_id == athlete_id
+    if since is not None:
+        condition = and_(condition, Mark.updated_at > since)
+    return condition
+
+
+def get_marks_changed_since(
+    db: Session,
+    athlete_id: Optional[str] = None,
+    since: Optional[datetime] = None,
+    coach_id: Optional[str] = None
+) -> List[Mark]:
+    """Marcas de changed_filter, na ordem das alterações."""
+    return db.query(Mark).filter(
+        changed_filter(since, athlete_id, coach_id)
+    ).order_by(Mark.updated_at, Mark.id).all()
+
+
+def insert_mark_row(db: Session, values: dict) -> Mark:
+    """``INSERT ... RETURNING`` de uma marca, sem atualizar o resumo nem fazer commit."""
+    return db.scalars(
+        insert(Mark).values(**values, **_derived_columns(db, values)).returning(Mark)
+    ).one()
 
 
 def create_mark(db: Session, mark_in: MarkCreate) -> Mark:
-    """Cria novo registro de marca."""
-    mark = Mark(**mark_in.model_dump())
-    db.add(mark)
+    """Cria novo registro de marca com ``INSERT ... RETURNING``."""
+    mark = insert_mark_row(db, mark_in.model_dump())
+    crud_summary.apply_mark_created(db, mark)
     db.commit()
-    db.refresh(mark)
     return mark
 
 
-def update_mark(db: Session, mark: Mark, mark_in: MarkUpdate) -> Mark:
-    """Atualiza registro de marca."""
-    update_data = mark_in.model_dump(exclude_unset=True)
-    
-    for field, value in update_data.items():
-        setattr(mark, field, value)
+def update_mark_row(
+    db: Session,
+    mark_id: str,
+    values: dict,
+    athlete_id: Optional[str] = None,
+    expected_version: Optional[datetime] = None
+) -> Optional[Mark]:
+    """
+    ``UPDATE ... RETURNING`` de uma marca, sem atualizar o resumo nem
+    fazer commit. A verificação de dono (``athlete_id``, ID do perfil) e,
+    com ``expected_version``, a de que a marca não mudou depois dessa
+    versão (``updated_at``) ficam no WHERE. Retorna None se nenhuma linha
+    foi atualizada.
+    """
+    if not values:
+        return get_mark_by_id(db, mark_id, athlete_id)
+    stmt = update(Mark).where(Mark.id == mark_id)
+    if athlete_id is not None:
+        stmt = stmt.where(Mark.athlete_id == athlete_id)
+    if expected_version is not None:
+        stmt = stmt.where(Mark.updated_at <= expected_version)
+    return db.scalars(
+        stmt.values(**values, **_derived_columns(db, values)).returning(Mark),
+        execution_options={"populate_existing": True},
+    ).one_or_none()
+
+
+def update_mark(
+    db: Session,
+    mark_id: str,
+    mark_in: MarkUpdate,
+    athlete_id: Optional[str] = None
+) -> Optional[Mark]:
+    """
+    Atualiza registro de marca com ``UPDATE ... RETURNING``.
     
-    db.add(mark)
+    A busca, a verificação de dono e a gravação são uma única instrução
+    (ver update_mark_row). Retorna None se a marca não existe.
+    """
+    update_data = mark_in.model_dump(exclude_unset=True)
+    mark = update_mark_row(db, mark_id, update_data, athlete_id)
+    if mark is None or not update_data:
+        return mark
+    crud_summary.refresh_mark_summary(db, mark.athlete_id)
     db.commit()
-    db.refresh(mark)
     return mark
 
 
-def delete_mark(db: Session, mark_id: str) -> bool:
-    """Deleta registro de marca."""
-    mark = get_mark_by_id(db, mark_id)
-    if mark:
-        db.delete(mark)
-        db.commit()
-        return True
-    return False
+def delete_mark_row(db: Session, mark_id: str, athlete_id: Optional[str] = None) -> Optional[str]:
+    """
+    ``DELETE ... RETURNING`` de uma marca, com registro da remoção (ver
+    app.crud.tombstone), sem atualizar o resumo nem fazer commit.
+    
+    Returns:
+        ``athlete_id`` da marca removida, ou None se não existe
+    """
+    stmt = delete(Mark).where(Mark.id == mark_id)
+    if athlete_id is not None:
+        stmt = stmt.where(Mark.athlete_id == athlete_id)
+    owner_id = db.execute(stmt.returning(Mark.athlete_id)).scalar()
+    if owner_id is None:
+        return None
+    crud_tombstone.record_deletion(db, "marca", mark_id, owner_id)
+    return owner_id
+
+
+def delete_mark(db: Session, mark_id: str, athlete_id: Optional[str] = None) -> bool:
+    """Deleta registro de marca (do atleta ``athlete_id``, se informado)."""
+    owner_id = delete_mark_row(db, mark_id, athlete_id)
+    if owner_id is None:
+        return False
+    crud_summary.refresh_mark_summary(db, owner_id)
+    db.commit()
+    return True
+
+
+def get_export_statement(athlete_id: Optional[str] = None, coach_id: Optional[str] = None):
+    """
+    Consulta de exportação das marcas de um atleta (ID do perfil) ou de
+    todos os atletas de um treinador (ID do perfil), em ordem cronológica.
+    Retorna apenas colunas, para ser lida em streaming (ver db.session.stream_rows).
+    """
+    columns = [
+        Mark.data,
+        Mark.evento,
+        Mark.resultado,
+        Mark.vento,
+        Mark.local,
+        Mark.tipo,
+        Mark.observacoes,
+    ]
+    if coach_id is not None:
+        return select(AthleteProfile.nome.label("atleta"), *columns).join(
+            AthleteProfile, AthleteProfile.id == Mark.athlete_id
+        ).where(
+            AthleteProfile.coach_id == coach_id
+        ).order_by(AthleteProfile.nome, Mark.athlete_id, Mark.data, Mark.id)
+    return select(*columns).where(
+        Mark.athlete_id == athlete_id
+    ).order_by(Mark.data, Mark.id)
+
+
+# Colunas de um recorde (PersonalRecord), com o ritmo calculado no SQL
+_RECORD_COLUMNS = (
+    event_key.label("evento"),
+    Mark.resultado,
+    Mark.data,
+    Mark.local,
+    Mark.vento,
+    Mark.tipo,
+    pace_expr.label("ritmo_100m"),
+)
+
+
+def _best_marks_statement(athlete_id: str):
+    return _with_event(select(*_RECORD_COLUMNS).select_from(Mark)).where(Mark.athlete_id == athlete_id)
+
+
+def _best_per_event(db: Session, stmt, partition_by):
+    """
+    Primeira linha de ``stmt`` (na ordem de rank_expr) por ``partition_by``.
+
+    Usa DISTINCT ON no CockroachDB/Postgres e ROW_NUMBER() nos demais
+    bancos (SQLite).
+    """
+    if db.get_bind().dialect.name in ("postgresql", "cockroachdb"):
+        return stmt.distinct(*partition_by).order_by(*partition_by, rank_expr, Mark.data.asc()).subquery()
+    ranked = stmt.add_columns(
+        func.row_number().over(
+            partition_by=partition_by,
+            order_by=(rank_expr, Mark.data.asc()),
+        ).label("rn"),
+    ).subquery()
+    return select(*(c for c in ranked.c if c.name != "rn")).where(ranked.c.rn == 1).subquery()
+
+
+def get_best_marks(db: Session, athlete_id: str) -> list:
+    """
+    Retorna a melhor marca de um atleta em cada prova, em uma única
+    consulta, como linhas com as colunas de PersonalRecord.
+
+    "Melhor" segue Event.menor_melhor; marcas de provas fora do catálogo
+    são agrupadas pelo texto do evento e tratadas como tempo.
+    """
+    best = _best_per_event(db, _best_marks_statement(athlete_id), (event_key,))
+    return db.execute(select(best).order_by(best.c.evento)).all()
+
+
+def get_records_by_pace(db: Session, athlete_id: str) -> list:
+    """Recordes pessoais das provas com distância no catálogo, do melhor ao pior ritmo por 100 m."""
+    best = _best_per_event(db, _best_marks_statement(athlete_id), (event_key,))
+    return db.execute(
+        select(best).where(best.c.ritmo_100m.isnot(None)).order_by(best.c.ritmo_100m, best.c.evento)
+    ).all()
+
+
+def _leaderboard_statement(
+    columns,
+    coach_id: str,
+    event: Optional[Event],
+    evento: str,
+    tipo: Optional[str],
+    start_date: Optional[date],
+    end_date: Optional[date],
+    categoria: Optional[str],
+    wind_legal: bool
+):
+    """Marcas da prova dos atletas do treinador com os filtros do ranking."""
+    stmt = select(*columns).select_from(Mark).join(
+        AthleteProfile, AthleteProfile.id == Mark.athlete_id
+    ).where(
+        AthleteProfile.coach_id == coach_id,
+        # Filtra uma coluna só para usar (event_id, resultado) ou (evento, resultado)
+        Mark.event_id == event.id if event else Mark.evento == evento,
+    )
+    if tipo:
+        stmt = stmt.where(Mark.tipo == tipo)
+    if start_date:
+        stmt = stmt.where(Mark.data >= start_date)
+    if end_date:
+        stmt = stmt.where(Mark.data <= end_date)
+    if categoria:
+        stmt = stmt.where(AthleteProfile.categoria == categoria)
+    if wind_legal:
+        stmt = stmt.where(Mark.vento_legal == true())
+    return stmt
+
+
+def get_leaderboard(
+    db: Session,
+    coach_id: str,
+    evento: str,
+    tipo: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    categoria: Optional[str] = None,
+    wind_legal: bool = False,
+    limit: int = 10
+) -> dict:
+    """
+    Ranking dos atletas de um treinador (ID do perfil) em uma prova: a
+    melhor marca de cada atleta com os filtros aplicados, as ``limit``
+    melhores, com a posição (empates dividem a posição) calculada no SQL.
+
+    O melhor resultado por atleta, a posição e o corte são feitos só com
+    agregação; os detalhes (data, vento, local) são buscados depois
+    apenas para os atletas do ranking.
+    """
+    event = crud_event.get_event(db, crud_event.canonical_event(evento))
+    filters = (coach_id, event, evento, tipo, start_date, end_date, categoria, wind_legal)
+    lower_is_better = event.menor_melhor if event else True
+
+    best_result = func.min(Mark.resultado) if lower_is_better else func.max(Mark.resultado)
+    position = func.rank().over(
+        order_by=best_result.asc() if lower_is_better else best_result.desc()
+    ).label("posicao")
+    top = _leaderboard_statement(
+        (Mark.athlete_id, best_result.label("resultado"), position), *filters
+    ).group_by(Mark.athlete_id).order_by(position, Mark.athlete_id).limit(limit).subquery()
+
+    # Marca com o melhor resultado de cada atleta (a mais antiga, se repetido)
+    rows = db.execute(_with_event(_leaderboard_statement((
+        top.c.posicao,
+        Mark.athlete_id,
+        AthleteProfile.nome,
+        AthleteProfile.categoria,
+        Mark.id.label("mark_id"),
+        Mark.resultado,
+        Mark.vento,
+        Mark.vento_legal,
+        Mark.data,
+        Mark.local,
+        Mark.tipo,
+        pace_expr.label("ritmo_100m"),
+    ), *filters)).join(
+        top, and_(top.c.athlete_id == Mark.athlete_id, top.c.resultado == Mark.resultado)
+    ).order_by(top.c.posicao, Mark.data, AthleteProfile.nome)).all()
+
+    resultados = []
+    seen = set()
+    for row in rows:
+        if row.athlete_id not in seen:
+            seen.add(row.athlete_id)
+            resultados.append(row._asdict())
+
+    return {
+        "evento": event.id if event else evento,
+        "prova": event.nome if event else None,
+        "menor_melhor": lower_is_better,
+        "resultados": resultados,
+    }
+
+
+def get_record_row(db: Session, mark_id: str):
+    """Uma marca como linha de recorde, com o sentido de comparação da prova (menor_melhor)."""
+    return db.execute(
+        _with_event(select(*_RECORD_COLUMNS, lower_is_better_expr.label("menor_melhor")).select_from(Mark)).where(Mark.id == mark_id)
+    ).one()
+
+
+def get_mark_totals(db: Session, athlete_id: str) -> tuple:
+    """Retorna (total de marcas, data da última competição)."""
+    return tuple(db.execute(
+        select(
+            func.count(Mark.id),
+            func.max(case((Mark.tipo == "competicao", Mark.data))),
+        ).where(Mark.athlete_id == athlete_id)
+    ).one())
 
 
 def get_mark_statistics(db: Session, athlete_id: str) -> dict:
     """Retorna estatísticas das marcas de um atleta."""
-    marks = db.query(Mark).filter(Mark.athlete_id == athlete_id).all()
+    total, ultima_competicao = get_mark_totals(db, athlete_id)
     
-    if not marks:
+    if not total:
         return {
             "total_registros": 0,
             "eventos_praticados": [],
@@ -126,24 +488,19 @@ def get_mark_statistics(db: Session, athlete_id: str) -> dict:
             "ultima_competicao": None
         }
     
-    eventos = list(set([m.evento for m in marks]))
-    
-    melhores = {}
-    for evento in eventos:
-        melhor = get_best_mark_by_event(db, athlete_id, evento)
-        if melhor:
-            melhores[evento] = {
-                "resultado": melhor.resultado,
-                "data": melhor.data,
-                "local": melhor.local
-            }
-    
-    competicoes = [m for m in marks if m.tipo == "competicao"]
-    ultima_competicao = max(competicoes, key=lambda x: x.data).data if competicoes else None
+    melhores = {
+        melhor.evento: {
+            "resultado": melhor.resultado,
+            "data": melhor.data,
+            "local": melhor.local,
+            "ritmo_100m": melhor.ritmo_100m
+        }
+        for melhor in get_best_marks(db, athlete_id)
+    }
     
     return {
-        "total_registros": len(marks),
-        "eventos_praticados": eventos,
+        "total_registros": total,
+        "eventos_praticados": list(melhores),
         "melhores_marcas": melhores,
         "ultima_competicao": ultima_competicao
     }
@@ -151,24 +508,37 @@ def get_mark_statistics(db: Session, athlete_id: str) -> dict:
 
 def get_personal_records(db: Session, athlete_id: str) -> List[dict]:
     """Retorna os recordes pessoais de um atleta por evento."""
-    marks = db.query(Mark).filter(Mark.athlete_id == athlete_id).all()
-    
-    if not marks:
-        return []
-    
-    eventos = list(set([m.evento for m in marks]))
-    recordes = []
-    
-    for evento in eventos:
-        melhor = get_best_mark_by_event(db, athlete_id, evento)
-        if melhor:
-            recordes.append({
-                "evento": evento,
-                "resultado": melhor.resultado,
-                "data": melhor.data,
-                "local": melhor.local,
-                "vento": melhor.vento,
-                "tipo": melhor.tipo
-            })
-    
-    return recordes
\ No newline at end of file
+    return [melhor._asdict() for melhor in get_best_marks(db, athlete_id)]
+
+
+def get_personal_records_bulk(db: Session, athlete_ids: Sequence[str]) -> Dict[str, dict]:
+    """
+    Recordes pessoais e total de marcas de vários atletas em uma única
+    consulta (melhor resultado por atleta e evento).
+    """
+    if not athlete_ids:
+        return {}
+    ranked = _with_event(select(
+        Mark.athlete_id,
+        *_RECORD_COLUMNS,
+        func.row_number().over(
+            partition_by=(Mark.athlete_id, event_key),
+            order_by=(rank_expr, Mark.data.asc()),
+        ).label("rn"),
+        func.count().over(partition_by=Mark.athlete_id).label("total"),
+    ).select_from(Mark)).where(Mark.athlete_id.in_(athlete_ids)).subquery()
+    rows = db.execute(select(ranked).where(ranked.c.rn == 1).order_by(ranked.c.evento)).all()
+
+    result: Dict[str, dict] = {}
+    for row in rows:
+        entry = result.setdefault(row.athlete_id, {"total_marcas": row.total, "recordes": []})
+        entry["recordes"].append({
+            "evento": row.evento,
+            "resultado": row.resultado,
+            "data": row.data,
+            "local": row.local,
+            "vento": row.vento,
+            "tipo": row.tipo,
+            "ritmo_100m": row.ritmo_100m,
+        })
+    return result
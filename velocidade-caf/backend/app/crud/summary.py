@@ -0,0 +1,312 @@
+"""
+Manutenção e leitura do resumo materializado por atleta.
+
+As funções ``apply_*``/``refresh_*`` não fazem commit: são chamadas pelos
+writers de app.crud.jump e app.crud.mark antes do commit, na mesma
+transação da escrita.
+"""
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+
+from app.crud import jump as crud_jump, mark as crud_mark
+from app.db.functions import dialect_insert
+from app.models.jump import Jump
+from app.models.mark import Mark
+from app.models.summary import AthleteMonthlySummary, AthleteSummary
+
+ROLLING_WINDOWS = (7, 28)
+
+
+def get_summary(db: Session, athlete_id: str) -> Optional[AthleteSummary]:
+    """Busca o resumo de um atleta (leitura por chave primária)."""
+    return db.get(AthleteSummary, athlete_id)
+
+
+def get_summaries(db: Session, athlete_ids: Sequence[str]) -> Dict[str, AthleteSummary]:
+    """Busca os resumos de vários atletas em uma única consulta."""
+    if not athlete_ids:
+        return {}
+    summaries = db.query(AthleteSummary).filter(AthleteSummary.athlete_id.in_(athlete_ids)).all()
+    return {s.athlete_id: s for s in summaries}
+
+
+def _get_for_update(db: Session, athlete_id: str) -> AthleteSummary:
+    """
+    Busca o resumo do atleta travando a linha, criando-o antes se ainda
+    não existe.
+
+    A criação usa ``INSERT ... ON CONFLICT DO NOTHING``: se duas primeiras
+    escritas do atleta chegam juntas, as duas travam a mesma linha em vez
+    de uma falhar na chave primária.
+    """
+    summary = db.get(AthleteSummary, athlete_id, with_for_update=True)
+    if summary is None:
+        db.execute(
+            dialect_insert(db)(AthleteSummary).values(
+                athlete_id=athlete_id, total_saltos=0, soma_medias=Decimal(0), total_marcas=0, recordes=[],
+                versao_saltos=0, versao_marcas=0,
+            ).on_conflict_do_nothing(index_elements=[AthleteSummary.athlete_id])
+        )
+        summary = db.get(AthleteSummary, athlete_id, with_for_update=True)
+    return summary
+
+
+# SALTOS
+
+def _refresh_rolling_averages(db: Session, summary: AthleteSummary) -> None:
+    """Recalcula as médias móveis a partir dos últimos registros (consulta indexada)."""
+    # Médias brutas arredondadas com round(), como Jump.average
+    averages = [
+        round(mean, 2)
+        for mean in db.scalars(
+            select(crud_jump.mean_expr).where(
+                Jump.athlete_id == summary.athlete_id
+            ).order_by(Jump.date.desc()).limit(max(ROLLING_WINDOWS))
+        )
+    ]
+    for window in ROLLING_WINDOWS:
+        values = averages[:window]
+        setattr(summary, f"media_{window}", round(sum(values) / len(values), 2) if values else None)
+
+
+def apply_jump_created(db: Session, jump: Jump) -> None:
+    """Atualiza o resumo de forma incremental após inserir um salto."""
+    summary = _get_for_update(db, jump.athlete_id)
+    summary.versao_saltos += 1
+    summary.total_saltos += 1
+    summary.soma_medias = Decimal(summary.soma_medias) + Decimal(str(jump.average))
+    summary.melhor_salto = max(filter(None, [summary.melhor_salto, jump.max_jump]))
+    summary.ultimo_salto = max(filter(None, [summary.ultimo_salto, jump.date]))
+    _refresh_rolling_averages(db, summary)
+    refresh_monthly_summaries(db, jump.athlete_id, [jump.date])
+
+
+def refresh_jump_summary(db: Session, athlete_id: str, days: Optional[Iterable[date]] = None) -> None:
+    """
+    Recalcula a parte de saltos do resumo (após edição ou remoção).
+
+    ``days`` são as datas alteradas, cujos meses têm os agregados mensais
+    recalculados; sem ``days``, todos os meses do atleta são recalculados.
+    """
+    summary = _get_for_update(db, athlete_id)
+    summary.versao_saltos += 1
+    total, melhor, soma, ties, ultimo = db.execute(
+        select(
+            func.count(Jump.id),
+            func.max(crud_jump.max_jump_expr),
+            crud_jump.sum_averages_expr,
+            crud_jump.count_ties_expr,
+            func.max(Jump.date),
+        ).where(Jump.athlete_id == athlete_id)
+    ).one()
+    summary.total_saltos = total
+    # Mesmo arredondamento de Jump.average, usado por apply_jump_created
+    summary.soma_medias = crud_jump.sum_averages(db, soma, ties, Jump.athlete_id == athlete_id)
+    summary.melhor_salto = melhor
+    summary.ultimo_salto = ultimo
+    _refresh_rolling_averages(db, summary)
+    refresh_monthly_summaries(db, athlete_id, days)
+
+
+def get_jump_statistics(db: Session, athlete_id: str) -> dict:
+    """Estatísticas de saltos lidas do resumo materializado."""
+    summary = get_summary(db, athlete_id)
+    if summary is None:
+        return crud_jump.get_jump_statistics(db, athlete_id)
+    return jump_statistics_from_summary(summary)
+
+
+def jump_statistics_from_summary(summary: AthleteSummary) -> dict:
+    return {
+        "total_registros": summary.total_saltos,
+        "melhor_salto": summary.melhor_salto,
+        "media_geral": summary.media_geral,
+        "ultimo_registro": summary.ultimo_salto,
+        "media_ultimos_7": summary.media_7,
+        "media_ultimos_28": summary.media_28,
+    }
+
+
+# CALENDÁRIO MENSAL
+
+def _month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def refresh_monthly_summaries(db: Session, athlete_id: str, days: Optional[Iterable[date]] = None) -> None:
+    """
+    Recalcula os agregados mensais dos meses que contêm ``days`` (todos os
+    meses do atleta quando ``days`` é None).
+
+    Os saltos são lidos com um único intervalo de datas, que usa o índice
+    (athlete_id, date); média e consistência seguem Jump.average e
+    Jump.consistency. Os meses são gravados com ``INSERT ... ON CONFLICT
+    DO UPDATE``, que não colide com outra escrita criando o mesmo mês.
+    """
+    series = select(Jump.date, Jump.jump1, Jump.jump2, Jump.jump3).where(Jump.athlete_id == athlete_id)
+    empty = delete(AthleteMonthlySummary).where(AthleteMonthlySummary.athlete_id == athlete_id)
+    months = None
+    if days is not None:
+        months = {_month_start(day) for day in days}
+        if not months:
+            return
+        last = max(months)
+        start, end = min(months), crud_jump.month_bounds(last.year, last.month)[1]
+        series = series.where(Jump.date >= start, Jump.date < end)
+
+    jumps_by_month: Dict[date, List[Jump]] = defaultdict(list)
+    for day, jump1, jump2, jump3 in db.execute(series):
+        month = _month_start(day)
+        if months is None or month in months:
+            jumps_by_month[month].append(Jump(jump1=jump1, jump2=jump2, jump3=jump3))
+
+    if jumps_by_month:
+        stmt = dialect_insert(db)(AthleteMonthlySummary).values([
+            {
+                "athlete_id": athlete_id,
+                "mes": month,
+                "total_saltos": len(jumps),
+                "melhor_salto": max(j.max_jump for j in jumps),
+                "media": round(sum(j.average for j in jumps) / len(jumps), 2),
+                "consistencia": round(sum(j.consistency for j in jumps) / len(jumps), 2),
+            }
+            for month, jumps in sorted(jumps_by_month.items())
+        ])
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=[AthleteMonthlySummary.athlete_id, AthleteMonthlySummary.mes],
+            set_={
+                "total_saltos": stmt.excluded.total_saltos,
+                "melhor_salto": stmt.excluded.melhor_salto,
+                "media": stmt.excluded.media,
+                "consistencia": stmt.excluded.consistencia,
+                "updated_at": func.now(),
+            },
+        ))
+
+    # Meses que ficaram sem saltos perdem o agregado
+    if months is None:
+        db.execute(empty.where(AthleteMonthlySummary.mes.not_in(list(jumps_by_month))))
+    elif months - set(jumps_by_month):
+        db.execute(empty.where(AthleteMonthlySummary.mes.in_(months - set(jumps_by_month))))
+
+
+def get_jump_calendar(db: Session, athlete_id: str, year: int) -> dict:
+    """
+    Agregados mensais de um ano (leitura por intervalo na chave primária),
+    com os 12 meses presentes para o heatmap.
+    """
+    rows = {
+        row.mes.month: row
+        for row in db.scalars(
+            select(AthleteMonthlySummary).where(
+                AthleteMonthlySummary.athlete_id == athlete_id,
+                AthleteMonthlySummary.mes >= date(year, 1, 1),
+                AthleteMonthlySummary.mes < date(year + 1, 1, 1),
+            )
+        )
+    }
+    meses = []
+    for month in range(1, 13):
+        row = rows.get(month)
+        meses.append({
+            "mes": month,
+            "total_saltos": row.total_saltos if row else 0,
+            "melhor_salto": row.melhor_salto if row else None,
+            "media": row.media if row else None,
+            "consistencia": row.consistencia if row else None,
+        })
+    return {
+        "ano": year,
+        "total_saltos": sum(m["total_saltos"] for m in meses),
+        "meses": meses,
+    }
+
+
+# MARCAS
+
+def _record_from_mark(mark) -> dict:
+    """Recorde para o JSON do resumo, a partir de uma linha de crud_mark.get_best_marks."""
+    return {
+        "evento": mark.evento,
+        "resultado": mark.resultado,
+        "data": mark.data.isoformat(),
+        "local": mark.local,
+        "vento": mark.vento,
+        "tipo": mark.tipo,
+        "ritmo_100m": mark.ritmo_100m,
+    }
+
+
+def apply_mark_created(db: Session, mark: Mark) -> None:
+    """Atualiza o resumo de forma incremental após inserir uma marca."""
+    summary = _get_for_update(db, mark.athlete_id)
+    summary.versao_marcas += 1
+    summary.total_marcas += 1
+    if mark.tipo == "competicao":
+        summary.ultima_competicao = max(filter(None, [summary.ultima_competicao, mark.data]))
+
+    # Prova normalizada, ritmo e sentido da comparação vêm do catálogo
+    nova = crud_mark.get_record_row(db, mark.id)
+    recordes = [r for r in summary.recordes if r["evento"] != nova.evento]
+    atual = next((r for r in summary.recordes if r["evento"] == nova.evento), None)
+    if atual is None or (nova.resultado < atual["resultado"] if nova.menor_melhor else nova.resultado > atual["resultado"]):
+        atual = _record_from_mark(nova)
+    # Reatribui a lista para o SQLAlchemy detectar a alteração do JSON
+    summary.recordes = sorted(recordes + [atual], key=lambda r: r["evento"])
+
+
+def refresh_mark_summary(db: Session, athlete_id: str) -> None:
+    """Recalcula a parte de marcas do resumo (após edição ou remoção)."""
+    summary = _get_for_update(db, athlete_id)
+    summary.versao_marcas += 1
+    summary.total_marcas, summary.ultima_competicao = crud_mark.get_mark_totals(db, athlete_id)
+    summary.recordes = [_record_from_mark(m) for m in crud_mark.get_best_marks(db, athlete_id)]
+
+
+def _records_from_summary(summary: AthleteSummary) -> List[dict]:
+    return [{**r, "data": date.fromisoformat(r["data"])} for r in summary.recordes]
+
+
+def get_personal_records(db: Session, athlete_id: str) -> List[dict]:
+    """Recordes pessoais lidos do resumo materializado."""
+    summary = get_summary(db, athlete_id)
+    if summary is None:
+        return crud_mark.get_personal_records(db, athlete_id)
+    return _records_from_summary(summary)
+
+
+def get_mark_statistics(db: Session, athlete_id: str) -> dict:
+    """Estatísticas de marcas lidas do resumo materializado."""
+    summary = get_summary(db, athlete_id)
+    if summary is None:
+        return crud_mark.get_mark_statistics(db, athlete_id)
+    recordes = _records_from_summary(summary)
+    return {
+        "total_registros": summary.total_marcas,
+        "eventos_praticados": [r["evento"] for r in recordes],
+        "melhores_marcas": {
+            r["evento"]: {"resultado": r["resultado"], "data": r["data"], "local": r["local"], "ritmo_100m": r.get("ritmo_100m")}
+            for r in recordes
+        },
+        "ultima_competicao": summary.ultima_competicao,
+    }
+
+
+# RECONSTRUÇÃO
+
+def rebuild_summary(db: Session, athlete_id: str) -> AthleteSummary:
+    """Recalcula o resumo inteiro de um atleta a partir das tabelas brutas."""
+    refresh_jump_summary(db, athlete_id)
+    refresh_mark_summary(db, athlete_id)
+    return get_summary(db, athlete_id)
+
+
+def get_athlete_ids_with_history(db: Session) -> List[str]:
+    """IDs de atletas que possuem saltos ou marcas registrados."""
+    ids = select(Jump.athlete_id).union(select(Mark.athlete_id))
+    return list(db.scalars(ids))
@@ -0,0 +1,182 @@
+"""
+Aplicação dos lotes de mutações offline (/sync).
+
+O lote inteiro, o registro das chaves de idempotência e a leitura do
+delta rodam em uma única transação. Os resumos do atleta são
+recalculados uma vez por lote, e não a cada mutação.
+
+Resolução de conflitos:
+
+- criar salto: um dia já registrado é sobrescrito (mesma regra do POST /jumps);
+- atualizar: com ``atualizado_em``, só aplica se o registro não mudou no
+  servidor depois dessa versão; registro inexistente é conflito;
+- remover: registro já removido conta como aplicado.
+
+Erros de integridade do banco não viram resultado de mutação: o lote
+inteiro é desfeito com MutationFailed (dados da mutação recusados pelo
+banco, reenviar não adianta) ou DuplicateMutationKeys (outra
+sincronização gravou as mesmas chaves ao mesmo tempo; reenviar devolve
+os resultados dela).
+"""
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.crud import changes as crud_changes, jump as crud_jump, mark as crud_mark, summary as crud_summary
+from app.db.functions import is_unique_violation
+from app.models.sync import AppliedMutation
+
+
+class MutationFailed(Exception):
+    """O banco recusou os dados da mutação ``chave`` (CHECK, NOT NULL, FK...)."""
+
+    def __init__(self, chave: str, motivo: str):
+        super().__init__(chave, motivo)
+        self.chave = chave
+        self.motivo = motivo
+
+
+class DuplicateMutationKeys(Exception):
+    """Chaves do lote gravadas em paralelo por outra sincronização."""
+
+
+def _result(chave: str, status: str, record_id: Optional[str] = None, motivo: Optional[str] = None) -> dict:
+    return {"chave": chave, "status": status, "id": record_id, "motivo": motivo}
+
+
+def _conflict(chave: str, record_id: str, current) -> dict:
+    motivo = "Registro removido" if current is None else "Registro alterado no servidor"
+    return _result(chave, "conflito", record_id, motivo)
+
+
+def get_applied_mutations(db: Session, user_id: str, keys: Iterable[str]) -> Dict[str, dict]:
+    """Resultados já gravados para as chaves ``keys`` do usuário."""
+    keys = list(keys)
+    if not keys:
+        return {}
+    rows = db.scalars(
+        select(AppliedMutation).where(AppliedMutation.user_id == user_id, AppliedMutation.chave.in_(keys))
+    )
+    return {row.chave: _result(row.chave, row.status, row.record_id, row.motivo) for row in rows}
+
+
+def _apply_jump(db: Session, mutation: dict, jump_id: Optional[str], user_id: str) -> Tuple[dict, List[date]]:
+    """Aplica uma mutação de salto; retorna o resultado e os dias alterados."""
+    chave = mutation["chave"]
+    if mutation["operacao"] == "criar":
+        jump, inserted = crud_jump.upsert_jump_row(db, mutation["valores"])
+        return _result(chave, "aplicada", jump.id, None if inserted else "Registro do dia sobrescrito"), [jump.date]
+    if mutation["operacao"] == "remover":
+        removed = crud_jump.delete_jump_row(db, jump_id, user_id)
+        return _result(chave, "aplicada", jump_id), [removed[1]] if removed else []
+
+    jump = crud_jump.update_jump_row(db, jump_id, mutation["valores"], user_id, mutation["atualizado_em"])
+    if jump is None:
+        return _conflict(chave, jump_id, crud_jump.get_jump_by_id(db, jump_id, user_id)), []
+    return _result(chave, "aplicada", jump.id), [jump.date]
+
+
+def _apply_mark(db: Session, mutation: dict, mark_id: Optional[str], athlete_id: str) -> Tuple[dict, bool]:
+    """Aplica uma mutação de marca; retorna o resultado e se algo foi gravado."""
+    chave = mutation["chave"]
+    if mutation["operacao"] == "criar":
+        mark = crud_mark.insert_mark_row(db, mutation["valores"])
+        return _result(chave, "aplicada", mark.id), True
+    if mutation["operacao"] == "remover":
+        removed = crud_mark.delete_mark_row(db, mark_id, athlete_id)
+        return _result(chave, "aplicada", mark_id), removed is not None
+
+    mark = crud_mark.update_mark_row(db, mark_id, mutation["valores"], athlete_id, mutation["atualizado_em"])
+    if mark is None:
+        return _conflict(chave, mark_id, crud_mark.get_mark_by_id(db, mark_id, athlete_id)), False
+    return _result(chave, "aplicada", mark.id), True
+
+
+def apply_mutations(
+    db: Session,
+    user_id: str,
+    athlete_id: str,
+    mutations: Sequence[dict],
+    since: Optional[datetime] = None
+) -> dict:
+    """
+    Aplica o lote e lê o delta desde ``since`` na mesma transação. Faz commit.
+
+    As mutações vêm validadas de app.services.sync, com ``chave``,
+    ``operacao``, ``tipo``, ``id``, ``ref``, ``valores`` e
+    ``atualizado_em``, ou com ``erro`` se não passaram na validação.
+    Saltos são do USER_ID (``user_id``); marcas, do ID do perfil
+    (``athlete_id``). Chaves já recebidas, neste ou em lotes anteriores,
+    devolvem o resultado da primeira vez sem reaplicar.
+
+    Raises:
+        MutationFailed: Se o banco recusar os dados de uma mutação
+        DuplicateMutationKeys: Se outra transação gravou as mesmas chaves
+
+    Returns:
+        ``resultados`` na ordem do lote, ``saltos``/``marcas`` alterados e
+        IDs removidos desde ``since``, e ``read_at`` (instante do delta)
+    """
+    applied = get_applied_mutations(
+        db, user_id, {m["chave"] for m in mutations} | {m["ref"] for m in mutations if m["ref"]}
+    )
+    results = []
+    new_rows = []
+    jump_days = set()
+    marks_changed = False
+
+    for mutation in mutations:
+        chave = mutation["chave"]
+        if chave in applied:
+            results.append({**applied[chave], "repetida": True})
+            continue
+
+        # Registro criado offline: o ID vem do resultado da mutação que o criou
+        record_id = mutation["id"]
+        if record_id is None and mutation["ref"] is not None:
+            record_id = applied.get(mutation["ref"], {}).get("id")
+
+        if mutation["erro"]:
+            result = _result(chave, "erro", motivo=mutation["erro"])
+        elif mutation["operacao"] != "criar" and record_id is None:
+            result = _result(chave, "erro", motivo="Informe o id do registro ou a ref de uma mutação conhecida")
+        else:
+            try:
+                if mutation["tipo"] == "salto":
+                    result, days = _apply_jump(db, mutation, record_id, user_id)
+                    jump_days.update(days)
+                else:
+                    result, changed = _apply_mark(db, mutation, record_id, athlete_id)
+                    marks_changed = marks_changed or changed
+            except IntegrityError as e:
+                raise MutationFailed(chave, str(e.orig).splitlines()[0]) from e
+
+        applied[chave] = result
+        results.append(result)
+        new_rows.append({
+            "user_id": user_id,
+            "chave": chave,
+            "tipo": mutation["tipo"],
+            "status": result["status"],
+            "record_id": result["id"],
+            "motivo": result["motivo"] and result["motivo"][:255],
+        })
+
+    if jump_days:
+        crud_summary.refresh_jump_summary(db, user_id, days=jump_days)
+    if marks_changed:
+        crud_summary.refresh_mark_summary(db, athlete_id)
+    if new_rows:
+        try:
+            db.execute(insert(AppliedMutation), new_rows)
+        except IntegrityError as e:
+            if is_unique_violation(e):
+                raise DuplicateMutationKeys() from e
+            raise
+
+    delta = {"resultados": results, **crud_changes.get_athlete_changes(db, since, user_id, athlete_id)}
+    db.commit()
+    return delta
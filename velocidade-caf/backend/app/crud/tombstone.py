@@ -0,0 +1,50 @@
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import and_, insert, select
+from sqlalchemy.orm import Session
+
+from app.models.sync import Tombstone
+from app.models.user import AthleteProfile
+
+
+def record_deletion(db: Session, tipo: str, record_id: str, athlete_id: str) -> None:
+    """
+    Registra a remoção de um salto, marca ou atleta do elenco (sem commit).
+
+    ``athlete_id`` é o dono do registro: o mesmo valor de
+    jumps/marks.athlete_id, ou o ID do treinador para ``tipo="atleta"``.
+    """
+    db.execute(insert(Tombstone).values(tipo=tipo, record_id=record_id, athlete_id=athlete_id))
+
+
+def deleted_filter(tipo: str, since: Optional[datetime], athlete_id: Optional[str] = None, coach_id: Optional[str] = None):
+    """
+    Remoções do tipo ``tipo`` de um dono (``athlete_id``) ou do elenco de
+    um treinador (``coach_id``) depois de ``since``. Usa o índice
+    (athlete_id, tipo, deleted_at).
+    """
+    if coach_id is None:
+        owner = Tombstone.athlete_id == athlete_id
+    elif tipo == "atleta":
+        owner = Tombstone.athlete_id == coach_id
+    else:
+        # Saltos são do USER_ID do atleta; marcas, do ID do perfil
+        column = AthleteProfile.user_id if tipo == "salto" else AthleteProfile.id
+        owner = Tombstone.athlete_id.in_(select(column).where(AthleteProfile.coach_id == coach_id))
+    condition = and_(owner, Tombstone.tipo == tipo)
+    if since is not None:
+        condition = and_(condition, Tombstone.deleted_at > since)
+    return condition
+
+
+def get_deleted_ids(
+    db: Session,
+    tipo: str,
+    athlete_id: Optional[str] = None,
+    since: Optional[datetime] = None,
+    coach_id: Optional[str] = None
+) -> List[str]:
+    """IDs dos registros de deleted_filter, na ordem das remoções."""
+    stmt = select(Tombstone.record_id).where(deleted_filter(tipo, since, athlete_id, coach_id))
+    return list(db.scalars(stmt.order_by(Tombstone.deleted_at)))
@@ -1,24 +1,68 @@
-from typing import Optional
-from sqlalchemy.orm import Session
-import bcrypt
-
-from app.models.user import User
+from datetime import datetime
+from typing import Any, Dict, Optional, Sequence, Tuple
+from sqlalchemy import inspect, select
+from sqlalchemy.orm import Session, make_transient_to_detached, selectinload
+from app.core.token_cache import token_cache
+from app.models.user import AthleteProfile, CoachProfile, User
+from app.services.password import hash_password_sync, verify_password_sync
 from app.schemas import UserCreate, UserUpdate
 
 
 def get_password_hash(password: str) -> str:
-    """Gera hash da senha."""
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+    """Gera hash da senha (síncrono; rotas usam app.services.password)."""
+    return hash_password_sync(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verifica senha."""
-    return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
+    """Verifica senha (síncrono; rotas usam app.services.password)."""
+    return verify_password_sync(plain_password, hashed_password)
+
+
+def get_user_by_id(db: Session, user_id: str, eager: Sequence = ()) -> Optional[User]:
+    """
+    Busca usuário por ID.
+
+    Por padrão carrega apenas as colunas de ``users``; relacionamentos
+    (ex.: ``User.jumps``, ``User.marks``) passados em ``eager`` são
+    carregados antecipadamente com selectinload.
+    """
+    query = db.query(User).filter(User.id == user_id)
+    if eager:
+        query = query.options(*[selectinload(rel) for rel in eager])
+    return query.first()
+
+
+def get_user_with_profiles(
+    db: Session,
+    user_id: str
+) -> Optional[Tuple[User, Optional[str], Optional[str], Optional[str]]]:
+    """
+    Usuário, IDs dos perfis de atleta e de treinador e o treinador do
+    atleta (ou None) em uma única consulta, para a identidade da
+    requisição (api.deps.Principal).
+    """
+    row = db.execute(
+        select(User, AthleteProfile.id, CoachProfile.id, AthleteProfile.coach_id)
+        .outerjoin(AthleteProfile, AthleteProfile.user_id == User.id)
+        .outerjoin(CoachProfile, CoachProfile.user_id == User.id)
+        .where(User.id == user_id)
+    ).first()
+    return tuple(row) if row is not None else None
+
 
+def user_snapshot(user: User) -> Dict[str, Any]:
+    """Colunas do usuário, para guardar no cache de tokens."""
+    return {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs}
 
-def get_user_by_id(db: Session, user_id: str) -> Optional[User]:
-    """Busca usuário por ID."""
-    return db.query(User).filter(User.id == user_id).first()
+
+def attach_user(db: Session, values: Dict[str, Any]) -> User:
+    """
+    Recria o usuário a partir das colunas em cache e o associa à sessão
+    sem consultar o banco. Relacionamentos continuam carregados sob demanda.
+    """
+    user = User(**values)
+    make_transient_to_detached(user)
+    return db.merge(user, load=False)
 
 
 def get_user_by_email(db: Session, email: str) -> Optional[User]:
@@ -26,11 +70,11 @@ def get_user_by_email(db: Session, email: str) -> Optional[User]:
     return db.query(User).filter(User.email == email).first()
 
 
-def create_user(db: Session, user_in: UserCreate) -> User:
-    """Cria novo usuário."""
+def create_user(db: Session, user_in: UserCreate, password_hash: Optional[str] = None) -> User:
+    """Cria novo usuário (``password_hash`` evita recalcular o hash)."""
     user = User(
         email=user_in.email,
-        password_hash=get_password_hash(user_in.password),
+        password_hash=password_hash or get_password_hash(user_in.password),
         role=user_in.role,
         google_id=user_in.google_id,
     )
@@ -52,6 +96,19 @@ def update_user(db: Session, user: User, user_in: UserUpdate) -> User:
     
     db.add(user)
     db.commit()
+    token_cache.invalidate_user(user.id)
+    db.refresh(user)
+    return user
+
+
+def update_last_login(db: Session, user: User, password_hash: Optional[str] = None) -> User:
+    """Registra o horário do último login (e o novo hash, se refeito)."""
+    user.last_login = datetime.utcnow()
+    if password_hash:
+        user.password_hash = password_hash
+    db.add(user)
+    db.commit()
+    token_cache.invalidate_user(user.id)
     db.refresh(user)
     return user
 
@@ -0,0 +1,38 @@
+"""
+Funções SQL com compilação específica por dialeto.
+"""
+from sqlalchemy import Float
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.functions import GenericFunction
+
+
+def dialect_insert(db: Session):
+    """``insert`` do dialeto da sessão, com suporte a ``ON CONFLICT``."""
+    return postgresql.insert if db.get_bind().dialect.name != "sqlite" else sqlite.insert
+
+
+def is_unique_violation(error: IntegrityError) -> bool:
+    """Se o erro é de chave única/primária duplicada (e não de CHECK, NOT NULL ou FK)."""
+    orig = error.orig
+    # SQLSTATE 23505 (psycopg2: pgcode; asyncpg: sqlstate); SQLite só informa na mensagem
+    code = getattr(orig, "pgcode", None) or getattr(orig, "sqlstate", None)
+    if code is not None:
+        return code == "23505"
+    return "UNIQUE constraint failed" in str(orig)
+
+
+class greatest(GenericFunction):
+    """
+    Maior valor entre as colunas informadas (``GREATEST`` no
+    CockroachDB/Postgres, ``MAX`` escalar no SQLite).
+    """
+    type = Float()
+    inherit_cache = True
+
+
+@compiles(greatest, "sqlite")
+def _greatest_sqlite(element, compiler, **kw):
+    return "max(%s)" % compiler.process(element.clauses, **kw)
@@ -0,0 +1,104 @@
+"""
+Instrumentação do pool de conexões.
+
+Os pools instrumentados medem o tempo de checkout (espera por conexão)
+e contam quantos checkouts encontraram o pool esgotado.
+"""
+import threading
+import time
+from typing import Dict, List
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Limites (ms) dos buckets do histograma de latência de checkout
+CHECKOUT_BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000, 5000)
+
+
+class PoolMetrics:
+    """Contadores de checkout de um pool (thread-safe)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.waits = 0
+        self.timeouts = 0
+        self.checkout_ms_total = 0.0
+        self.checkout_ms_max = 0.0
+        self.buckets: List[int] = [0] * (len(CHECKOUT_BUCKETS_MS) + 1)
+
+    def record(self, elapsed_ms: float, waited: bool, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+                self.checkout_ms_total += elapsed_ms
+                self.checkout_ms_max = max(self.checkout_ms_max, elapsed_ms)
+                index = next((i for i, limit in enumerate(CHECKOUT_BUCKETS_MS) if elapsed_ms <= limit), len(CHECKOUT_BUCKETS_MS))
+                self.buckets[index] += 1
+            if waited:
+                self.waits += 1
+
+    def snapshot(self) -> Dict[str, object]:
+        with self._lock:
+            labels = [f"<={limit}ms" for limit in CHECKOUT_BUCKETS_MS] + [f">{CHECKOUT_BUCKETS_MS[-1]}ms"]
+            return {
+                "checkouts": self.checkouts,
+                "waits": self.waits,
+                "timeouts": self.timeouts,
+                "checkout_ms_avg": round(self.checkout_ms_total / self.checkouts, 3) if self.checkouts else 0.0,
+                "checkout_ms_max": round(self.checkout_ms_max, 3),
+                "checkout_ms_histogram": dict(zip(labels, self.buckets)),
+            }
+
+
+class _InstrumentedPoolMixin:
+    """Mede cada checkout do pool em ``self.metrics``."""
+
+    metrics: PoolMetrics
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _do_get(self):
+        waited = self._max_overflow >= 0 and self.checkedout() >= self.size() + self._max_overflow
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.record((time.perf_counter() - start) * 1000, waited, timed_out=True)
+            raise
+        self.metrics.record((time.perf_counter() - start) * 1000, waited)
+        return connection
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+    def gauges(self) -> Dict[str, int]:
+        """Estado atual do pool."""
+        return {
+            "size": self.size(),
+            "in_use": self.checkedout(),
+            "idle": self.checkedin(),
+            "overflow": max(self.overflow(), 0),
+            "max_overflow": self._max_overflow,
+        }
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    """QueuePool com métricas de checkout."""
+
+
+class InstrumentedAsyncAdaptedQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    """Pool assíncrono com métricas de checkout."""
+
+
+def pool_snapshot(pool) -> Dict[str, object]:
+    """Métricas e gauges de um pool instrumentado."""
+    if not isinstance(pool, _InstrumentedPoolMixin):
+        return {"instrumented": False, "status": pool.status()}
+    return {"instrumented": True, **pool.gauges(), **pool.metrics.snapshot()}
@@ -1,20 +1,225 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import declarative_base, sessionmaker
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Optional, Sequence, TypeVar, Union
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Row, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, declarative_base, sessionmaker
 from app.config import settings
+from app.db.metrics import InstrumentedAsyncAdaptedQueuePool, InstrumentedQueuePool, pool_snapshot
+
+T = TypeVar("T")
+
+
+def _engine_options(poolclass) -> dict:
+    """Opções de pool comuns às engines síncrona e assíncrona."""
+    return {
+        "poolclass": poolclass,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "echo": False,  # True para debug
+    }
+
+
+def _apply_statement_timeout(sync_engine) -> None:
+    """Define statement_timeout em cada nova conexão (CockroachDB/Postgres)."""
+    if not settings.DB_STATEMENT_TIMEOUT_MS or sync_engine.dialect.name == "sqlite":
+        return
+
+    @event.listens_for(sync_engine, "connect")
+    def _set_statement_timeout(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f"SET statement_timeout = {int(settings.DB_STATEMENT_TIMEOUT_MS)}")
+        cursor.close()
+
+
+def read_timestamp() -> str:
+    """Expressão de AS OF SYSTEM TIME das follower reads."""
+    if settings.DB_READ_STALENESS_SECONDS is None:
+        return "follower_read_timestamp()"
+    return f"'-{float(settings.DB_READ_STALENESS_SECONDS)}s'"
+
+
+def _apply_read_only(sync_engine) -> None:
+    """
+    Engine de leitura: cada transação é somente leitura e, com
+    DB_FOLLOWER_READS no CockroachDB, lê no instante read_timestamp().
+    Definido por transação (não por sessão) para não ser desfeito pelo
+    rollback ao devolver a conexão ao pool.
+    """
+    dialect = sync_engine.dialect.name
+    if dialect == "sqlite":
+        return
+    if settings.DB_FOLLOWER_READS and dialect == "cockroachdb":
+        # AS OF SYSTEM TIME já torna a transação somente leitura
+        statement = f"SET TRANSACTION AS OF SYSTEM TIME {read_timestamp()}"
+    else:
+        statement = "SET TRANSACTION READ ONLY"
+
+    @event.listens_for(sync_engine, "begin")
+    def _begin_read_only(conn):
+        conn.exec_driver_sql(statement)
+
 
 # Engine
-engine = create_engine(
-    settings.DATABASE_URL,
-    pool_pre_ping=True,
-    echo=False,  # True para debug
-)
+engine = create_engine(settings.DATABASE_URL, **_engine_options(InstrumentedQueuePool))
+_apply_statement_timeout(engine)
 
 # SessionLocal
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# expire_on_commit=False: os CRUDs gravam com RETURNING e devolvem a linha
+# já carregada; expirar no commit faria um SELECT extra na serialização
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+# Engine de leitura (réplica e/ou follower reads); sem configuração,
+# as sessões de leitura usam a engine principal
+READ_ROUTING = bool(settings.READ_DATABASE_URL or settings.DB_FOLLOWER_READS)
+read_engine = None
+ReadSessionLocal = SessionLocal
+
+if READ_ROUTING:
+    read_engine = create_engine(settings.READ_DATABASE_URL or settings.DATABASE_URL, **_engine_options(InstrumentedQueuePool))
+    _apply_statement_timeout(read_engine)
+    _apply_read_only(read_engine)
+    ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=read_engine)
 
 # Base
 Base = declarative_base()
 
+# Sessão usada pelas rotas: síncrona ou assíncrona conforme settings.DB_ASYNC
+DBSession = Union[Session, AsyncSession]
+
+# Drivers assíncronos usados para derivar ASYNC_DATABASE_URL
+ASYNC_DRIVERS = {
+    "cockroachdb": "cockroachdb+asyncpg",
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def get_async_database_url(read_only: bool = False) -> str:
+    """URL do banco (ou da réplica de leitura, com ``read_only``) para o driver assíncrono."""
+    if read_only and settings.ASYNC_READ_DATABASE_URL:
+        return settings.ASYNC_READ_DATABASE_URL
+    if read_only and settings.READ_DATABASE_URL:
+        url = make_url(settings.READ_DATABASE_URL)
+    elif settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    else:
+        url = make_url(settings.DATABASE_URL)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise RuntimeError(f"Sem driver assíncrono conhecido para '{backend}'; defina ASYNC_DATABASE_URL")
+    query = dict(url.query)
+    if "sslmode" in query and backend != "sqlite":
+        # asyncpg usa "ssl" em vez de "sslmode"
+        query["ssl"] = query.pop("sslmode")
+    return url.set(drivername=ASYNC_DRIVERS[backend], query=query).render_as_string(hide_password=False)
+
+
+async_engine = None
+AsyncSessionLocal: Optional[async_sessionmaker] = None
+async_read_engine = None
+AsyncReadSessionLocal: Optional[async_sessionmaker] = None
+
+if settings.DB_ASYNC:
+    async_engine = create_async_engine(
+        get_async_database_url(),
+        **_engine_options(InstrumentedAsyncAdaptedQueuePool),
+    )
+    _apply_statement_timeout(async_engine.sync_engine)
+    # expire_on_commit=False: atributos continuam acessíveis na serialização,
+    # fora do contexto assíncrono da sessão
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    AsyncReadSessionLocal = AsyncSessionLocal
+
+    if READ_ROUTING:
+        async_read_engine = create_async_engine(
+            get_async_database_url(read_only=True),
+            **_engine_options(InstrumentedAsyncAdaptedQueuePool),
+        )
+        _apply_statement_timeout(async_read_engine.sync_engine)
+        _apply_read_only(async_read_engine.sync_engine)
+        AsyncReadSessionLocal = async_sessionmaker(async_read_engine, autoflush=False, expire_on_commit=False)
+
+
+# Máximo de conexões simultâneas do pool (max_overflow negativo = ilimitado)
+_capacity = settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW if settings.DB_MAX_OVERFLOW >= 0 else None
+_session_slots = asyncio.Semaphore(_capacity) if _capacity else None
+# A engine de leitura tem pool próprio
+_read_session_slots = asyncio.Semaphore(_capacity) if _capacity and READ_ROUTING else _session_slots
+
+
+@asynccontextmanager
+async def session_slot(read_only: bool = False) -> AsyncIterator[None]:
+    """
+    Limita as sessões abertas ao tamanho do pool (da engine de leitura,
+    com ``read_only``).
+
+    No modo síncrono, uma requisição segura sua conexão enquanto espera
+    uma thread livre; sem este limite, threads bloqueadas esperando
+    conexão e conexões esperando thread podem travar até o timeout do
+    pool. O excedente aguarda aqui, no event loop.
+    """
+    slots = _read_session_slots if read_only else _session_slots
+    if slots is None:
+        yield
+        return
+    async with slots:
+        yield
+
+
+def get_pool_metrics() -> dict:
+    """Métricas dos pools de conexão ativos."""
+    metrics = {"primary": pool_snapshot(engine.pool)}
+    if async_engine is not None:
+        metrics["primary_async"] = pool_snapshot(async_engine.pool)
+    if read_engine is not None:
+        metrics["read"] = pool_snapshot(read_engine.pool)
+    if async_read_engine is not None:
+        metrics["read_async"] = pool_snapshot(async_read_engine.pool)
+    return metrics
+
+
+async def run_db(db: DBSession, fn: Callable[..., T], *args, **kwargs) -> T:
+    """
+    Executa uma função síncrona de app.crud com a sessão da requisição.
+
+    Com AsyncSession roda via ``run_sync`` (sem ocupar o threadpool);
+    com Session síncrona roda no threadpool do Starlette.
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+    return await run_in_threadpool(fn, db, *args, **kwargs)
+
+
+async def stream_rows(db: DBSession, stmt, batch_size: int = 1000) -> AsyncIterator[Sequence[Row]]:
+    """
+    Executa ``stmt`` com cursor no servidor e produz as linhas em lotes
+    de ``batch_size``, sem carregar o resultado inteiro em memória.
+
+    Com AsyncSession usa ``AsyncSession.stream``; com Session síncrona
+    cada lote é buscado no threadpool.
+    """
+    stmt = stmt.execution_options(yield_per=batch_size)
+    if isinstance(db, AsyncSession):
+        result = await db.stream(stmt)
+        async for partition in result.partitions():
+            yield partition
+        return
+
+    result = await run_in_threadpool(db.execute, stmt)
+    partitions = result.partitions()
+    try:
+        while (partition := await run_in_threadpool(next, partitions, None)) is not None:
+            yield partition
+    finally:
+        await run_in_threadpool(result.close)
+
 
 def get_db():
     """Dependência para obter sessão do banco."""
@@ -23,4 +228,3 @@ def get_db():
         yield db
     finally:
         db.close()
-
@@ -1,13 +1,15 @@
 
 import os
 from pathlib import Path
-from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import settings
 from app.api.v1 import api_router
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.realtime import event_hub
+from app.services import password as password_service
+from app.services.assets import StaticAssets, Templates
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -22,6 +24,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 # API Routes
@@ -33,78 +36,79 @@ FRONTEND_DIR = BASE_DIR / "frontend"
 STATIC_DIR = FRONTEND_DIR / "static"
 TEMPLATES_DIR = FRONTEND_DIR / "templates"
 
-# Mount static files (CSS, JS, images)
-if STATIC_DIR.exists():
-    app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
+# Arquivos estáticos (CSS, JS, imagens) e templates servidos da memória,
+# com hash no nome, versões comprimidas e ETag (ver app.services.assets)
+static_assets = StaticAssets(STATIC_DIR) if STATIC_DIR.exists() else None
+if static_assets is not None:
+    app.mount("/static", static_assets, name="static")
     print(f"✓ Servindo arquivos estáticos de: {STATIC_DIR}")
 else:
     print(f"⚠ Pasta de arquivos estáticos não encontrada: {STATIC_DIR}")
 
+templates = Templates(TEMPLATES_DIR, static_assets)
+
 # Helper function to serve HTML files
-def serve_html(filename: str):
+def serve_html(request: Request, filename: str):
     """Serve HTML file from templates directory."""
-    file_path = TEMPLATES_DIR / filename
-    if file_path.exists():
-        return FileResponse(file_path)
-    return HTMLResponse(content="<h1>404 - Página não encontrada</h1>", status_code=404)
+    return templates.response(request, filename)
 
 # Frontend routes
 @app.get("/", include_in_schema=False)
-async def serve_index():
+async def serve_index(request: Request):
     """Página inicial - login."""
-    return serve_html("index.html")
+    return serve_html(request, "index.html")
 
 @app.get("/index.html", include_in_schema=False)
-async def serve_login():
+async def serve_login(request: Request):
     """Página de login."""
-    return serve_html("index.html")
+    return serve_html(request, "index.html")
 
 @app.get("/register.html", include_in_schema=False)
-async def serve_register():
+async def serve_register(request: Request):
     """Página de registro."""
-    return serve_html("register.html")
+    return serve_html(request, "register.html")
 
 # Athlete routes
 @app.get("/athlete-analises.html", include_in_schema=False)
-async def serve_athlete_dashboard():
+async def serve_athlete_dashboard(request: Request):
     """Dashboard do atleta - análises."""
-    return serve_html("athlete-analises.html")
+    return serve_html(request, "athlete-analises.html")
 
 @app.get("/dashboard2.html", include_in_schema=False)
-async def serve_athlete_perfil():
+async def serve_athlete_perfil(request: Request):
     """Página de perfil do atleta."""
-    return serve_html("dashboard2.html")
+    return serve_html(request, "dashboard2.html")
 
 @app.get("/dashboard3.html", include_in_schema=False)
-async def serve_athlete_marks():
+async def serve_athlete_marks(request: Request):
     """Página de marcas do atleta."""
-    return serve_html("dashboard3.html")
+    return serve_html(request, "dashboard3.html")
 
 @app.get("/dash1.html", include_in_schema=False)
-async def serve_athlete_stats():
+async def serve_athlete_stats(request: Request):
     """Página de estatísticas do atleta."""
-    return serve_html("dash1.html")
+    return serve_html(request, "dash1.html")
 
 # Coach routes
 @app.get("/coach-dash.html", include_in_schema=False)
-async def serve_coach_dashboard():
+async def serve_coach_dashboard(request: Request):
     """Dashboard do treinador."""
-    return serve_html("coach-dash.html")
+    return serve_html(request, "coach-dash.html")
 
 @app.get("/coach-analise.html", include_in_schema=False)
-async def serve_coach_analise():
+async def serve_coach_analise(request: Request):
     """Página de análise de atletas do treinador."""
-    return serve_html("coach-analise.html")
+    return serve_html(request, "coach-analise.html")
 
 @app.get("/coach-config.html", include_in_schema=False)
-async def serve_coach_config():
+async def serve_coach_config(request: Request):
     """Página de configurações do treinador."""
-    return serve_html("coach-config.html")
+    return serve_html(request, "coach-config.html")
 
 @app.get("/coach-testes.html", include_in_schema=False)
-async def serve_coach_testes():
+async def serve_coach_testes(request: Request):
     """Página de testes do treinador."""
-    return serve_html("coach-testes.html")
+    return serve_html(request, "coach-testes.html")
 
 # API health check
 @app.get("/health")
@@ -126,4 +130,12 @@ async def startup_event():
     print(f"📚 API Docs: http://localhost:8000/docs")
     print(f"🌐 Frontend: http://localhost:8000")
     print(f"📊 ReDoc: http://localhost:8000/redoc")
-    print("="*60 + "\n")
\ No newline at end of file
+    print("="*60 + "\n")
+
+
+# Shutdown event
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Encerra o pool de processos de hash de senhas e o broker de eventos."""
+    password_service.shutdown()
+    await event_hub.close()
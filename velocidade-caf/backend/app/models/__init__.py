@@ -4,6 +4,9 @@ Importa todos os modelos para que o Alembic os detecte.
 from app.models.user import User, AthleteProfile, CoachProfile
 from app.models.jump import Jump
 from app.models.mark import Mark
+from app.models.event import Event
+from app.models.summary import AthleteSummary, AthleteMonthlySummary
+from app.models.sync import Tombstone, AppliedMutation
 
 __all__ = [
     "User",
@@ -11,4 +14,9 @@ __all__ = [
     "CoachProfile",
     "Jump",
     "Mark",
+    "Event",
+    "AthleteSummary",
+    "AthleteMonthlySummary",
+    "Tombstone",
+    "AppliedMutation",
 ]
\ No newline at end of file
@@ -0,0 +1,29 @@
+from __future__ import annotations
+from typing import Optional
+
+import sqlalchemy as sa
+from sqlalchemy import String, Integer, Boolean, CheckConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.session import Base
+
+
+class Event(Base):
+    """
+    Catálogo de provas.
+    A chave é o código canônico usado pelo frontend ("100m", "110m_barreiras").
+    """
+    __tablename__ = "events"
+
+    id: Mapped[str] = mapped_column(String(50), primary_key=True, comment="Código canônico da prova")
+    nome: Mapped[str] = mapped_column(String(100), nullable=False, comment="Nome para exibição")
+    distancia_m: Mapped[Optional[int]] = mapped_column(Integer, nullable=True, comment="Distância em metros")
+    disciplina: Mapped[str] = mapped_column(String(30), nullable=False, comment="velocidade, barreiras, meio_fundo, fundo, obstaculos, revezamento")
+    menor_melhor: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True, server_default=sa.true(), comment="Resultado menor é melhor (provas de tempo)")
+
+    __table_args__ = (
+        CheckConstraint("distancia_m IS NULL OR distancia_m > 0", name="check_distancia_positive"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<Event id={self.id} distancia={self.distancia_m}m>"
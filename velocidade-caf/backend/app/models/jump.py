@@ -58,6 +58,8 @@ class Jump(Base):
         UniqueConstraint("athlete_id", "date", name="unique_athlete_date"),
         # índice composto comum
         Index("idx_jumps_athlete_date", "athlete_id", "date"),
+        # feeds de alterações (updated_at > token)
+        Index("idx_jumps_athlete_updated", "athlete_id", "updated_at"),
         # validações
         CheckConstraint("jump1 > 0", name="check_jump1_positive"),
         CheckConstraint("jump2 > 0", name="check_jump2_positive"),
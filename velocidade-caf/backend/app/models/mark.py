@@ -3,13 +3,21 @@ import uuid
 from typing import Optional
 
 import sqlalchemy as sa
-from sqlalchemy import String, Text, Float, Integer, Date, DateTime, CheckConstraint, UniqueConstraint, Index, ForeignKey, text
+from sqlalchemy import String, Text, Float, Integer, Boolean, Date, DateTime, CheckConstraint, UniqueConstraint, Index, ForeignKey, text
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 
 
 from app.db.session import Base
 
+# Vento máximo (m/s) para a marca valer em provas oficiais
+WIND_LIMIT = 2.0
+
+
+def is_legal_wind(vento: Optional[float]) -> bool:
+    """Vento legal para recordes: sem medição ou até WIND_LIMIT m/s."""
+    return vento is None or vento <= WIND_LIMIT
+
 
 class Mark(Base):
     """
@@ -36,8 +44,21 @@ class Mark(Base):
 
     # Dados da prova
     evento: Mapped[str] = mapped_column(String(100), nullable=False, comment="Evento (100m, 200m, 400m, etc.)")
+    event_id: Mapped[Optional[str]] = mapped_column(
+        String(50),
+        ForeignKey("events.id"),
+        nullable=True,
+        comment="Prova do catálogo (evento normalizado); nulo se não reconhecida"
+    )
     resultado: Mapped[float] = mapped_column(Float, nullable=False, comment="Tempo em segundos")
     vento: Mapped[Optional[float]] = mapped_column(Float, nullable=True, comment="Vento em m/s")
+    vento_legal: Mapped[bool] = mapped_column(
+        Boolean,
+        nullable=False,
+        default=True,
+        server_default=sa.true(),
+        comment="Vento até WIND_LIMIT ou não informado (mantido a partir de vento)"
+    )
     data: Mapped[sa.Date] = mapped_column(Date, nullable=False, index=True, comment="Data da prova")
     local: Mapped[Optional[str]] = mapped_column(String(255), nullable=True, comment="Local da prova")
     tipo: Mapped[str] = mapped_column(String(50), nullable=False, comment="Tipo: 'competicao' ou 'teste'")
@@ -54,11 +75,26 @@ class Mark(Base):
         foreign_keys=[athlete_id],
     )
 
+    # Prova do catálogo (distância, disciplina)
+    event: Mapped[Optional["Event"]] = relationship("Event")
+
     __table_args__ = (
         # Índices úteis
         Index("idx_marks_athlete_date", "athlete_id", "data"),
+        # feeds de alterações (updated_at > token)
+        Index("idx_marks_athlete_updated", "athlete_id", "updated_at"),
         Index("idx_marks_athlete_evento", "athlete_id", "evento"),
-        Index("idx_marks_evento", "evento"),
+        Index("idx_marks_athlete_event_id", "athlete_id", "event_id"),
+        # Rankings por prova (ver crud.mark.get_leaderboard); no CockroachDB
+        # os índices guardam as demais colunas filtradas (STORING)
+        Index(
+            "idx_marks_evento_resultado", "evento", "resultado",
+            postgresql_include=["athlete_id", "data", "tipo", "vento_legal"],
+        ),
+        Index(
+            "idx_marks_event_id_resultado", "event_id", "resultado",
+            postgresql_include=["athlete_id", "data", "tipo", "vento_legal"],
+        ),
         Index("idx_marks_tipo", "tipo"),
         # Validações
         CheckConstraint("resultado > 0", name="check_resultado_positive"),
@@ -66,13 +102,17 @@ class Mark(Base):
         CheckConstraint("tipo IN ('competicao','teste')", name="check_tipo_valid"),
     )
 
+    @validates("vento")
+    def _sync_vento_legal(self, key, vento):
+        # vento_legal é persistido para filtrar rankings no SQL
+        self.vento_legal = is_legal_wind(vento)
+        return vento
+
     # Propriedades derivadas
     @property
     def is_valid_wind(self) -> bool:
         # até 2.0 m/s é válido em provas oficiais
-        if self.vento is None:
-            return True
-        return self.vento <= 2.0
+        return is_legal_wind(self.vento)
 
     @property
     def wind_status(self) -> str:
@@ -82,14 +122,20 @@ class Mark(Base):
 
     @property
     def pace_per_100m(self) -> float:
-        # extrai número do evento (ex.: "200m" -> 200)
-        try:
-            distance = int("".join(filter(str.isdigit, self.evento)))
-            if distance > 0:
-                return round((self.resultado / distance) * 100, 2)
-        except (ValueError, ZeroDivisionError):
-            pass
-        return self.resultado
+        # distância do catálogo se ``event`` já foi carregado (selectinload);
+        # o acesso não dispara consulta. Em listagens use crud.mark.pace_expr
+        distance = None
+        if "event" not in sa.inspect(self).unloaded and self.event is not None:
+            distance = self.event.distancia_m
+        if not distance:
+            # fora do catálogo: extrai número do evento (ex.: "200m" -> 200)
+            try:
+                distance = int("".join(filter(str.isdigit, self.evento)))
+            except ValueError:
+                return self.resultado
+        if distance <= 0:
+            return self.resultado
+        return round((self.resultado / distance) * 100, 2)
 
     @property
     def is_personal_best(self) -> bool:
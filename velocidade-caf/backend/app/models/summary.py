@@ -0,0 +1,80 @@
+from __future__ import annotations
+from decimal import Decimal
+from typing import List, Optional
+
+import sqlalchemy as sa
+from sqlalchemy import Integer, Float, Numeric, Date, DateTime, JSON, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.session import Base
+
+
+class AthleteSummary(Base):
+    """
+    Resumo materializado por atleta (saltos e marcas).
+    Mantido pelas funções de escrita em app.crud na mesma transação.
+    """
+    __tablename__ = "athlete_summaries"
+
+    athlete_id: Mapped[str] = mapped_column(
+        UUID(as_uuid=False),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+        comment="ID do atleta (mesmo valor de jumps/marks.athlete_id)"
+    )
+
+    # Saltos
+    total_saltos: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default=sa.text("0"))
+    soma_medias: Mapped[Decimal] = mapped_column(Numeric(14, 2), nullable=False, default=0, server_default=sa.text("0"), comment="Soma de Jump.average (para media_geral)")
+    melhor_salto: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    ultimo_salto: Mapped[Optional[sa.Date]] = mapped_column(Date, nullable=True)
+    media_7: Mapped[Optional[float]] = mapped_column(Float, nullable=True, comment="Média dos últimos 7 registros")
+    media_28: Mapped[Optional[float]] = mapped_column(Float, nullable=True, comment="Média dos últimos 28 registros")
+
+    # Marcas
+    total_marcas: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default=sa.text("0"))
+    ultima_competicao: Mapped[Optional[sa.Date]] = mapped_column(Date, nullable=True)
+    recordes: Mapped[List[dict]] = mapped_column(JSON, nullable=False, default=list, comment="Melhor marca por evento")
+
+    # Versões incrementadas a cada escrita (usadas no ETag das rotas de leitura)
+    versao_saltos: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default=sa.text("0"))
+    versao_marcas: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default=sa.text("0"))
+
+    updated_at: Mapped[Optional[sa.DateTime]] = mapped_column(DateTime(timezone=True), server_default=sa.func.now(), onupdate=sa.func.now())
+
+    @property
+    def media_geral(self) -> Optional[float]:
+        if not self.total_saltos:
+            return None
+        return round(float(Decimal(self.soma_medias) / self.total_saltos), 2)
+
+    def __repr__(self) -> str:
+        return f"<AthleteSummary athlete_id={self.athlete_id} saltos={self.total_saltos} marcas={self.total_marcas}>"
+
+
+
+class AthleteMonthlySummary(Base):
+    """
+    Agregados mensais de saltos por atleta (calendário/heatmap).
+    Mantido pelas funções de escrita em app.crud.jump na mesma transação.
+    """
+    __tablename__ = "athlete_monthly_summaries"
+
+    athlete_id: Mapped[str] = mapped_column(
+        UUID(as_uuid=False),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+        comment="ID do atleta (mesmo valor de jumps.athlete_id)"
+    )
+    mes: Mapped[sa.Date] = mapped_column(Date, primary_key=True, comment="Primeiro dia do mês")
+
+    total_saltos: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default=sa.text("0"))
+    melhor_salto: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    media: Mapped[Optional[float]] = mapped_column(Float, nullable=True, comment="Média de Jump.average no mês")
+    consistencia: Mapped[Optional[float]] = mapped_column(Float, nullable=True, comment="Média de Jump.consistency no mês")
+
+    updated_at: Mapped[Optional[sa.DateTime]] = mapped_column(DateTime(timezone=True), server_default=sa.func.now(), onupdate=sa.func.now())
+
+    def __repr__(self) -> str:
+        return f"<AthleteMonthlySummary athlete_id={self.athlete_id} mes={self.mes} saltos={self.total_saltos}>"
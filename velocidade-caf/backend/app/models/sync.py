@@ -0,0 +1,65 @@
+from __future__ import annotations
+import uuid
+from typing import Optional
+
+import sqlalchemy as sa
+from sqlalchemy import String, DateTime, Index, ForeignKey, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.session import Base
+
+
+class Tombstone(Base):
+    """
+    Registro de remoção de um salto, marca ou atleta do elenco.
+    Permite devolver as remoções nos feeds de alterações (app.crud.changes).
+    """
+    __tablename__ = "tombstones"
+
+    id: Mapped[str] = mapped_column(
+        UUID(as_uuid=False),
+        primary_key=True,
+        server_default=text("gen_random_uuid()"),
+        default=lambda: str(uuid.uuid4()),
+    )
+
+    tipo: Mapped[str] = mapped_column(String(10), nullable=False, comment="salto, marca ou atleta")
+    record_id: Mapped[str] = mapped_column(UUID(as_uuid=False), nullable=False, comment="ID do registro removido")
+    athlete_id: Mapped[str] = mapped_column(
+        UUID(as_uuid=False),
+        nullable=False,
+        comment="Dono do registro: jumps/marks.athlete_id, ou o treinador (athlete_profiles.coach_id) para atletas"
+    )
+    deleted_at: Mapped[sa.DateTime] = mapped_column(DateTime(timezone=True), server_default=sa.func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("idx_tombstones_athlete_deleted", "athlete_id", "tipo", "deleted_at"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<Tombstone {self.tipo} {self.record_id}>"
+
+
+class AppliedMutation(Base):
+    """
+    Mutação já aplicada pelo /sync, pela chave de idempotência do cliente.
+    Um reenvio da mesma chave devolve o resultado gravado sem reaplicar.
+    """
+    __tablename__ = "applied_mutations"
+
+    user_id: Mapped[str] = mapped_column(
+        UUID(as_uuid=False),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    chave: Mapped[str] = mapped_column(String(100), primary_key=True, comment="Chave de idempotência do cliente")
+
+    tipo: Mapped[str] = mapped_column(String(10), nullable=False, comment="salto ou marca")
+    status: Mapped[str] = mapped_column(String(20), nullable=False, comment="aplicada, conflito ou erro")
+    record_id: Mapped[Optional[str]] = mapped_column(UUID(as_uuid=False), nullable=True, comment="ID do registro afetado")
+    motivo: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    created_at: Mapped[sa.DateTime] = mapped_column(DateTime(timezone=True), server_default=sa.func.now(), nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<AppliedMutation {self.chave} {self.status}>"
@@ -13,6 +13,17 @@ from app.db.session import Base
 
 
 
+def calcular_idade(data_nascimento: Optional[date]) -> Optional[int]:
+    """Idade em anos completos (usada também nas listagens sem ORM)."""
+    if not data_nascimento:
+        return None
+    today = date.today()
+    return today.year - data_nascimento.year - (
+        (today.month, today.day) < (data_nascimento.month, data_nascimento.day)
+    )
+
+
+
 # USER MODEL
 
 class User(Base):
@@ -61,19 +72,20 @@ class User(Base):
         foreign_keys="CoachProfile.user_id",
     )
 
-    # Exemplos de relacionamentos 1–N (ajuste se tiver modelos Jump/Mark)
+    # Relacionamentos 1–N carregados sob demanda: o histórico completo só é
+    # buscado quando acessado ou pedido via selectinload (ver crud.user).
     jumps: Mapped[List["Jump"]] = relationship(
         back_populates="athlete",
         cascade="all, delete-orphan",
         foreign_keys="Jump.athlete_id",
-        lazy="selectin",
+        lazy="select",
     )
 
     marks: Mapped[List["Mark"]] = relationship(
         back_populates="athlete",
         cascade="all, delete-orphan",
         foreign_keys="Mark.athlete_id",
-        lazy="selectin",
+        lazy="select",
     )
 
     __table_args__ = (
@@ -155,19 +167,15 @@ class AthleteProfile(Base):
 
     __table_args__ = (
         Index("idx_athlete_user_id", "user_id"),
-        Index("idx_athlete_coach_id", "coach_id"),
+        # elenco do treinador e feed de alterações do elenco (updated_at > token)
+        Index("idx_athlete_coach_updated", "coach_id", "updated_at"),
         CheckConstraint("altura_cm IS NULL OR (altura_cm >= 100 AND altura_cm <= 250)", name="check_altura"),
         CheckConstraint("peso_kg IS NULL OR (peso_kg >= 30 AND peso_kg <= 200)", name="check_peso"),
     )
 
     @property
     def idade(self) -> Optional[int]:
-        if not self.data_nascimento:
-            return None
-        today = date.today()
-        return today.year - self.data_nascimento.year - (
-            (today.month, today.day) < (self.data_nascimento.month, self.data_nascimento.day)
-        )
+        return calcular_idade(self.data_nascimento)
 
     def __repr__(self) -> str:
         return f"<AthleteProfile nome={self.nome} user_id={self.user_id}>"
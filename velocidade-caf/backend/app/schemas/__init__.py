@@ -8,6 +8,7 @@ from app.schemas.user import (
     UserResponse,
     UserLogin,
     Token,
+    StreamTicket,
 )
 from app.schemas.athlete import (
     AthleteProfileBase,
@@ -26,12 +27,41 @@ from app.schemas.jump import (
     JumpCreate,
     JumpUpdate,
     JumpResponse,
+    JumpImportError,
+    JumpImportResult,
 )
 from app.schemas.mark import (
     MarkBase,
     MarkCreate,
     MarkUpdate,
     MarkResponse,
+    EventResponse,
+)
+from app.schemas.dashboard import (
+    JumpStatistics,
+    JumpTrendPoint,
+    JumpTrendSummary,
+    JumpTrendSlopes,
+    JumpTrends,
+    JumpCalendarMonth,
+    JumpCalendar,
+    PersonalRecord,
+    LeaderboardEntry,
+    Leaderboard,
+    CoachDashboardAthlete,
+    CoachDashboardResponse,
+)
+from app.schemas.sync import (
+    SyncMutation,
+    SyncRequest,
+    SyncResult,
+    SyncJump,
+    SyncMark,
+    SyncResponse,
+    SyncAthlete,
+    JumpChanges,
+    MarkChanges,
+    RosterChanges,
 )
 
 __all__ = [
@@ -42,6 +72,7 @@ __all__ = [
     "UserResponse",
     "UserLogin",
     "Token",
+    "StreamTicket",
     # Athlete
     "AthleteProfileBase",
     "AthleteProfileCreate",
@@ -57,9 +88,36 @@ __all__ = [
     "JumpCreate",
     "JumpUpdate",
     "JumpResponse",
+    "JumpImportError",
+    "JumpImportResult",
     # Mark
     "MarkBase",
     "MarkCreate",
     "MarkUpdate",
     "MarkResponse",
+    "EventResponse",
+    # Dashboard
+    "JumpStatistics",
+    "JumpTrendPoint",
+    "JumpTrendSummary",
+    "JumpTrendSlopes",
+    "JumpTrends",
+    "JumpCalendarMonth",
+    "JumpCalendar",
+    "PersonalRecord",
+    "LeaderboardEntry",
+    "Leaderboard",
+    "CoachDashboardAthlete",
+    "CoachDashboardResponse",
+    # Sync
+    "SyncMutation",
+    "SyncRequest",
+    "SyncResult",
+    "SyncJump",
+    "SyncMark",
+    "SyncResponse",
+    "SyncAthlete",
+    "JumpChanges",
+    "MarkChanges",
+    "RosterChanges",
 ]
\ No newline at end of file
@@ -0,0 +1,118 @@
+from datetime import date
+from typing import List, Optional
+from pydantic import BaseModel, Field
+
+from app.schemas.athlete import AthleteProfileResponse
+from app.schemas.jump import JumpResponse
+
+
+class JumpStatistics(BaseModel):
+    """Estatísticas agregadas de saltos."""
+    total_registros: int
+    melhor_salto: Optional[float] = None
+    media_geral: Optional[float] = None
+    ultimo_registro: Optional[date] = None
+    media_ultimos_7: Optional[float] = None
+    media_ultimos_28: Optional[float] = None
+
+
+class JumpTrendPoint(BaseModel):
+    """Um dia da série de tendências."""
+    date: date
+    melhor_salto: float
+    media: float
+    consistencia: float
+    media_7: float
+    media_28: float
+
+
+class JumpTrendSummary(BaseModel):
+    """Agregados do período."""
+    melhor_salto: Optional[float] = None
+    media_geral: Optional[float] = None
+    consistencia_media: Optional[float] = None
+
+
+class JumpTrendSlopes(BaseModel):
+    """Inclinação da regressão linear no período, por semana."""
+    melhor_salto: Optional[float] = None
+    media: Optional[float] = None
+    consistencia: Optional[float] = None
+
+
+class JumpTrends(BaseModel):
+    """Tendências dos saltos de um atleta em um período."""
+    inicio: Optional[date] = None
+    fim: Optional[date] = None
+    total_registros: int
+    resumo: JumpTrendSummary
+    tendencia: JumpTrendSlopes
+    serie: List[JumpTrendPoint]
+
+
+class JumpCalendarMonth(BaseModel):
+    """Agregados de saltos de um mês."""
+    mes: int
+    total_saltos: int
+    melhor_salto: Optional[float] = None
+    media: Optional[float] = None
+    consistencia: Optional[float] = None
+
+
+class JumpCalendar(BaseModel):
+    """Calendário anual de saltos (12 meses)."""
+    ano: int
+    total_saltos: int
+    meses: List[JumpCalendarMonth]
+
+
+class PersonalRecord(BaseModel):
+    """Melhor marca de um atleta em um evento."""
+    evento: str
+    resultado: float
+    data: date
+    local: Optional[str] = None
+    vento: Optional[float] = None
+    tipo: str
+    ritmo_100m: Optional[float] = Field(None, description="Segundos por 100 m (provas com distância no catálogo)")
+
+
+class LeaderboardEntry(BaseModel):
+    """Melhor marca de um atleta no ranking de uma prova."""
+    posicao: int
+    athlete_id: str
+    nome: str
+    categoria: Optional[str] = None
+    mark_id: str
+    resultado: float
+    vento: Optional[float] = None
+    vento_legal: bool
+    data: date
+    local: Optional[str] = None
+    tipo: str
+    ritmo_100m: Optional[float] = None
+
+
+class Leaderboard(BaseModel):
+    """Ranking dos atletas do treinador em uma prova."""
+    evento: str = Field(..., description="Código do catálogo ou, se não reconhecida, o texto do evento")
+    prova: Optional[str] = Field(None, description="Nome da prova no catálogo")
+    menor_melhor: bool
+    resultados: List[LeaderboardEntry]
+
+
+class CoachDashboardAthlete(BaseModel):
+    """Resumo de um atleta no painel do treinador."""
+    atleta: AthleteProfileResponse
+    ultimo_salto: Optional[JumpResponse] = None
+    estatisticas_saltos: JumpStatistics
+    total_marcas: int
+    recordes: List[PersonalRecord]
+
+
+class CoachDashboardResponse(BaseModel):
+    """Painel paginado do treinador."""
+    total: int
+    skip: int
+    limit: int
+    atletas: List[CoachDashboardAthlete]
@@ -1,5 +1,5 @@
 from datetime import date
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel, Field, ConfigDict
 
 
@@ -36,4 +36,19 @@ class JumpResponse(JumpBase):
     melhor_salto: Optional[float] = Field(None, alias="max_jump")
     media: Optional[float] = Field(None, alias="average")
 
-    model_config = ConfigDict(from_attributes=True, populate_by_name=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True, populate_by_name=True)
+
+
+class JumpImportError(BaseModel):
+    """Linha rejeitada na importação em lote."""
+    linha: int
+    erros: List[str]
+
+
+class JumpImportResult(BaseModel):
+    """Relatório da importação em lote de saltos."""
+    total_linhas: int
+    gravadas: int
+    com_erro: int
+    erros: List[JumpImportError]
+    erros_truncados: bool = False
@@ -7,7 +7,7 @@ class MarkBase(BaseModel):
     """Schema base de marca."""
     evento: str = Field(..., max_length=100, description="Evento (100m, 200m, 400m, etc.)")
     resultado: float = Field(..., gt=0, description="Tempo em segundos")
-    vento: Optional[float] = Field(None, description="Vento em m/s")
+    vento: Optional[float] = Field(None, ge=-5, le=5, description="Vento em m/s")
     data: date
     local: Optional[str] = Field(None, max_length=255)
     tipo: str = Field(..., pattern="^(competicao|teste)$", description="Tipo: 'competicao' ou 'teste'")
@@ -23,7 +23,7 @@ class MarkUpdate(BaseModel):
     """Schema para atualização de marca."""
     evento: Optional[str] = Field(None, max_length=100)
     resultado: Optional[float] = Field(None, gt=0)
-    vento: Optional[float] = None
+    vento: Optional[float] = Field(None, ge=-5, le=5)
     data: Optional[date] = None
     local: Optional[str] = Field(None, max_length=255)
     tipo: Optional[str] = Field(None, pattern="^(competicao|teste)$")
@@ -34,5 +34,18 @@ class MarkResponse(MarkBase):
     """Schema de resposta de marca."""
     id: str
     athlete_id: str
+    event_id: Optional[str] = Field(None, description="Prova do catálogo (GET /events)")
+    vento_legal: bool = Field(True, description="Vento até 2.0 m/s ou não informado")
 
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+
+class EventResponse(BaseModel):
+    """Prova do catálogo."""
+    id: str
+    nome: str
+    distancia_m: Optional[int] = None
+    disciplina: str
+    menor_melhor: bool
+
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,86 @@
+from datetime import datetime
+from typing import List, Literal, Optional
+from pydantic import BaseModel, Field
+
+from app.schemas.athlete import AthleteProfileResponse
+from app.schemas.jump import JumpResponse
+from app.schemas.mark import MarkResponse
+
+
+class SyncMutation(BaseModel):
+    """Mutação registrada offline pelo cliente."""
+    chave: str = Field(..., min_length=1, max_length=100, description="Chave de idempotência gerada pelo cliente")
+    operacao: Literal["criar", "atualizar", "remover"]
+    tipo: Literal["salto", "marca"]
+    id: Optional[str] = Field(None, description="ID do registro (atualizar/remover)")
+    ref: Optional[str] = Field(None, description="Chave da mutação que criou o registro, se ele foi criado offline")
+    dados: dict = Field(default_factory=dict, description="Campos de JumpCreate/MarkCreate ou JumpUpdate/MarkUpdate")
+    atualizado_em: Optional[datetime] = Field(
+        None,
+        description="Versão do registro que o cliente editou; se o servidor tiver uma mais nova, a mutação é um conflito",
+    )
+
+
+class SyncRequest(BaseModel):
+    """Lote de mutações e o token da última sincronização."""
+    token: Optional[str] = Field(None, description="Token devolvido na sincronização anterior")
+    mutacoes: List[SyncMutation] = Field(default_factory=list)
+
+
+class SyncResult(BaseModel):
+    """Resultado de uma mutação do lote."""
+    chave: str
+    status: Literal["aplicada", "conflito", "erro"]
+    id: Optional[str] = Field(None, description="ID do registro no servidor")
+    motivo: Optional[str] = None
+    repetida: bool = Field(False, description="Chave já recebida antes; o resultado é o da primeira vez")
+
+
+class SyncJump(JumpResponse):
+    """Salto no delta de sincronização."""
+    atualizado_em: Optional[datetime] = Field(None, validation_alias="updated_at")
+
+
+class SyncMark(MarkResponse):
+    """Marca no delta de sincronização."""
+    atualizado_em: Optional[datetime] = Field(None, validation_alias="updated_at")
+
+
+class SyncResponse(BaseModel):
+    """Resultados do lote e alterações do servidor desde o token recebido."""
+    token: str = Field(..., description="Enviar na próxima sincronização")
+    resultados: List[SyncResult]
+    saltos: List[SyncJump]
+    marcas: List[SyncMark]
+    saltos_removidos: List[str]
+    marcas_removidas: List[str]
+
+
+class SyncAthlete(AthleteProfileResponse):
+    """Atleta no feed de alterações do elenco."""
+    atualizado_em: Optional[datetime] = Field(None, validation_alias="updated_at")
+
+
+class JumpChanges(BaseModel):
+    """Saltos do atleta alterados ou removidos desde o token recebido."""
+    token: str = Field(..., description="Enviar na próxima consulta")
+    saltos: List[SyncJump]
+    saltos_removidos: List[str]
+
+
+class MarkChanges(BaseModel):
+    """Marcas do atleta alteradas ou removidas desde o token recebido."""
+    token: str = Field(..., description="Enviar na próxima consulta")
+    marcas: List[SyncMark]
+    marcas_removidas: List[str]
+
+
+class RosterChanges(BaseModel):
+    """Alterações no elenco do treinador desde o token recebido."""
+    token: str = Field(..., description="Enviar na próxima consulta")
+    atletas: List[SyncAthlete]
+    atletas_removidos: List[str] = Field(..., description="Atletas que saíram do elenco ou foram removidos")
+    saltos: List[SyncJump]
+    saltos_removidos: List[str]
+    marcas: List[SyncMark]
+    marcas_removidas: List[str]
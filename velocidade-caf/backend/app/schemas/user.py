@@ -48,6 +48,12 @@ class Token(BaseModel):
     user: UserResponse  # Inclui dados do usuário no response
 
 
+class StreamTicket(BaseModel):
+    """Ticket de curta duração para abrir o stream de eventos (/realtime/coach)."""
+    ticket: str
+    expira_em: int = Field(..., description="Validade do ticket em segundos")
+
+
 class TokenData(BaseModel):
     """Schema para dados extraídos do token."""
     user_id: Optional[str] = None
@@ -0,0 +1,167 @@
+"""
+Arquivos estáticos e páginas HTML servidos da memória.
+
+Na inicialização todos os arquivos de ``frontend/static`` são lidos e
+recebem um nome com o hash do conteúdo (``css/dashboard.3f2a9c1b7e.css``).
+Versões gzip e brotli (se o pacote ``brotli`` estiver instalado) são
+geradas uma única vez para os tipos de texto.
+
+- URLs com hash: ``Cache-Control: immutable`` por um ano.
+- URLs originais (usadas pelo service worker e por código JS): ``no-cache``
+  com ETag, ou seja, apenas uma revalidação condicional.
+- Templates: as referências a ``/static/...`` são reescritas para as URLs
+  com hash e as páginas são servidas com ETag.
+
+Alterações nos arquivos só são vistas após reiniciar o servidor.
+"""
+import gzip
+import hashlib
+import mimetypes
+import re
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+from typing import Dict, Optional
+
+from fastapi import Request, Response, status
+from starlette.types import Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # brotli é opcional; sem ele só há gzip
+    brotli = None
+
+COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "application/manifest+json", "image/svg+xml")
+MIN_COMPRESS_SIZE = 512
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+# href/src apontando para /static, inclusive as variantes relativas dos templates
+STATIC_REF = re.compile(r"""(?P<attr>\b(?:href|src)=["'])(?:\.\.?/+)*/?static/(?P<path>[^"'?#]+)""")
+
+
+@dataclass(frozen=True)
+class Asset:
+    """Conteúdo de um arquivo e suas variantes comprimidas."""
+    content: bytes
+    media_type: str
+    digest: str
+    gzip: Optional[bytes] = None
+    br: Optional[bytes] = None
+
+    @classmethod
+    def build(cls, content: bytes, media_type: str) -> "Asset":
+        digest = hashlib.sha256(content).hexdigest()
+        gz = br = None
+        if len(content) >= MIN_COMPRESS_SIZE and media_type.startswith(COMPRESSIBLE_TYPES):
+            gz = gzip.compress(content, compresslevel=9, mtime=0)
+            if brotli is not None:
+                br = brotli.compress(content, quality=11)
+        return cls(content=content, media_type=media_type, digest=digest, gzip=gz, br=br)
+
+    @property
+    def fingerprint(self) -> str:
+        return self.digest[:10]
+
+    @property
+    def etag(self) -> str:
+        # Fraco: o mesmo ETag vale para as variantes comprimidas
+        return f'W/"{self.digest[:32]}"'
+
+    def response(self, request: Request, cache_control: str) -> Response:
+        """Resposta com negociação de Content-Encoding e suporte a If-None-Match."""
+        headers = {"ETag": self.etag, "Cache-Control": cache_control, "Vary": "Accept-Encoding"}
+        if request.headers.get("if-none-match") == self.etag:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        body = self.content
+        accepted = request.headers.get("accept-encoding", "")
+        if self.br is not None and "br" in accepted:
+            body, headers["Content-Encoding"] = self.br, "br"
+        elif self.gzip is not None and "gzip" in accepted:
+            body, headers["Content-Encoding"] = self.gzip, "gzip"
+
+        if request.method == "HEAD":
+            headers["Content-Length"] = str(len(body))
+            body = b""
+        return Response(content=body, media_type=self.media_type, headers=headers)
+
+
+def _media_type(path: Path) -> str:
+    media_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+    if media_type.startswith("text/") or media_type == "application/javascript":
+        media_type += "; charset=utf-8"
+    return media_type
+
+
+def _hashed_name(relative: str, fingerprint: str) -> str:
+    path = PurePosixPath(relative)
+    return str(path.with_name(f"{path.stem}.{fingerprint}{path.suffix}"))
+
+
+class StaticAssets:
+    """
+    Aplicação ASGI montada em ``/static`` (substitui StaticFiles).
+
+    ``url(path)`` devolve a URL com hash de um arquivo, usada na
+    reescrita dos templates.
+    """
+
+    def __init__(self, directory: Path, prefix: str = "/static"):
+        self.prefix = prefix
+        self.assets: Dict[str, Asset] = {}
+        self.hashed: Dict[str, str] = {}  # nome com hash -> caminho original
+        self.urls: Dict[str, str] = {}  # caminho original -> URL com hash
+        for file in sorted(p for p in directory.rglob("*") if p.is_file()):
+            relative = file.relative_to(directory).as_posix()
+            asset = Asset.build(file.read_bytes(), _media_type(file))
+            hashed = _hashed_name(relative, asset.fingerprint)
+            self.assets[relative] = asset
+            self.hashed[hashed] = relative
+            self.urls[relative] = f"{prefix}/{hashed}"
+
+    def url(self, path: str) -> Optional[str]:
+        return self.urls.get(path.lstrip("/"))
+
+    def response(self, request: Request, path: str) -> Response:
+        if path in self.hashed:
+            return self.assets[self.hashed[path]].response(request, IMMUTABLE)
+        if path in self.assets:
+            return self.assets[path].response(request, REVALIDATE)
+        return Response(status_code=status.HTTP_404_NOT_FOUND)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        request = Request(scope, receive)
+        if request.method not in ("GET", "HEAD"):
+            response = Response(status_code=status.HTTP_405_METHOD_NOT_ALLOWED)
+        else:
+            response = self.response(request, scope["path"][len(scope.get("root_path", "")):].lstrip("/"))
+        await response(scope, receive, send)
+
+
+class Templates:
+    """Páginas HTML carregadas na inicialização, com links para os arquivos com hash."""
+
+    def __init__(self, directory: Path, static: Optional[StaticAssets] = None):
+        self.pages: Dict[str, Asset] = {}
+        if not directory.exists():
+            return
+        for file in sorted(directory.glob("*.html")):
+            html = file.read_text(encoding="utf-8")
+            if static is not None:
+                html = STATIC_REF.sub(lambda m: self._rewrite(m, static), html)
+            self.pages[file.name] = Asset.build(html.encode("utf-8"), "text/html; charset=utf-8")
+
+    @staticmethod
+    def _rewrite(match: re.Match, static: StaticAssets) -> str:
+        url = static.url(match.group("path"))
+        return match.group("attr") + url if url else match.group(0)
+
+    def response(self, request: Request, name: str) -> Response:
+        page = self.pages.get(name)
+        if page is None:
+            return Response(
+                content="<h1>404 - Página não encontrada</h1>",
+                status_code=status.HTTP_404_NOT_FOUND,
+                media_type="text/html; charset=utf-8",
+            )
+        return page.response(request, REVALIDATE)
@@ -0,0 +1,59 @@
+"""
+Exportação do histórico em CSV ou NDJSON, em streaming.
+
+As linhas são lidas do banco em lotes (ver db.session.stream_rows) e
+serializadas lote a lote, então a memória usada não depende do tamanho
+do histórico. Cada exportação abre a própria sessão, que fica aberta
+enquanto a resposta é enviada.
+"""
+import csv
+import io
+import json
+from datetime import date
+from decimal import Decimal
+from typing import AsyncIterator
+
+from fastapi.responses import StreamingResponse
+
+from app.api.deps import open_db
+from app.db.session import stream_rows
+
+MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def _plain(value):
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+async def _serialize(stmt, fmt: str) -> AsyncIterator[bytes]:
+    if fmt == "csv":
+        buffer = io.StringIO()
+        csv.writer(buffer).writerow(stmt.selected_columns.keys())
+        yield buffer.getvalue().encode("utf-8")
+
+    async with open_db(read_only=True) as db:
+        async for rows in stream_rows(db, stmt):
+            buffer = io.StringIO()
+            if fmt == "csv":
+                csv.writer(buffer).writerows([[_plain(v) for v in row] for row in rows])
+            else:
+                for row in rows:
+                    buffer.write(json.dumps({k: _plain(v) for k, v in row._mapping.items()}, ensure_ascii=False))
+                    buffer.write("\n")
+            yield buffer.getvalue().encode("utf-8")
+
+
+def export_response(stmt, fmt: str, filename: str) -> StreamingResponse:
+    """Resposta em streaming com o resultado de ``stmt`` no formato pedido."""
+    return StreamingResponse(
+        _serialize(stmt, fmt),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{fmt}"'},
+    )
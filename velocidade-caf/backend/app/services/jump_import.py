@@ -0,0 +1,132 @@
+"""
+Importação em lote de saltos a partir de CSV ou NDJSON.
+
+O corpo da requisição é lido em streaming, linha a linha, e validado
+contra JumpCreate. As linhas válidas são gravadas em lotes de
+IMPORT_CHUNK_SIZE com INSERT ... ON CONFLICT multi-linha (ver
+crud.jump.upsert_jumps); as inválidas entram no relatório de erros.
+
+CSV: a primeira linha é o cabeçalho, com as colunas de JumpCreate
+(``date,jump1,jump2,jump3,observacoes``). Campos não podem conter
+quebras de linha. NDJSON: um objeto JSON por linha, com as mesmas chaves.
+"""
+import codecs
+import csv
+import json
+from typing import AsyncIterator, Dict, List, Optional, Tuple, Union
+
+from pydantic import ValidationError
+
+from app.config import settings
+from app.crud.aio import jump as crud_jump
+from app.db.session import DBSession
+from app.schemas import JumpCreate, JumpImportResult
+
+
+def detect_format(content_type: Optional[str]) -> str:
+    """Deduz o formato pelo Content-Type (padrão: CSV)."""
+    return "ndjson" if content_type and "json" in content_type else "csv"
+
+
+async def _iter_lines(stream: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Decodifica o corpo em UTF-8 (com ou sem BOM) e o divide em linhas."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for chunk in stream:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.rstrip("\r")
+
+
+async def _iter_records(stream: AsyncIterator[bytes], fmt: str) -> AsyncIterator[Tuple[int, Union[dict, str]]]:
+    """
+    Produz ``(número da linha, registro)`` para cada linha não vazia. Se a
+    linha não puder ser lida, o registro é a mensagem de erro.
+    """
+    header: Optional[List[str]] = None
+    line_no = 0
+    async for line in _iter_lines(stream):
+        line_no += 1
+        if not line.strip():
+            continue
+
+        if fmt == "ndjson":
+            try:
+                record = json.loads(line)
+            except ValueError:
+                yield line_no, "JSON inválido"
+                continue
+            yield line_no, record if isinstance(record, dict) else "Linha deve ser um objeto JSON"
+            continue
+
+        values = next(csv.reader([line]))
+        if header is None:
+            header = [value.strip() for value in values]
+            continue
+        if len(values) != len(header):
+            yield line_no, f"Esperadas {len(header)} colunas, encontradas {len(values)}"
+            continue
+        yield line_no, {key: (value.strip() or None) for key, value in zip(header, values)}
+
+
+def _validate(record: Union[dict, str], athlete_id: str) -> Union[dict, List[str]]:
+    """Valida o registro; retorna a linha para o INSERT ou a lista de erros."""
+    if isinstance(record, str):
+        return [record]
+    try:
+        jump_in = JumpCreate.model_validate({**record, "athlete_id": athlete_id})
+    except ValidationError as e:
+        return [
+            f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" if error["loc"] else error["msg"]
+            for error in e.errors()
+        ]
+    return jump_in.model_dump()
+
+
+async def import_jumps(
+    db: DBSession,
+    athlete_id: str,
+    stream: AsyncIterator[bytes],
+    fmt: str,
+    update_existing: bool = True,
+) -> JumpImportResult:
+    """
+    Importa os saltos do ``stream`` para o atleta (ID do usuário).
+
+    Cada lote é gravado e commitado separadamente, junto com o resumo do
+    atleta: se a importação for interrompida, os lotes já gravados ficam
+    refletidos no resumo e no ETag. Dentro de um lote, linhas com a
+    mesma data ficam com a última ocorrência.
+    """
+    total = written = failed = 0
+    errors = []
+    chunk: Dict[object, dict] = {}
+
+    async for line_no, record in _iter_records(stream, fmt):
+        total += 1
+        row = _validate(record, athlete_id)
+        if isinstance(row, list):
+            failed += 1
+            if len(errors) < settings.IMPORT_MAX_ERRORS:
+                errors.append({"linha": line_no, "erros": row})
+            continue
+
+        chunk[row["date"]] = row
+        if len(chunk) >= settings.IMPORT_CHUNK_SIZE:
+            written += await crud_jump.upsert_jumps(db, list(chunk.values()), update_existing)
+            chunk = {}
+
+    if chunk:
+        written += await crud_jump.upsert_jumps(db, list(chunk.values()), update_existing)
+
+    return JumpImportResult(
+        total_linhas=total,
+        gravadas=written,
+        com_erro=failed,
+        erros=errors,
+        erros_truncados=failed > len(errors),
+    )
@@ -0,0 +1,78 @@
+"""
+Hash e verificação de senhas (bcrypt) fora do event loop e do threadpool.
+
+As operações rodam em um pool de processos dedicado e limitado, para que
+um pico de logins não ocupe os workers que atendem as demais rotas.
+"""
+import asyncio
+import multiprocessing
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+import bcrypt
+from fastapi.concurrency import run_in_threadpool
+
+from app.config import settings
+
+_BCRYPT_COST = re.compile(r"^\$2[abxy]?\$(\d{2})\$")
+
+_executor: Optional[ProcessPoolExecutor] = None
+_pending: Optional[asyncio.Semaphore] = None
+
+
+def hash_password_sync(password: str, rounds: Optional[int] = None) -> str:
+    """Gera hash da senha com o custo configurado."""
+    salt = bcrypt.gensalt(rounds=rounds or settings.BCRYPT_ROUNDS)
+    return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+
+
+def verify_password_sync(plain_password: str, hashed_password: str) -> bool:
+    """Verifica senha."""
+    return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
+
+
+def needs_rehash(hashed_password: str) -> bool:
+    """Indica se o hash foi gerado com custo diferente de BCRYPT_ROUNDS."""
+    match = _BCRYPT_COST.match(hashed_password or "")
+    return match is not None and int(match.group(1)) != settings.BCRYPT_ROUNDS
+
+
+def _get_executor() -> Optional[ProcessPoolExecutor]:
+    global _executor
+    if _executor is None and settings.PASSWORD_HASH_WORKERS > 0:
+        # spawn: não herda threads/conexões do processo do servidor
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.PASSWORD_HASH_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _executor
+
+
+async def _run(fn, *args):
+    global _pending
+    if _pending is None:
+        _pending = asyncio.Semaphore(settings.PASSWORD_HASH_MAX_PENDING)
+    async with _pending:
+        executor = _get_executor()
+        if executor is None:
+            return await run_in_threadpool(fn, *args)
+        return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+
+
+async def hash_password(password: str) -> str:
+    """Gera hash da senha no pool de processos."""
+    return await _run(hash_password_sync, password, settings.BCRYPT_ROUNDS)
+
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verifica a senha no pool de processos."""
+    return await _run(verify_password_sync, plain_password, hashed_password)
+
+
+def shutdown() -> None:
+    """Encerra o pool de processos (chamado no shutdown da aplicação)."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
@@ -0,0 +1,132 @@
+"""
+Sincronização offline do PWA (/sync).
+
+O cliente envia as mutações registradas offline (criar, atualizar ou
+remover saltos e marcas), cada uma com uma chave de idempotência, e o
+token da última sincronização. As mutações são validadas contra os
+schemas de criação/atualização e aplicadas por app.crud.sync em uma
+única transação, que também lê o delta do servidor desde o token.
+
+Os feeds de alterações (GET .../changes) usam o mesmo token sem enviar
+mutações: o painel só recebe o que mudou desde a última consulta.
+"""
+from typing import Optional
+
+from pydantic import ValidationError
+
+from app.core.sync_token import decode_sync_token, encode_sync_token
+from app.crud.aio import changes as crud_changes, sync as crud_sync
+from app.db.session import DBSession
+from app.schemas import (
+    JumpChanges,
+    JumpCreate,
+    JumpUpdate,
+    MarkChanges,
+    MarkCreate,
+    MarkUpdate,
+    RosterChanges,
+    SyncAthlete,
+    SyncJump,
+    SyncMark,
+    SyncMutation,
+    SyncRequest,
+    SyncResponse,
+)
+
+_SCHEMAS = {
+    ("salto", "criar"): JumpCreate,
+    ("salto", "atualizar"): JumpUpdate,
+    ("marca", "criar"): MarkCreate,
+    ("marca", "atualizar"): MarkUpdate,
+}
+
+
+def _format_errors(e: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" if error["loc"] else error["msg"]
+        for error in e.errors()
+    )
+
+
+def _prepare(mutation: SyncMutation, user_id: str, athlete_id: str) -> dict:
+    """
+    Mutação no formato de app.crud.sync.apply_mutations, com os ``valores``
+    validados ou o ``erro`` de validação.
+    """
+    prepared = {
+        "chave": mutation.chave,
+        "operacao": mutation.operacao,
+        "tipo": mutation.tipo,
+        "id": mutation.id,
+        "ref": mutation.ref,
+        "atualizado_em": mutation.atualizado_em,
+        "valores": {},
+        "erro": None,
+    }
+    schema = _SCHEMAS.get((mutation.tipo, mutation.operacao))
+    if schema is None:
+        return prepared
+
+    try:
+        if mutation.operacao == "criar":
+            # Saltos usam o USER_ID; marcas, o ID do perfil
+            owner_id = user_id if mutation.tipo == "salto" else athlete_id
+            prepared["valores"] = schema.model_validate({**mutation.dados, "athlete_id": owner_id}).model_dump()
+        else:
+            prepared["valores"] = schema.model_validate(mutation.dados).model_dump(exclude_unset=True)
+    except ValidationError as e:
+        prepared["erro"] = _format_errors(e)
+    return prepared
+
+
+async def sync(db: DBSession, user_id: str, athlete_id: str, sync_in: SyncRequest) -> SyncResponse:
+    """
+    Aplica o lote do atleta (USER_ID e ID do perfil) e devolve os
+    resultados, as alterações desde ``sync_in.token`` e o novo token.
+    """
+    since = decode_sync_token(sync_in.token)
+    mutations = [_prepare(mutation, user_id, athlete_id) for mutation in sync_in.mutacoes]
+    delta = await crud_sync.apply_mutations(db, user_id, athlete_id, mutations, since)
+
+    return SyncResponse(
+        token=encode_sync_token(delta["read_at"]),
+        resultados=delta["resultados"],
+        saltos=[SyncJump.model_validate(jump) for jump in delta["saltos"]],
+        marcas=[SyncMark.model_validate(mark) for mark in delta["marcas"]],
+        saltos_removidos=delta["saltos_removidos"],
+        marcas_removidas=delta["marcas_removidas"],
+    )
+
+
+async def jump_changes(db: DBSession, user_id: str, token: Optional[str]) -> JumpChanges:
+    """Saltos do atleta (USER_ID) alterados ou removidos desde ``token``."""
+    delta = await crud_changes.get_athlete_changes(db, decode_sync_token(token), user_id=user_id)
+    return JumpChanges(
+        token=encode_sync_token(delta["read_at"]),
+        saltos=[SyncJump.model_validate(jump) for jump in delta["saltos"]],
+        saltos_removidos=delta["saltos_removidos"],
+    )
+
+
+async def mark_changes(db: DBSession, athlete_id: str, token: Optional[str]) -> MarkChanges:
+    """Marcas do atleta (ID do perfil) alteradas ou removidas desde ``token``."""
+    delta = await crud_changes.get_athlete_changes(db, decode_sync_token(token), athlete_id=athlete_id)
+    return MarkChanges(
+        token=encode_sync_token(delta["read_at"]),
+        marcas=[SyncMark.model_validate(mark) for mark in delta["marcas"]],
+        marcas_removidas=delta["marcas_removidas"],
+    )
+
+
+async def roster_changes(db: DBSession, coach_id: str, token: Optional[str]) -> RosterChanges:
+    """Alterações no elenco do treinador (ID do perfil) desde ``token``."""
+    delta = await crud_changes.get_roster_changes(db, coach_id, decode_sync_token(token))
+    return RosterChanges(
+        token=encode_sync_token(delta["read_at"]),
+        atletas=[SyncAthlete.model_validate(athlete) for athlete in delta["atletas"]],
+        atletas_removidos=delta["atletas_removidos"],
+        saltos=[SyncJump.model_validate(jump) for jump in delta["saltos"]],
+        saltos_removidos=delta["saltos_removidos"],
+        marcas=[SyncMark.model_validate(mark) for mark in delta["marcas"]],
+        marcas_removidas=delta["marcas_removidas"],
+    )
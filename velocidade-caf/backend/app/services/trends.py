@@ -0,0 +1,110 @@
+"""
+Tendências dos saltos calculadas no servidor com NumPy.
+
+A série do atleta (um registro por dia) é carregada só com as colunas
+dos saltos e convertida em arrays; médias móveis, melhor salto do dia,
+consistência e inclinações são operações vetoriais sobre esses arrays,
+então o custo por atleta é de poucos milissegundos mesmo com anos de
+histórico diário.
+
+- Médias móveis de 7 e 28 dias corridos (não registros): média das
+  médias diárias dos registros na janela que termina em cada data.
+- Consistência: mesma fórmula de Jump.consistency.
+- Tendência: inclinação da regressão linear no período, por semana.
+"""
+from datetime import date, timedelta
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.crud.aio import jump as crud_jump
+from app.crud.summary import ROLLING_WINDOWS
+from app.db.session import DBSession
+
+
+def consistency(jumps: np.ndarray, averages: np.ndarray) -> np.ndarray:
+    """Jump.consistency vetorizado: 100 - coeficiente de variação (%), entre 0 e 100."""
+    std_dev = np.sqrt(((jumps - averages[:, None]) ** 2).sum(axis=1) / 3)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cv = std_dev / averages * 100
+    return np.where(averages == 0, 0.0, np.round(np.clip(100 - cv, 0, 100), 2))
+
+
+def rolling_means(days: np.ndarray, values: np.ndarray, window: int) -> np.ndarray:
+    """Média dos valores nos ``window`` dias corridos que terminam em cada data."""
+    totals = np.concatenate(([0.0], np.cumsum(values)))
+    first = np.searchsorted(days, days - (window - 1), side="left")
+    last = np.arange(1, len(days) + 1)
+    return (totals[last] - totals[first]) / (last - first)
+
+
+def weekly_slope(days: np.ndarray, values: np.ndarray) -> Optional[float]:
+    """Inclinação (por semana) da reta de mínimos quadrados; None com menos de 2 datas."""
+    if len(days) < 2:
+        return None
+    x = days - days.mean()
+    # + 0.0 evita "-0.0" na resposta
+    return round(float((x * (values - values.mean())).sum() / (x * x).sum() * 7), 3) + 0.0
+
+
+def compute_trends(
+    rows: Sequence[Tuple[date, float, float, float]],
+    start_date: Optional[date] = None
+) -> dict:
+    """
+    Calcula as tendências a partir da série ``(date, jump1, jump2, jump3)``
+    em ordem cronológica.
+
+    A série pode começar antes de ``start_date`` para que as médias móveis
+    dos primeiros dias do período tenham a janela completa; só as datas a
+    partir de ``start_date`` entram no resultado.
+    """
+    n = len(rows)
+    days = np.fromiter((row[0].toordinal() for row in rows), dtype=np.int64, count=n)
+    jumps = np.array([row[1:] for row in rows], dtype=np.float64).reshape(n, 3)
+
+    best = jumps.max(axis=1)
+    averages = np.round(jumps.sum(axis=1) / 3, 2)
+    rolling = {window: np.round(rolling_means(days, averages, window), 2) for window in ROLLING_WINDOWS}
+
+    first = int(np.searchsorted(days, start_date.toordinal())) if start_date else 0
+    days, best, averages = days[first:], best[first:], averages[first:]
+    scores = consistency(jumps[first:], averages)
+    rolling = {window: values[first:] for window, values in rolling.items()}
+
+    dates = [row[0] for row in rows[first:]]
+    short, long = (rolling[window].tolist() for window in ROLLING_WINDOWS)
+    serie = [
+        {"date": d, "melhor_salto": b, "media": a, "consistencia": c, "media_7": m7, "media_28": m28}
+        for d, b, a, c, m7, m28 in zip(dates, best.tolist(), averages.tolist(), scores.tolist(), short, long)
+    ]
+
+    return {
+        "inicio": dates[0] if dates else None,
+        "fim": dates[-1] if dates else None,
+        "total_registros": len(dates),
+        "resumo": {
+            "melhor_salto": float(best.max()) if dates else None,
+            "media_geral": round(float(averages.mean()), 2) if dates else None,
+            "consistencia_media": round(float(scores.mean()), 2) if dates else None,
+        },
+        "tendencia": {
+            "melhor_salto": weekly_slope(days, best),
+            "media": weekly_slope(days, averages),
+            "consistencia": weekly_slope(days, scores),
+        },
+        "serie": serie,
+    }
+
+
+async def get_jump_trends(
+    db: DBSession,
+    athlete_id: str,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None
+) -> dict:
+    """Tendências dos saltos de um atleta (ID do usuário) no período."""
+    # Janela anterior ao início para completar as médias móveis
+    lookback = start_date - timedelta(days=max(ROLLING_WINDOWS) - 1) if start_date else None
+    rows = await crud_jump.get_jump_series(db, athlete_id, lookback, end_date)
+    return compute_trends(rows, start_date)
@@ -0,0 +1,7 @@
+"""
+Benchmarks de performance da API.
+
+Execute a partir da pasta backend, ex.: ``python -m benchmarks.bench_current_user``.
+Por padrão usam um SQLite temporário; defina BENCH_DATABASE_URL para
+apontar para um CockroachDB/Postgres de testes.
+"""
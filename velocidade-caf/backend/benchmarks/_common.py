@@ -0,0 +1,142 @@
+"""
+Utilitários compartilhados pelos benchmarks.
+
+Este módulo precisa ser importado antes de qualquer módulo de ``app``,
+pois define a DATABASE_URL usada pela engine.
+"""
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Optional
+
+_BENCH_DB = os.path.join(tempfile.gettempdir(), "velocidade_caf_bench.db")
+os.environ["DATABASE_URL"] = os.getenv("BENCH_DATABASE_URL", f"sqlite:///{_BENCH_DB}")
+
+from app.db.session import Base, SessionLocal, engine  # noqa: E402
+import app.models  # noqa: E402,F401
+from app.config import settings  # noqa: E402
+from app.core.security import create_access_token  # noqa: E402
+from app.models import User, AthleteProfile, Jump, Mark  # noqa: E402
+
+EVENTOS = ["60m", "100m", "150m", "200m", "300m", "400m", "800m", "1500m", "3000m", "5000m", "110m", "400mH"]
+
+
+def reset_database() -> None:
+    """Recria todas as tabelas do zero."""
+    if engine.dialect.name == "sqlite":
+        # SQLite não possui gen_random_uuid(); o default do app gera os IDs
+        for table in Base.metadata.tables.values():
+            for column in table.columns:
+                default = getattr(column.server_default, "arg", None)
+                if default is not None and "gen_random_uuid" in str(default):
+                    column.server_default = None
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+
+def seed_athlete(n_jumps: int = 0, n_marks: int = 0, coach_id: str = None) -> Dict[str, str]:
+    """
+    Cria um atleta com ``n_jumps`` saltos diários e ``n_marks`` marcas
+    distribuídas entre os eventos de EVENTOS.
+
+    Returns:
+        IDs do usuário e do perfil, além de um token JWT válido
+    """
+    db = SessionLocal()
+    try:
+        user = User(id=str(uuid.uuid4()), email=f"{uuid.uuid4().hex}@bench.com", role="atleta", password_hash="x")
+        profile = AthleteProfile(id=str(uuid.uuid4()), user_id=user.id, coach_id=coach_id, nome="Atleta Bench")
+        db.add_all([user, profile])
+        db.flush()
+
+        start = date(2000, 1, 1)
+        db.bulk_insert_mappings(Jump, [
+            {
+                "id": str(uuid.uuid4()),
+                "athlete_id": user.id,
+                "date": start + timedelta(days=i),
+                "jump1": 30 + (i % 17),
+                "jump2": 31 + (i % 13),
+                "jump3": 29 + (i % 11),
+            }
+            for i in range(n_jumps)
+        ])
+        db.bulk_insert_mappings(Mark, [
+            {
+                "id": str(uuid.uuid4()),
+                "athlete_id": user.id,
+                "evento": EVENTOS[i % len(EVENTOS)],
+                "resultado": 10 + (i * 7919 % 1000) / 10,
+                "vento": ((i % 9) - 4) / 2,
+                "data": start + timedelta(days=i),
+                "tipo": "competicao" if i % 3 else "teste",
+            }
+            for i in range(n_marks)
+        ])
+        db.commit()
+        token = create_access_token(data={"sub": user.id, "email": user.email, "role": user.role})
+        return {"user_id": user.id, "profile_id": profile.id, "token": token}
+    finally:
+        db.close()
+
+
+def start_server(port: int, env: Optional[Dict[str, str]] = None, backlog: int = 2048) -> subprocess.Popen:
+    """
+    Sobe o app em um processo uvicorn separado, apontando para o mesmo
+    banco dos benchmarks, e aguarda o /health responder.
+    """
+    import httpx
+
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port),
+         "--log-level", "warning", "--timeout-keep-alive", "120", "--backlog", str(backlog)],
+        env={
+            **os.environ,
+            "DATABASE_URL": settings.DATABASE_URL,
+            "SECRET_KEY": settings.SECRET_KEY,
+            **(env or {}),
+        },
+    )
+    for _ in range(100):
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health").status_code == 200:
+                return process
+        except httpx.TransportError:
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError("Servidor não iniciou")
+
+
+def measure(fn: Callable[[], object], repeat: int = 50, warmup: int = 3) -> Dict[str, float]:
+    """Executa ``fn`` várias vezes e retorna latências em milissegundos."""
+    for _ in range(warmup):
+        fn()
+    samples: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "p50": statistics.median(samples),
+        "p99": samples[min(len(samples) - 1, int(len(samples) * 0.99))],
+        "mean": statistics.fmean(samples),
+    }
+
+
+def print_table(title: str, header: List[str], rows: List[List[object]]) -> None:
+    """Imprime uma tabela simples alinhada."""
+    print(f"\n{title}")
+    widths = [max(len(str(h)), *(len(_fmt(r[i])) for r in rows)) for i, h in enumerate(header)]
+    print("  ".join(str(h).rjust(w) for h, w in zip(header, widths)))
+    for row in rows:
+        print("  ".join(_fmt(v).rjust(w) for v, w in zip(row, widths)))
+
+
+def _fmt(value: object) -> str:
+    return f"{value:.2f}" if isinstance(value, float) else str(value)
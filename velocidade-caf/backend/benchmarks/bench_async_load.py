@@ -0,0 +1,77 @@
+"""
+Teste de carga: modo síncrono (threadpool) vs assíncrono (DB_ASYNC).
+
+Sobe um servidor uvicorn para cada modo e dispara CLIENTS clientes
+concorrentes contra ``GET /api/v1/jumps/me``. Com SQLite o modo
+assíncrono requer o pacote aiosqlite; com CockroachDB, asyncpg.
+"""
+import asyncio
+import os
+import statistics
+import time
+
+from benchmarks._common import print_table, reset_database, seed_athlete, start_server
+
+import httpx
+
+CLIENTS = int(os.getenv("BENCH_CLIENTS", "500"))
+REQUESTS_PER_CLIENT = int(os.getenv("BENCH_REQUESTS_PER_CLIENT", "4"))
+PORT = 8765
+
+
+async def run_load(token: str) -> dict:
+    headers = {"Authorization": f"Bearer {token}"}
+    latencies = []
+    errors = 0
+    limits = httpx.Limits(max_connections=CLIENTS, max_keepalive_connections=CLIENTS)
+
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{PORT}", limits=limits, timeout=120) as client:
+        async def worker():
+            nonlocal errors
+            for _ in range(REQUESTS_PER_CLIENT):
+                start = time.perf_counter()
+                try:
+                    response = await client.get("/api/v1/jumps/me?limit=20", headers=headers)
+                except httpx.TransportError:
+                    errors += 1
+                    continue
+                latencies.append((time.perf_counter() - start) * 1000)
+                if response.status_code != 200:
+                    errors += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(CLIENTS)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "rps": len(latencies) / elapsed,
+        "elapsed": elapsed,
+        "p50": statistics.median(latencies),
+        "p99": latencies[int(len(latencies) * 0.99) - 1],
+        "errors": errors,
+    }
+
+
+def main() -> None:
+    reset_database()
+    token = seed_athlete(n_jumps=200, n_marks=50)["token"]
+    rows = []
+    for db_async in (False, True):
+        server = start_server(PORT, {"DB_ASYNC": "true" if db_async else "false"}, backlog=CLIENTS * 2)
+        try:
+            result = asyncio.run(run_load(token))
+        finally:
+            server.terminate()
+            server.wait()
+        rows.append(["async" if db_async else "sync", result["rps"], result["p50"], result["p99"], result["errors"]])
+
+    print_table(
+        f"GET /jumps/me com {CLIENTS} clientes concorrentes x {REQUESTS_PER_CLIENT} requisições",
+        ["modo", "req/s", "p50 (ms)", "p99 (ms)", "erros"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
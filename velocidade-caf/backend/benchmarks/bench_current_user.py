@@ -0,0 +1,57 @@
+"""
+Latência de ``GET /users/me`` em função do tamanho do histórico do atleta.
+
+Compara o carregamento enxuto do usuário (padrão) com o carregamento
+antecipado de ``User.jumps``/``User.marks`` (comportamento anterior).
+"""
+from benchmarks._common import measure, print_table, reset_database, seed_athlete
+
+from fastapi import Depends
+from fastapi.testclient import TestClient
+
+from app.api.deps import get_current_user, get_db
+from app.core.security import oauth2_scheme, verify_token
+from app.crud.aio import user as crud_user
+from app.db.session import DBSession
+from app.main import app
+from app.models import User
+
+HISTORY_SIZES = [0, 100, 1_000, 5_000]
+
+
+async def eager_user(db: DBSession = Depends(get_db), token: str = Depends(oauth2_scheme)) -> User:
+    """Usuário com o histórico inteiro carregado (selectinload), como antes."""
+    return await crud_user.get_user_by_id(db, verify_token(token)["sub"], eager=(User.jumps, User.marks))
+
+
+def main() -> None:
+    reset_database()
+    client = TestClient(app)
+    rows = []
+
+    for size in HISTORY_SIZES:
+        athlete = seed_athlete(n_jumps=size, n_marks=size)
+        headers = {"Authorization": f"Bearer {athlete['token']}"}
+
+        def call():
+            response = client.get("/api/v1/users/me", headers=headers)
+            assert response.status_code == 200, response.text
+
+        slim = measure(call)
+        app.dependency_overrides[get_current_user] = eager_user
+        try:
+            eager = measure(call)
+        finally:
+            app.dependency_overrides.pop(get_current_user, None)
+
+        rows.append([size, slim["p50"], slim["p99"], eager["p50"], eager["p99"]])
+
+    print_table(
+        "GET /users/me — latência (ms) por tamanho de histórico (saltos + marcas cada)",
+        ["historico", "enxuto p50", "enxuto p99", "eager p50", "eager p99"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Latência das tendências de saltos (/jumps/me/trends).
+
+Mede a consulta da série, o cálculo vetorizado (app.services.trends) e
+a rota completa para históricos diários de 1 a 10 anos.
+"""
+import asyncio
+from datetime import date
+
+from benchmarks._common import measure, print_table, reset_database, seed_athlete
+
+from fastapi.testclient import TestClient
+
+from app.crud import jump as crud_jump
+from app.db.session import SessionLocal
+from app.main import app
+from app.services import trends
+
+YEARS = [1, 5, 10]
+
+
+def main() -> None:
+    reset_database()
+    client = TestClient(app)
+    db = SessionLocal()
+    rows = []
+    try:
+        for years in YEARS:
+            athlete = seed_athlete(n_jumps=365 * years)
+            headers = {"Authorization": f"Bearer {athlete['token']}"}
+            series = crud_jump.get_jump_series(db, athlete["user_id"])
+            last_year = date(2000 + years - 1, 1, 1)
+
+            query = measure(lambda: crud_jump.get_jump_series(db, athlete["user_id"]))
+            compute = measure(lambda: trends.compute_trends(series))
+            service = measure(lambda: asyncio.run(trends.get_jump_trends(db, athlete["user_id"], last_year)))
+            route = measure(lambda: client.get("/api/v1/jumps/me/trends", headers=headers))
+            rows.append([years, len(series), query["p50"], compute["p50"], service["p50"], route["p50"]])
+    finally:
+        db.close()
+
+    print_table(
+        "Tendências de saltos — latência p50 (ms)",
+        ["anos", "registros", "consulta", "calculo", "ultimo ano", "rota completa"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
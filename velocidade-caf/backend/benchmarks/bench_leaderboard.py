@@ -0,0 +1,120 @@
+"""
+Ranking de uma prova entre os atletas de um treinador (/marks/leaderboard).
+
+Compara o caminho antigo (uma chamada a /marks/athlete/{id} por atleta
+e ordenação no cliente) com a rota de ranking, para elencos de 50 a
+1000 atletas com 20 marcas de 100 m cada, e mede a rota com os filtros
+de temporada, tipo, categoria e vento legal.
+"""
+import uuid
+from datetime import date, timedelta
+
+from benchmarks._common import measure, print_table, reset_database
+
+from fastapi.testclient import TestClient
+
+from app.core.security import create_access_token
+from app.crud import event as crud_event
+from app.db.session import SessionLocal
+from app.main import app
+from app.models import AthleteProfile, CoachProfile, Mark, User
+from app.models.mark import WIND_LIMIT
+
+ROSTERS = [50, 200, 1000]
+MARKS_PER_ATHLETE = 20
+
+
+def seed_roster(n_athletes: int) -> dict:
+    """Treinador com ``n_athletes`` atletas, cada um com MARKS_PER_ATHLETE marcas de 100 m."""
+    db = SessionLocal()
+    try:
+        coach = User(id=str(uuid.uuid4()), email=f"{uuid.uuid4().hex}@bench.com", role="treinador", password_hash="x")
+        profile = CoachProfile(id=str(uuid.uuid4()), user_id=coach.id, nome="Treinador Bench")
+        db.add_all([coach, profile])
+        db.flush()
+
+        users = [
+            {"id": str(uuid.uuid4()), "email": f"{uuid.uuid4().hex}@bench.com", "role": "atleta", "password_hash": "x"}
+            for _ in range(n_athletes)
+        ]
+        athletes = [
+            {
+                "id": str(uuid.uuid4()),
+                "user_id": user["id"],
+                "coach_id": profile.id,
+                "nome": f"Atleta {i}",
+                "categoria": ("sub18", "sub20", "adulto")[i % 3],
+            }
+            for i, user in enumerate(users)
+        ]
+        db.bulk_insert_mappings(User, users)
+        db.bulk_insert_mappings(AthleteProfile, athletes)
+
+        start = date(2020, 1, 1)
+        marks = []
+        for a, athlete in enumerate(athletes):
+            for i in range(MARKS_PER_ATHLETE):
+                vento = ((a + i) % 11 - 4) / 2
+                marks.append({
+                    "id": str(uuid.uuid4()),
+                    "athlete_id": athlete["id"],
+                    "evento": "100m",
+                    "event_id": "100m",
+                    "resultado": 10.5 + ((a * 31 + i * 7919) % 200) / 100,
+                    "vento": vento,
+                    # bulk_insert_mappings não passa por Mark._sync_vento_legal
+                    "vento_legal": vento <= WIND_LIMIT,
+                    "data": start + timedelta(days=(a + i * 53) % 1800),
+                    "tipo": "competicao" if i % 3 else "teste",
+                })
+        db.bulk_insert_mappings(Mark, marks)
+        db.commit()
+
+        token = create_access_token(data={"sub": coach.id, "email": coach.email, "role": coach.role})
+        return {"token": token, "athlete_ids": [athlete["id"] for athlete in athletes]}
+    finally:
+        db.close()
+
+
+def main() -> None:
+    reset_database()
+    db = SessionLocal()
+    try:
+        crud_event.seed_events(db)
+        db.commit()
+    finally:
+        db.close()
+
+    client = TestClient(app)
+    rows = []
+    for n_athletes in ROSTERS:
+        roster = seed_roster(n_athletes)
+        headers = {"Authorization": f"Bearer {roster['token']}"}
+
+        def per_athlete():
+            best = []
+            for athlete_id in roster["athlete_ids"]:
+                marks = client.get(f"/api/v1/marks/athlete/{athlete_id}?limit=1000", headers=headers).json()
+                best.append(min(m["resultado"] for m in marks if m["evento"] == "100m"))
+            return sorted(best)[:10]
+
+        def leaderboard(query: str = ""):
+            response = client.get(f"/api/v1/marks/leaderboard?evento=100m{query}", headers=headers)
+            assert response.status_code == 200, response.text
+            return [entry["resultado"] for entry in response.json()["resultados"]]
+
+        assert leaderboard() == per_athlete()
+        legacy = measure(per_athlete, repeat=3, warmup=1)
+        route = measure(leaderboard)
+        filtered = measure(lambda: leaderboard("&temporada=2023&tipo=competicao&categoria=sub20&vento_legal=true"))
+        rows.append([n_athletes, n_athletes * MARKS_PER_ATHLETE, legacy["p50"], route["p50"], route["p99"], filtered["p50"]])
+
+    print_table(
+        "Ranking 100m — latência (ms)",
+        ["atletas", "marcas", "por atleta p50", "ranking p50", "ranking p99", "com filtros p50"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Custo de serialização das listagens grandes.
+
+Compara o caminho ORM + Pydantic (FAST_JSON_RESPONSES=False) com as
+linhas Core serializadas direto com orjson (FAST_JSON_RESPONSES=True)
+em /jumps/me, /marks/athlete/{id} e /athletes/, para respostas de 1k e
+10k itens. Mede tempo de CPU (time.process_time) e o pico de memória
+alocada por requisição (tracemalloc), conferindo que os dois modos
+retornam exatamente os mesmos bytes.
+"""
+import time
+import tracemalloc
+import uuid
+from typing import Callable, Dict
+
+from benchmarks._common import measure, print_table, reset_database, seed_athlete
+
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.core.security import create_access_token
+from app.db.session import SessionLocal
+from app.main import app
+from app.models import AthleteProfile, Mark, User
+
+ROW_COUNTS = [1_000, 10_000]
+REPEAT = 10
+
+
+def seed_coach_roster(n_athletes: int) -> str:
+    """Cria um treinador e ``n_athletes`` perfis de atleta; retorna o token do treinador."""
+    db = SessionLocal()
+    try:
+        coach = User(id=str(uuid.uuid4()), email=f"{uuid.uuid4().hex}@bench.com", role="treinador", password_hash="x")
+        db.add(coach)
+        users = [
+            {"id": str(uuid.uuid4()), "email": f"{uuid.uuid4().hex}@bench.com", "role": "atleta", "password_hash": "x"}
+            for _ in range(n_athletes)
+        ]
+        db.bulk_insert_mappings(User, users)
+        db.bulk_insert_mappings(AthleteProfile, [
+            {
+                "id": str(uuid.uuid4()),
+                "user_id": user["id"],
+                "nome": f"Atleta {i}",
+                "categoria": "sub20",
+                "peso_kg": 60 + i % 30,
+            }
+            for i, user in enumerate(users)
+        ])
+        db.commit()
+        return create_access_token(data={"sub": coach.id, "email": coach.email, "role": coach.role})
+    finally:
+        db.close()
+
+
+def seed_listings(n_rows: int) -> Dict[str, str]:
+    """Atleta com ``n_rows`` saltos e marcas (marcas ligadas ao ID do perfil, como na API)."""
+    athlete = seed_athlete(n_jumps=n_rows, n_marks=n_rows)
+    db = SessionLocal()
+    try:
+        db.query(Mark).filter(Mark.athlete_id == athlete["user_id"]).update(
+            {Mark.athlete_id: athlete["profile_id"]}, synchronize_session=False
+        )
+        db.commit()
+    finally:
+        db.close()
+    return athlete
+
+
+def peak_memory_kib(fn: Callable[[], object]) -> float:
+    """Pico de memória alocada durante uma chamada, em KiB."""
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def cpu_ms(fn: Callable[[], object], repeat: int = REPEAT) -> float:
+    """Tempo de CPU médio por chamada, em milissegundos."""
+    fn()
+    start = time.process_time()
+    for _ in range(repeat):
+        fn()
+    return (time.process_time() - start) * 1000 / repeat
+
+
+def main() -> None:
+    reset_database()
+    client = TestClient(app)
+    rows = []
+    for n_rows in ROW_COUNTS:
+        athlete = seed_listings(n_rows)
+        athlete_headers = {"Authorization": f"Bearer {athlete['token']}"}
+        coach_headers = {"Authorization": f"Bearer {seed_coach_roster(n_rows)}"}
+        endpoints = [
+            ("/jumps/me", athlete_headers),
+            (f"/marks/athlete/{athlete['profile_id']}", athlete_headers),
+            ("/athletes/", coach_headers),
+        ]
+        for path, headers in endpoints:
+            url = f"/api/v1{path}?limit={n_rows}"
+
+            def call():
+                response = client.get(url, headers=headers)
+                assert response.status_code == 200, response.text
+                return response.content
+
+            results = {}
+            for fast in (False, True):
+                settings.FAST_JSON_RESPONSES = fast
+                results[fast] = (call(), cpu_ms(call), peak_memory_kib(call), measure(call, repeat=REPEAT)["p50"])
+            assert results[True][0] == results[False][0], f"{path}: respostas divergentes"
+
+            legacy, fast = results[False], results[True]
+            rows.append([
+                path.split("/")[1], n_rows, len(fast[0]) // 1024,
+                legacy[1], fast[1], legacy[2], fast[2], legacy[3], fast[3],
+            ])
+
+    print_table(
+        "Listagens grandes — ORM + Pydantic vs. linhas Core + orjson",
+        ["rota", "itens", "KiB", "cpu ms", "cpu ms rapido", "pico KiB", "pico KiB rapido", "p50 ms", "p50 ms rapido"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Pico de logins: bcrypt no threadpool vs pool de processos dedicado.
+
+Sobe o servidor com PASSWORD_HASH_WORKERS=0 (hash no threadpool, como
+antes) e com PASSWORD_HASH_WORKERS>0, dispara LOGINS logins simultâneos
+e, ao mesmo tempo, requisições a ``GET /api/v1/jumps/me`` para medir o
+impacto nas demais rotas.
+"""
+import asyncio
+import os
+import statistics
+import time
+
+from benchmarks._common import print_table, reset_database, seed_athlete, start_server
+
+import httpx
+
+LOGINS = int(os.getenv("BENCH_LOGINS", "200"))
+READERS = int(os.getenv("BENCH_READERS", "20"))
+WORKERS = os.getenv("BENCH_HASH_WORKERS", str(os.cpu_count() or 2))
+PORT = 8766
+PASSWORD = "senha-bench-123"
+
+
+def _summary(latencies: list) -> tuple:
+    latencies.sort()
+    return statistics.median(latencies), latencies[max(0, int(len(latencies) * 0.99) - 1)]
+
+
+async def run_storm(token: str, email: str) -> dict:
+    headers = {"Authorization": f"Bearer {token}"}
+    logins, reads = [], []
+    errors = 0
+    limits = httpx.Limits(max_connections=LOGINS + READERS)
+
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{PORT}", limits=limits, timeout=300) as client:
+        storm_done = asyncio.Event()
+
+        async def login():
+            nonlocal errors
+            start = time.perf_counter()
+            response = await client.post("/api/v1/users/login", json={"email": email, "password": PASSWORD})
+            logins.append((time.perf_counter() - start) * 1000)
+            errors += response.status_code != 200
+
+        async def reader():
+            nonlocal errors
+            while not storm_done.is_set():
+                start = time.perf_counter()
+                response = await client.get("/api/v1/jumps/me?limit=20", headers=headers)
+                reads.append((time.perf_counter() - start) * 1000)
+                errors += response.status_code != 200
+
+        async def storm():
+            await asyncio.gather(*(login() for _ in range(LOGINS)))
+            storm_done.set()
+
+        start = time.perf_counter()
+        await asyncio.gather(storm(), *(reader() for _ in range(READERS)))
+        elapsed = time.perf_counter() - start
+
+    return {"elapsed": elapsed, "login": _summary(logins), "read": _summary(reads), "errors": errors}
+
+
+def main() -> None:
+    reset_database()
+    with httpx.Client(base_url=f"http://127.0.0.1:{PORT}") as client:
+        server = start_server(PORT, {"PASSWORD_HASH_WORKERS": "0"})
+        try:
+            email = "login@bench.com"
+            client.post("/api/v1/users/register", json={"email": email, "password": PASSWORD, "role": "atleta"})
+        finally:
+            server.terminate()
+            server.wait()
+    token = seed_athlete(n_jumps=200)["token"]
+
+    rows = []
+    for workers in ("0", WORKERS):
+        server = start_server(PORT, {"PASSWORD_HASH_WORKERS": workers})
+        try:
+            result = asyncio.run(run_storm(token, email))
+        finally:
+            server.terminate()
+            server.wait()
+        rows.append([
+            "threadpool" if workers == "0" else f"processos ({workers})",
+            result["elapsed"], *result["login"], *result["read"], result["errors"],
+        ])
+
+    print_table(
+        f"{LOGINS} logins simultâneos + {READERS} leitores de /jumps/me",
+        ["bcrypt", "total (s)", "login p50", "login p99", "leitura p50", "leitura p99", "erros"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Regressão de performance de recordes pessoais e estatísticas de marcas.
+
+Compara a consulta única (melhor marca por evento) com a abordagem
+anterior de 1 + N consultas (uma por evento), conferindo que ambas
+retornam os mesmos recordes.
+"""
+from benchmarks._common import EVENTOS, measure, print_table, reset_database, seed_athlete
+
+from app.crud import mark as crud_mark
+from app.db.session import SessionLocal
+from app.models import Mark
+
+MARK_COUNTS = [100, 500, 2_000]
+
+
+def legacy_personal_records(db, athlete_id: str) -> list:
+    """Implementação anterior: carrega todas as marcas e consulta cada evento."""
+    marks = db.query(Mark).filter(Mark.athlete_id == athlete_id).all()
+    recordes = []
+    for evento in {m.evento for m in marks}:
+        melhor = db.query(Mark).filter(
+            Mark.athlete_id == athlete_id, Mark.evento == evento
+        ).order_by(Mark.resultado.asc()).first()
+        recordes.append({"evento": evento, "resultado": melhor.resultado})
+    return recordes
+
+
+def main() -> None:
+    reset_database()
+    db = SessionLocal()
+    rows = []
+    try:
+        for n_marks in MARK_COUNTS:
+            athlete_id = seed_athlete(n_marks=n_marks)["user_id"]
+
+            expected = sorted((r["evento"], r["resultado"]) for r in legacy_personal_records(db, athlete_id))
+            got = sorted((r["evento"], r["resultado"]) for r in crud_mark.get_personal_records(db, athlete_id))
+            assert got == expected, "recordes divergentes da implementação anterior"
+
+            legacy = measure(lambda: legacy_personal_records(db, athlete_id))
+            records = measure(lambda: crud_mark.get_personal_records(db, athlete_id))
+            stats = measure(lambda: crud_mark.get_mark_statistics(db, athlete_id))
+            rows.append([n_marks, len(EVENTOS), legacy["p50"], records["p50"], stats["p50"]])
+    finally:
+        db.close()
+
+    print_table(
+        "Recordes pessoais — latência p50 (ms)",
+        ["marcas", "eventos", "1+N consultas", "consulta unica", "estatisticas"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Caminho de escrita de saltos, marcas e perfil (INSERT/UPDATE ... RETURNING).
+
+Para cada gravação mede a latência da rota e conta as instruções SQL
+executadas, incluindo o reenvio de um salto no mesmo dia (upsert em uma
+única instrução) e as edições, que não buscam o registro antes.
+"""
+import itertools
+from datetime import date, timedelta
+
+from benchmarks._common import measure, print_table, reset_database, seed_athlete
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.db.session import engine
+from app.main import app
+
+
+def main() -> None:
+    reset_database()
+    client = TestClient(app)
+    athlete = seed_athlete(n_jumps=365)
+    headers = {"Authorization": f"Bearer {athlete['token']}"}
+    client.post("/api/v1/athletes/", json={"user_id": athlete["user_id"]}, headers=headers)
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    days = (date(2010, 1, 1) + timedelta(days=i) for i in itertools.count())
+    jump = {"jump1": 40.0, "jump2": 41.5, "jump3": 39.2}
+    mark = {"athlete_id": "-", "evento": "100m", "resultado": 11.2, "vento": 1.1, "data": "2024-05-01", "tipo": "competicao"}
+
+    first = client.post("/api/v1/jumps/", json={"date": "2009-12-31", **jump}, headers=headers).json()
+    mark_id = client.post("/api/v1/marks/", json=mark, headers=headers).json()["id"]
+
+    writes = {
+        "salto novo": lambda: client.post("/api/v1/jumps/", json={"date": str(next(days)), **jump}, headers=headers),
+        "salto mesmo dia": lambda: client.post("/api/v1/jumps/", json={"date": first["date"], **jump}, headers=headers),
+        "edição de salto": lambda: client.put(f"/api/v1/jumps/{first['id']}", json={"jump1": 42.0}, headers=headers),
+        "marca nova": lambda: client.post("/api/v1/marks/", json=mark, headers=headers),
+        "edição de marca": lambda: client.put(f"/api/v1/marks/{mark_id}", json={"vento": 2.4}, headers=headers),
+        "edição de perfil": lambda: client.put("/api/v1/athletes/me", json={"nome": "Atleta"}, headers=headers),
+    }
+
+    rows = []
+    for name, write in writes.items():
+        # A primeira gravação cria o resumo do atleta; conta a partir da segunda
+        write()
+        statements.clear()
+        response = write()
+        assert response.status_code < 300, response.text
+        total = len(statements)
+        writes_sql = sum(1 for sql in statements if sql.lstrip().split()[0].upper() in ("INSERT", "UPDATE"))
+        timing = measure(write)
+        rows.append([name, total, writes_sql, timing["p50"], timing["p99"]])
+
+    print_table(
+        "Gravações — instruções SQL por requisição e latência (ms)",
+        ["operação", "instruções", "insert/update", "p50", "p99"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Reconstrói as tabelas athlete_summaries e athlete_monthly_summaries a
+partir de jumps e marks.
+
+Uso:
+    python rebuild_athlete_summaries.py                 # todos os atletas
+    python rebuild_athlete_summaries.py --athlete-id ID # apenas um atleta
+"""
+import argparse
+import sys
+from pathlib import Path
+
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from app.db.session import SessionLocal
+from app.crud import summary as crud_summary
+import app.models  # noqa: F401  (registra todos os modelos)
+
+
+def rebuild_summaries(athlete_id: str = None, batch_size: int = 100):
+    """Recalcula os resumos, fazendo commit a cada ``batch_size`` atletas."""
+    db = SessionLocal()
+    try:
+        athlete_ids = [athlete_id] if athlete_id else crud_summary.get_athlete_ids_with_history(db)
+        print(f"🔄 Reconstruindo resumos de {len(athlete_ids)} atleta(s)...")
+        
+        for i, current_id in enumerate(athlete_ids, start=1):
+            crud_summary.rebuild_summary(db, current_id)
+            if i % batch_size == 0:
+                db.commit()
+                print(f"   {i}/{len(athlete_ids)}")
+        
+        db.commit()
+        print("✅ Resumos reconstruídos!")
+    except Exception as e:
+        print(f"❌ Erro: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reconstrói athlete_summaries")
+    parser.add_argument("--athlete-id", help="Reconstrói apenas este atleta")
+    args = parser.parse_args()
+    rebuild_summaries(args.athlete_id)
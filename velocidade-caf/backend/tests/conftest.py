@@ -0,0 +1,74 @@
+"""
+Fixtures dos testes: banco SQLite temporário e atletas/treinadores
+autenticados.
+
+A DATABASE_URL precisa ser definida antes de importar ``app``, pois a
+engine é criada na importação.
+"""
+import os
+import tempfile
+import uuid
+
+import pytest
+
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "test.db")
+os.environ["PASSWORD_HASH_WORKERS"] = "0"
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.core.security import create_access_token  # noqa: E402
+from app.db.session import Base, SessionLocal, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models import AthleteProfile, CoachProfile, User  # noqa: E402
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database():
+    """Cria as tabelas uma vez; cada teste usa usuários novos."""
+    # SQLite não possui gen_random_uuid(); o default do app gera os IDs
+    for table in Base.metadata.tables.values():
+        for column in table.columns:
+            default = getattr(column.server_default, "arg", None)
+            if default is not None and "gen_random_uuid" in str(default):
+                column.server_default = None
+    Base.metadata.create_all(engine)
+    yield
+    Base.metadata.drop_all(engine)
+
+
+@pytest.fixture(scope="session")
+def client():
+    return TestClient(app)
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def _create_user(role: str, profile_cls, **profile_fields) -> dict:
+    with SessionLocal() as session:
+        user = User(id=str(uuid.uuid4()), email=f"{uuid.uuid4().hex}@teste.com", role=role, password_hash="x")
+        profile = profile_cls(id=str(uuid.uuid4()), user_id=user.id, nome=role.title(), **profile_fields)
+        session.add(user)
+        session.flush()
+        session.add(profile)
+        session.commit()
+        token = create_access_token(data={"sub": user.id, "email": user.email, "role": role})
+        return {"user_id": user.id, "profile_id": profile.id, "headers": {"Authorization": f"Bearer {token}"}}
+
+
+@pytest.fixture
+def coach() -> dict:
+    """Treinador com perfil: ``user_id``, ``profile_id`` e ``headers``."""
+    return _create_user("treinador", CoachProfile)
+
+
+@pytest.fixture
+def athlete(coach) -> dict:
+    """Atleta do ``coach``, sem saltos nem marcas."""
+    return _create_user("atleta", AthleteProfile, coach_id=coach["profile_id"])
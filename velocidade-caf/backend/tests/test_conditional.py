@@ -0,0 +1,79 @@
+"""
+GET condicional: 200 com ETag, 304 com If-None-Match e 200 de novo
+depois de uma escrita.
+"""
+from datetime import date
+
+from app.api.v1 import jumps as jumps_routes
+
+
+def _jump(day: str) -> dict:
+    return {"date": day, "jump1": 40.0, "jump2": 41.0, "jump3": 42.0}
+
+
+def _mark(resultado: float) -> dict:
+    return {"evento": "100m", "resultado": resultado, "data": "2025-02-01", "tipo": "competicao", "athlete_id": "x"}
+
+
+def test_jumps_revalidate_until_write(client, athlete):
+    headers = athlete["headers"]
+    client.post("/api/v1/jumps/", json=_jump("2025-01-10"), headers=headers)
+
+    first = client.get("/api/v1/jumps/me", headers=headers)
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+
+    cached = client.get("/api/v1/jumps/me", headers={**headers, "If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["ETag"] == etag
+
+    client.post("/api/v1/jumps/", json=_jump("2025-01-11"), headers=headers)
+
+    fresh = client.get("/api/v1/jumps/me", headers={**headers, "If-None-Match": etag})
+    assert fresh.status_code == 200
+    assert fresh.headers["ETag"] != etag
+    assert len(fresh.json()) == 2
+
+
+def test_marks_revalidate_until_write(client, athlete):
+    headers = athlete["headers"]
+    client.post("/api/v1/marks/", json=_mark(11.0), headers=headers)
+
+    etag = client.get("/api/v1/marks/me/records", headers=headers).headers["ETag"]
+    assert client.get("/api/v1/marks/me/records", headers={**headers, "If-None-Match": etag}).status_code == 304
+
+    client.post("/api/v1/marks/", json=_mark(10.8), headers=headers)
+
+    fresh = client.get("/api/v1/marks/me/records", headers={**headers, "If-None-Match": etag})
+    assert fresh.status_code == 200
+    assert fresh.headers["ETag"] != etag
+
+
+def test_calendar_default_year_is_part_of_etag(client, athlete, monkeypatch):
+    headers = athlete["headers"]
+    client.post("/api/v1/jumps/", json=_jump("2025-06-01"), headers=headers)
+
+    class FrozenDate(date):
+        current = date(2025, 12, 31)
+
+        @classmethod
+        def today(cls):
+            return cls.current
+
+    monkeypatch.setattr(jumps_routes, "date", FrozenDate)
+
+    first = client.get("/api/v1/jumps/me/calendar", headers=headers)
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    assert client.get("/api/v1/jumps/me/calendar", headers={**headers, "If-None-Match": etag}).status_code == 304
+
+    # Virada do ano sem escritas: a mesma URL passa a ser outro calendário
+    FrozenDate.current = date(2026, 1, 1)
+    next_year = client.get("/api/v1/jumps/me/calendar", headers={**headers, "If-None-Match": etag})
+    assert next_year.status_code == 200
+    assert next_year.headers["ETag"] != etag
+    assert next_year.json()["ano"] == 2026
+
+    explicit = client.get("/api/v1/jumps/me/calendar?ano=2025", headers={**headers, "If-None-Match": etag})
+    assert explicit.status_code == 304
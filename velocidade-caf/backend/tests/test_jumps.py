@@ -0,0 +1,41 @@
+"""
+Estatísticas de saltos agregadas no banco: mesmos valores de Jump.average
+(round() do Python), inclusive nos empates de arredondamento (x,xx5).
+"""
+from app.crud import jump as crud_jump
+from app.models import Jump
+
+# Médias em empate: 30.125 é exato em binário (round -> 30.12, para o
+# par); 30.135 fica logo acima do empate (round -> 30.14)
+TIES = [(30.125, 30.125, 30.125), (30.135, 30.135, 30.135), (20.5, 20.5, 20.375)]
+
+
+def _post(client, headers, day: str, values) -> None:
+    jump1, jump2, jump3 = values
+    response = client.post("/api/v1/jumps/", json={"date": day, "jump1": jump1, "jump2": jump2, "jump3": jump3}, headers=headers)
+    assert response.status_code == 201
+
+
+def _expected(rows) -> float:
+    averages = [Jump(jump1=a, jump2=b, jump3=c).average for a, b, c in rows]
+    return round(sum(averages) / len(averages), 2)
+
+
+def test_single_tie_keeps_python_rounding(client, athlete, db):
+    _post(client, athlete["headers"], "2025-01-01", TIES[0])
+
+    stats = crud_jump.get_jump_statistics(db, athlete["user_id"])
+    assert stats["media_geral"] == Jump(jump1=30.125, jump2=30.125, jump3=30.125).average == 30.12
+
+
+def test_statistics_match_jump_average(client, athlete, db):
+    rows = TIES + [(40.0, 41.5, 39.2), (52.11, 48.07, 50.5)]
+    for i, values in enumerate(rows):
+        _post(client, athlete["headers"], f"2025-01-0{i + 1}", values)
+
+    stats = crud_jump.get_jump_statistics(db, athlete["user_id"])
+    assert stats["media_geral"] == _expected(rows)
+    assert stats["total_registros"] == len(rows)
+
+    bulk = crud_jump.get_jump_statistics_bulk(db, [athlete["user_id"]])
+    assert bulk[athlete["user_id"]] == stats
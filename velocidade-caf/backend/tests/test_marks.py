@@ -0,0 +1,57 @@
+"""
+Ritmo por 100 m de Mark: distância do catálogo quando a prova já foi
+carregada, texto do evento nos demais casos, sem consultas extras.
+"""
+from contextlib import contextmanager
+
+from sqlalchemy import event as sa_event, select
+from sqlalchemy.orm import selectinload
+
+from app.crud import event as crud_event
+from app.db.session import engine
+from app.models import Mark
+
+
+@contextmanager
+def count_queries():
+    queries = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        queries.append(statement)
+
+    sa_event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield queries
+    finally:
+        sa_event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def _create_mark(client, headers, evento: str, resultado: float) -> str:
+    mark = {"evento": evento, "resultado": resultado, "data": "2025-02-01", "tipo": "teste", "athlete_id": "x"}
+    return client.post("/api/v1/marks/", json=mark, headers=headers).json()["id"]
+
+
+def test_pace_without_catalog_event_parses_evento():
+    assert Mark(evento="150 metros", resultado=16.5).pace_per_100m == 11.0
+    # Sem distância no texto, o ritmo é o próprio resultado
+    assert Mark(evento="revezamento", resultado=45.0).pace_per_100m == 45.0
+
+
+def test_pace_does_not_lazy_load_event(client, athlete, db):
+    crud_event.seed_events(db)
+    db.commit()
+    headers = athlete["headers"]
+    relay = _create_mark(client, headers, "4x100", 44.0)
+    plain = _create_mark(client, headers, "200m rasos", 22.0)
+
+    marks = {mark.id: mark for mark in db.scalars(select(Mark).where(Mark.id.in_([relay, plain])))}
+    with count_queries() as queries:
+        paces = {mark_id: mark.pace_per_100m for mark_id, mark in marks.items()}
+    assert queries == []
+    assert paces[plain] == 11.0
+
+    db.expunge_all()
+    loaded = db.scalars(select(Mark).where(Mark.id == relay).options(selectinload(Mark.event))).one()
+    assert loaded.event_id == "4x100m"
+    # Com a prova carregada vale a distância do catálogo (400 m)
+    assert loaded.pace_per_100m == 11.0
@@ -0,0 +1,21 @@
+"""
+GET /metrics exige o METRICS_TOKEN; sem ele configurado, a rota não existe.
+"""
+from app.config import settings
+
+
+def test_metrics_disabled_without_token(client, monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_TOKEN", None)
+    assert client.get("/api/v1/metrics/").status_code == 404
+
+
+def test_metrics_require_token(client, coach, monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "coletor")
+
+    assert client.get("/api/v1/metrics/").status_code == 401
+    # O token de acesso de um usuário não vale para as métricas
+    assert client.get("/api/v1/metrics/", headers=coach["headers"]).status_code == 401
+
+    response = client.get("/api/v1/metrics/", headers={"Authorization": "Bearer coletor"})
+    assert response.status_code == 200
+    assert set(response.json()) == {"pool", "token_cache", "realtime"}
@@ -0,0 +1,87 @@
+"""
+Paginação por cursor (header X-Next-Cursor) das listagens de marcas e
+saltos, nos modos rápido (FAST_JSON_RESPONSES) e ORM.
+"""
+import base64
+
+import pytest
+
+from app.config import settings
+from app.core.pagination import NEXT_CURSOR_HEADER
+
+
+@pytest.fixture(params=[True, False], ids=["fast_json", "orm"])
+def fast_json(request, monkeypatch):
+    monkeypatch.setattr(settings, "FAST_JSON_RESPONSES", request.param)
+    return request.param
+
+
+def _create_marks(client, headers, count: int, data: str = "2025-04-01") -> list:
+    ids = []
+    for i in range(count):
+        mark = {"evento": "100m", "resultado": 11.0 + i / 10, "data": data, "tipo": "teste", "athlete_id": "x"}
+        ids.append(client.post("/api/v1/marks/", json=mark, headers=headers).json()["id"])
+    return ids
+
+
+def _pages(client, url: str, headers, limit: int) -> list:
+    """Percorre a listagem seguindo o cursor; retorna cada página com o seu header."""
+    pages = []
+    cursor = None
+    while True:
+        params = {"limit": limit, **({"cursor": cursor} if cursor else {})}
+        response = client.get(url, params=params, headers=headers)
+        assert response.status_code == 200
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        pages.append((response.json(), cursor))
+        if cursor is None:
+            return pages
+
+
+def test_same_date_marks_are_neither_skipped_nor_repeated(client, athlete, fast_json):
+    headers = athlete["headers"]
+    ids = _create_marks(client, headers, 7)
+    _create_marks(client, headers, 2, data="2025-03-01")
+
+    pages = _pages(client, "/api/v1/marks/me", headers, limit=3)
+    assert [(len(items), cursor is not None) for items, cursor in pages] == [(3, True), (3, True), (3, True), (0, False)]
+
+    listed = [item["id"] for items, _ in pages for item in items]
+    assert len(listed) == len(set(listed)) == 9
+    # Ordem (data desc, id desc): as marcas do mesmo dia vêm primeiro
+    assert listed[:7] == sorted(ids, reverse=True)
+
+
+def test_next_cursor_only_on_full_pages(client, athlete, fast_json):
+    headers = athlete["headers"]
+    _create_marks(client, headers, 5)
+
+    pages = _pages(client, "/api/v1/marks/me", headers, limit=3)
+    assert [(len(items), cursor is not None) for items, cursor in pages] == [(3, True), (2, False)]
+
+    # Última página exatamente cheia: o cursor leva a uma página vazia, sem header
+    pages = _pages(client, "/api/v1/marks/me", headers, limit=5)
+    assert [(len(items), cursor is not None) for items, cursor in pages] == [(5, True), (0, False)]
+
+
+def test_jump_pages_follow_cursor(client, athlete, fast_json):
+    headers = athlete["headers"]
+    days = [f"2025-05-0{day}" for day in range(1, 6)]
+    for day in days:
+        client.post("/api/v1/jumps/", json={"date": day, "jump1": 40, "jump2": 41, "jump3": 42}, headers=headers)
+
+    pages = _pages(client, "/api/v1/jumps/me", headers, limit=2)
+    assert [len(items) for items, _ in pages] == [2, 2, 1]
+    assert [item["date"] for items, _ in pages for item in items] == sorted(days, reverse=True)
+
+
+@pytest.mark.parametrize("cursor", [
+    "nao-e-base64!",
+    base64.urlsafe_b64encode(b"{}").decode(),
+    base64.urlsafe_b64encode(b'["2025-13-01","x"]').decode(),
+])
+def test_malformed_cursor_is_400(client, athlete, cursor):
+    for url in ("/api/v1/marks/me", "/api/v1/jumps/me"):
+        response = client.get(url, params={"cursor": cursor}, headers=athlete["headers"])
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Cursor inválido"
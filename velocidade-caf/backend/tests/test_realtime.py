@@ -0,0 +1,34 @@
+"""
+Autenticação do stream de eventos: o token de acesso não vai na URL;
+o navegador usa um ticket de curta duração e escopo único.
+"""
+from datetime import timedelta
+
+from app.core.security import STREAM_TICKET_SCOPE, create_access_token
+
+
+def test_ticket_is_only_for_coaches(client, coach, athlete):
+    response = client.post("/api/v1/realtime/ticket", headers=coach["headers"])
+    assert response.status_code == 200
+    assert response.json()["ticket"]
+
+    assert client.post("/api/v1/realtime/ticket", headers=athlete["headers"]).status_code == 403
+
+
+def test_ticket_is_not_an_access_token(client, coach):
+    ticket = client.post("/api/v1/realtime/ticket", headers=coach["headers"]).json()["ticket"]
+    assert client.get("/api/v1/coaches/me", headers={"Authorization": f"Bearer {ticket}"}).status_code == 401
+
+
+def test_stream_rejects_access_token_in_url(client, coach):
+    token = coach["headers"]["Authorization"].split()[1]
+    assert client.get("/api/v1/realtime/coach", params={"token": token}).status_code == 401
+    assert client.get("/api/v1/realtime/coach", params={"ticket": token}).status_code == 401
+
+
+def test_stream_rejects_expired_ticket(client, coach):
+    expired = create_access_token(
+        {"scope": STREAM_TICKET_SCOPE, "coach": coach["profile_id"]},
+        expires_delta=timedelta(seconds=-1),
+    )
+    assert client.get("/api/v1/realtime/coach", params={"ticket": expired}).status_code == 401
@@ -0,0 +1,149 @@
+"""
+O resumo materializado (AthleteSummary e agregados mensais), mantido de
+forma incremental pelas escritas, deve ser igual ao recalculado do zero
+por rebuild_summary.
+"""
+from sqlalchemy import select
+
+from app.config import settings
+from app.crud import summary as crud_summary
+from app.db.session import SessionLocal
+from app.models import AthleteMonthlySummary
+
+JUMP_FIELDS = ("total_saltos", "soma_medias", "melhor_salto", "ultimo_salto", "media_7", "media_28")
+MARK_FIELDS = ("total_marcas", "ultima_competicao", "recordes")
+
+
+def _state(db, athlete_id: str, fields) -> dict:
+    summary = crud_summary.get_summary(db, athlete_id)
+    state = {field: getattr(summary, field) for field in fields}
+    if "total_saltos" in fields:
+        state["meses"] = [
+            (row.mes, row.total_saltos, row.melhor_salto, row.media, row.consistencia)
+            for row in db.scalars(
+                select(AthleteMonthlySummary)
+                .where(AthleteMonthlySummary.athlete_id == athlete_id)
+                .order_by(AthleteMonthlySummary.mes)
+            )
+        ]
+    return state
+
+
+def assert_matches_rebuild(athlete_id: str, fields) -> None:
+    """Compara o resumo gravado com o de rebuild_summary (descartado em seguida)."""
+    with SessionLocal() as db:
+        incremental = _state(db, athlete_id, fields)
+    with SessionLocal() as db:
+        crud_summary.rebuild_summary(db, athlete_id)
+        db.flush()
+        rebuilt = _state(db, athlete_id, fields)
+        db.rollback()
+    assert incremental == rebuilt
+
+
+def _versions(athlete_id: str):
+    with SessionLocal() as db:
+        summary = crud_summary.get_summary(db, athlete_id)
+        return (summary.versao_saltos, summary.versao_marcas) if summary else (0, 0)
+
+
+def _jump(day: str, *values) -> dict:
+    jump1, jump2, jump3 = values or (40.0, 41.0, 42.0)
+    return {"date": day, "jump1": jump1, "jump2": jump2, "jump3": jump3}
+
+
+def _mark(evento: str, resultado: float, data: str = "2025-02-01", tipo: str = "competicao") -> dict:
+    return {"evento": evento, "resultado": resultado, "vento": 1.0, "data": data, "tipo": tipo, "athlete_id": "x"}
+
+
+def test_jump_writes_match_rebuild(client, athlete):
+    headers, user_id = athlete["headers"], athlete["user_id"]
+
+    # Médias em empate de arredondamento (30.125, 30.135) no meio da série
+    values = [(40, 41.5, 39.2), (30.125, 30.125, 30.125), (30.135, 30.135, 30.135), (43, 41.5, 39.2)]
+    ids = []
+    for i, day in enumerate(["2025-01-30", "2025-02-01", "2025-02-03", "2025-03-10"]):
+        response = client.post("/api/v1/jumps/", json=_jump(day, *values[i]), headers=headers)
+        assert response.status_code == 201
+        ids.append(response.json()["id"])
+        assert _versions(user_id) == (i + 1, 0)
+        assert_matches_rebuild(user_id, JUMP_FIELDS)
+
+    # Novo envio no mesmo dia sobrescreve o registro
+    response = client.post("/api/v1/jumps/", json=_jump("2025-02-01", 55, 50, 45), headers=headers)
+    assert response.json()["id"] == ids[1]
+    assert _versions(user_id) == (5, 0)
+    assert_matches_rebuild(user_id, JUMP_FIELDS)
+
+    assert client.put(f"/api/v1/jumps/{ids[0]}", json={"jump1": 60}, headers=headers).status_code == 200
+    assert _versions(user_id) == (6, 0)
+    assert_matches_rebuild(user_id, JUMP_FIELDS)
+
+    # Remover o único salto de março apaga o agregado do mês
+    assert client.delete(f"/api/v1/jumps/{ids[3]}", headers=headers).status_code == 204
+    assert _versions(user_id) == (7, 0)
+    assert_matches_rebuild(user_id, JUMP_FIELDS)
+
+
+def test_import_matches_rebuild_after_each_chunk(client, athlete, monkeypatch):
+    headers, user_id = athlete["headers"], athlete["user_id"]
+    client.post("/api/v1/jumps/", json=_jump("2024-01-10"), headers=headers)
+    monkeypatch.setattr(settings, "IMPORT_CHUNK_SIZE", 2)
+
+    body = "date,jump1,jump2,jump3\n" + "".join(
+        f"2024-0{month}-1{day},{40 + day},41,42\n" for month in (1, 2, 3) for day in range(2)
+    )
+    response = client.post("/api/v1/jumps/import", content=body, headers={**headers, "Content-Type": "text/csv"})
+    assert response.status_code == 200
+    assert response.json()["gravadas"] == 6
+
+    # Um incremento de versão por lote gravado
+    assert _versions(user_id) == (1 + 3, 0)
+    assert_matches_rebuild(user_id, JUMP_FIELDS)
+
+
+def test_mark_writes_match_rebuild(client, athlete):
+    headers, profile_id = athlete["headers"], athlete["profile_id"]
+
+    ids = []
+    for i, (evento, resultado, tipo) in enumerate([
+        ("100m", 11.2, "competicao"),
+        ("100m", 10.9, "teste"),
+        ("200m", 23.1, "competicao"),
+    ]):
+        response = client.post("/api/v1/marks/", json=_mark(evento, resultado, f"2025-02-0{i + 1}", tipo), headers=headers)
+        assert response.status_code == 201
+        ids.append(response.json()["id"])
+        assert _versions(profile_id) == (0, i + 1)
+        assert_matches_rebuild(profile_id, MARK_FIELDS)
+
+    assert client.put(f"/api/v1/marks/{ids[0]}", json={"resultado": 10.5}, headers=headers).status_code == 200
+    assert _versions(profile_id) == (0, 4)
+    assert_matches_rebuild(profile_id, MARK_FIELDS)
+
+    # Remover o recorde devolve o recorde anterior
+    assert client.delete(f"/api/v1/marks/{ids[0]}", headers=headers).status_code == 204
+    assert _versions(profile_id) == (0, 5)
+    assert_matches_rebuild(profile_id, MARK_FIELDS)
+
+
+def test_sync_batch_matches_rebuild(client, athlete):
+    headers, user_id, profile_id = athlete["headers"], athlete["user_id"], athlete["profile_id"]
+    existing = client.post("/api/v1/jumps/", json=_jump("2025-01-05"), headers=headers).json()["id"]
+
+    response = client.post("/api/v1/sync/", json={"mutacoes": [
+        {"chave": "a", "operacao": "criar", "tipo": "salto", "dados": _jump("2025-01-06", 45, 44, 43)},
+        {"chave": "b", "operacao": "criar", "tipo": "salto", "dados": _jump("2025-02-06")},
+        {"chave": "c", "operacao": "atualizar", "tipo": "salto", "ref": "b", "dados": {"jump2": 50}},
+        {"chave": "d", "operacao": "remover", "tipo": "salto", "id": existing},
+        {"chave": "e", "operacao": "criar", "tipo": "marca", "dados": _mark("100m", 11.0)},
+        {"chave": "f", "operacao": "criar", "tipo": "marca", "dados": _mark("100m", 10.8)},
+    ]}, headers=headers)
+    assert response.status_code == 200
+    assert {r["status"] for r in response.json()["resultados"]} == {"aplicada"}
+
+    # Um único recálculo por lote
+    assert _versions(user_id) == (2, 0)
+    assert _versions(profile_id) == (0, 1)
+    assert_matches_rebuild(user_id, JUMP_FIELDS)
+    assert_matches_rebuild(profile_id, MARK_FIELDS)
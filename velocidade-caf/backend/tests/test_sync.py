@@ -0,0 +1,117 @@
+"""
+Sincronização offline: idempotência por ``chave``, conflito de versão e
+atomicidade do lote.
+"""
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+
+from app.crud import mark as crud_mark, summary as crud_summary, sync as crud_sync
+from app.db.session import SessionLocal
+from app.models import Jump, Mark
+from app.models.sync import AppliedMutation
+
+
+def _jump(day: str, jump1: float = 40.0) -> dict:
+    return {"date": day, "jump1": jump1, "jump2": 41.0, "jump3": 42.0}
+
+
+def _mark(resultado: float) -> dict:
+    return {"evento": "100m", "resultado": resultado, "data": "2025-02-01", "tipo": "competicao", "athlete_id": "x"}
+
+
+def _sync(client, headers, *mutacoes):
+    return client.post("/api/v1/sync/", json={"mutacoes": list(mutacoes)}, headers=headers)
+
+
+def _counts(user_id: str, profile_id: str):
+    with SessionLocal() as db:
+        jumps = db.scalar(select(func.count()).select_from(Jump).where(Jump.athlete_id == user_id))
+        marks = db.scalar(select(func.count()).select_from(Mark).where(Mark.athlete_id == profile_id))
+        applied = db.scalar(select(func.count()).select_from(AppliedMutation).where(AppliedMutation.user_id == user_id))
+        summary = crud_summary.get_summary(db, user_id)
+        return jumps, marks, applied, summary.versao_saltos if summary else 0
+
+
+def test_replayed_key_returns_stored_result(client, athlete):
+    headers, user_id, profile_id = athlete["headers"], athlete["user_id"], athlete["profile_id"]
+    batch = (
+        {"chave": "salto-1", "operacao": "criar", "tipo": "salto", "dados": _jump("2025-03-01")},
+        {"chave": "marca-1", "operacao": "criar", "tipo": "marca", "dados": _mark(11.0)},
+    )
+
+    first = _sync(client, headers, *batch).json()["resultados"]
+    assert [r["repetida"] for r in first] == [False, False]
+    before = _counts(user_id, profile_id)
+    assert before[:3] == (1, 1, 2)
+
+    # Reenvio do mesmo lote (ex.: a resposta se perdeu na rede)
+    replay = _sync(client, headers, *batch)
+    assert replay.status_code == 200
+    results = replay.json()["resultados"]
+    assert [r["repetida"] for r in results] == [True, True]
+    assert [(r["status"], r["id"]) for r in results] == [(r["status"], r["id"]) for r in first]
+    assert _counts(user_id, profile_id) == before
+
+
+def test_version_mismatch_is_conflict_without_write(client, athlete):
+    headers, user_id, profile_id = athlete["headers"], athlete["user_id"], athlete["profile_id"]
+    jump = client.post("/api/v1/jumps/", json=_jump("2025-03-02"), headers=headers).json()
+    before = _counts(user_id, profile_id)
+
+    response = _sync(client, headers, {
+        "chave": "editar-1",
+        "operacao": "atualizar",
+        "tipo": "salto",
+        "id": jump["id"],
+        "dados": {"jump1": 55.0},
+        # Versão anterior à gravada no servidor
+        "atualizado_em": "2000-01-01T00:00:00+00:00",
+    })
+    assert response.status_code == 200
+    result = response.json()["resultados"][0]
+    assert result["status"] == "conflito"
+    assert result["id"] == jump["id"]
+
+    assert client.get(f"/api/v1/jumps/{jump['id']}", headers=headers).json()["jump1"] == jump["jump1"]
+    jumps, marks, applied, versao = _counts(user_id, profile_id)
+    # Só o registro da chave é gravado; o resumo não muda
+    assert (jumps, marks, versao) == (before[0], before[1], before[3])
+    assert applied == before[2] + 1
+
+
+def test_failing_mutation_rolls_back_batch(client, athlete, monkeypatch):
+    headers, user_id, profile_id = athlete["headers"], athlete["user_id"], athlete["profile_id"]
+    batch = (
+        {"chave": "salto-2", "operacao": "criar", "tipo": "salto", "dados": _jump("2025-03-03")},
+        {"chave": "marca-2", "operacao": "criar", "tipo": "marca", "dados": _mark(10.9)},
+    )
+
+    def failing_insert(db, values):
+        raise IntegrityError("INSERT INTO marks", values, Exception("CHECK constraint failed: check_vento_range"))
+
+    monkeypatch.setattr(crud_mark, "insert_mark_row", failing_insert)
+    response = _sync(client, headers, *batch)
+    # Dados recusados pelo banco não são "reenvie": a resposta aponta a mutação
+    assert response.status_code == 422
+    assert "marca-2" in response.json()["detail"]
+    assert _counts(user_id, profile_id) == (0, 0, 0, 0)
+
+    # Nada ficou registrado: o reenvio aplica o lote normalmente
+    monkeypatch.undo()
+    results = _sync(client, headers, *batch).json()["resultados"]
+    assert [(r["status"], r["repetida"]) for r in results] == [("aplicada", False), ("aplicada", False)]
+    assert _counts(user_id, profile_id) == (1, 1, 2, 1)
+
+
+def test_concurrent_batch_with_same_keys_is_409(client, athlete, monkeypatch):
+    headers, user_id, profile_id = athlete["headers"], athlete["user_id"], athlete["profile_id"]
+    mutation = {"chave": "salto-3", "operacao": "criar", "tipo": "salto", "dados": _jump("2025-03-04")}
+    _sync(client, headers, mutation)
+    before = _counts(user_id, profile_id)
+
+    # Simula o lote paralelo: as chaves ainda não eram vistas ao começar
+    monkeypatch.setattr(crud_sync, "get_applied_mutations", lambda db, user_id, keys: {})
+    response = _sync(client, headers, {**mutation, "dados": _jump("2025-03-04", 50.0)})
+    assert response.status_code == 409
+    assert _counts(user_id, profile_id) == before
+    assert client.get("/api/v1/jumps/me", headers=headers).json()[0]["jump1"] == 40.0
@@ -213,6 +213,18 @@ async function deleteAccount() {
 }
 
 /* === EXPORTAR DADOS === */
+// Baixa uma exportação NDJSON (/export/...) e devolve a lista de registros
+async function fetchExport(path) {
+  const response = await fetch(`${API_BASE_URL}${path}?formato=ndjson`, {
+    headers: getHeaders()
+  });
+  if (!response.ok) {
+    return null;
+  }
+  const text = await response.text();
+  return text.split('\n').filter(line => line.trim()).map(line => JSON.parse(line));
+}
+
 async function exportData() {
   try {
     const userRole = localStorage.getItem('userRole');
@@ -242,19 +254,15 @@ async function exportData() {
       }
       
       // Jumps
-      const jumpsResponse = await fetch(`${API_BASE_URL}/jumps/me?limit=1000`, {
-        headers: getHeaders()
-      });
-      if (jumpsResponse.ok) {
-        data.jumps = await jumpsResponse.json();
+      const jumps = await fetchExport('/export/jumps');
+      if (jumps) {
+        data.jumps = jumps;
       }
       
       // Marks
-      const marksResponse = await fetch(`${API_BASE_URL}/marks/me?limit=1000`, {
-        headers: getHeaders()
-      });
-      if (marksResponse.ok) {
-        data.marks = await marksResponse.json();
+      const marks = await fetchExport('/export/marks');
+      if (marks) {
+        data.marks = marks;
       }
     } else {
       // Coach profile
@@ -272,6 +280,16 @@ async function exportData() {
       if (athletesResponse.ok) {
         data.athletes = await athletesResponse.json();
       }
+      
+      // Histórico da equipe
+      const rosterJumps = await fetchExport('/export/roster/jumps');
+      if (rosterJumps) {
+        data.roster_jumps = rosterJumps;
+      }
+      const rosterMarks = await fetchExport('/export/roster/marks');
+      if (rosterMarks) {
+        data.roster_marks = rosterMarks;
+      }
     }
     
     // Download JSON
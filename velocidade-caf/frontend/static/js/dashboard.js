@@ -47,6 +47,7 @@ document.addEventListener('DOMContentLoaded', () => {
   loadCoachName();
   loadDashboardStats();
   loadMyAthletes();
+  subscribeToAthleteEvents();
   setupLogout();
 });
 
@@ -71,41 +72,43 @@ async function loadCoachName() {
   }
 }
 
+/* === CARREGAR PAINEL (elenco + estatísticas em uma única chamada) === */
+async function fetchDashboard() {
+  const response = await fetch(`${API_BASE_URL}/coaches/me/dashboard?limit=200`, {
+    headers: getHeaders()
+  });
+  
+  if (response.status === 401) {
+    logoutNow();
+    return null;
+  }
+  
+  return response.ok ? response.json() : null;
+}
+
+let dashboardPromise = null;
+
+function getDashboard() {
+  if (!dashboardPromise) {
+    dashboardPromise = fetchDashboard();
+  }
+  return dashboardPromise;
+}
+
 /* === CARREGAR ESTATÍSTICAS DO DASHBOARD === */
 async function loadDashboardStats() {
   try {
-    // Buscar atletas do treinador
-    const athletesResponse = await fetch(`${API_BASE_URL}/coaches/me/athletes`, {
-      headers: getHeaders()
-    });
+    const dashboard = await getDashboard();
     
-    if (athletesResponse.ok) {
-      const athletes = await athletesResponse.json();
-      
-      document.getElementById('total-atletas').textContent = athletes.length;
+    if (dashboard) {
+      document.getElementById('total-atletas').textContent = dashboard.total;
       
-      // Buscar estatísticas de cada atleta
       let totalTreinos = 0;
       let totalProvas = 0;
       
-      for (const athlete of athletes) {
-        // Saltos
-        const jumpsResponse = await fetch(`${API_BASE_URL}/jumps/athlete/${athlete.id}`, {
-          headers: getHeaders()
-        });
-        if (jumpsResponse.ok) {
-          const jumps = await jumpsResponse.json();
-          totalTreinos += jumps.length;
-        }
-        
-        // Marcas
-        const marksResponse = await fetch(`${API_BASE_URL}/marks/athlete/${athlete.id}`, {
-          headers: getHeaders()
-        });
-        if (marksResponse.ok) {
-          const marks = await marksResponse.json();
-          totalProvas += marks.length;
-        }
+      for (const entry of dashboard.atletas) {
+        totalTreinos += entry.estatisticas_saltos.total_registros;
+        totalProvas += entry.total_marcas;
       }
       
       document.getElementById('total-treinos').textContent = totalTreinos;
@@ -122,28 +125,24 @@ async function loadDashboardStats() {
 }
 
 /* === CARREGAR MEUS ATLETAS === */
-async function loadMyAthletes() {
+async function loadMyAthletes(showLoading = true) {
   const container = document.getElementById('athletes-list');
   if (!container) return;
   
-  container.innerHTML = '<p class="muted">Carregando atletas...</p>';
+  if (showLoading) {
+    container.innerHTML = '<p class="muted">Carregando atletas...</p>';
+  }
   
   try {
-    const response = await fetch(`${API_BASE_URL}/coaches/me/athletes`, {
-      headers: getHeaders()
-    });
+    const dashboard = await getDashboard();
     
-    if (response.ok) {
-      const athletes = await response.json();
-      
-      if (athletes.length === 0) {
+    if (dashboard) {
+      if (dashboard.atletas.length === 0) {
         container.innerHTML = '<p class="muted">Você ainda não tem atletas cadastrados.</p>';
         return;
       }
       
-      displayAthletes(athletes);
-    } else if (response.status === 401) {
-      logoutNow();
+      displayAthletes(dashboard.atletas);
     } else {
       container.innerHTML = '<p class="muted">Erro ao carregar atletas</p>';
     }
@@ -154,25 +153,13 @@ async function loadMyAthletes() {
 }
 
 /* === EXIBIR ATLETAS === */
-async function displayAthletes(athletes) {
+function displayAthletes(entries) {
   const container = document.getElementById('athletes-list');
   if (!container) return;
   
-  const athletesWithStats = await Promise.all(athletes.map(async (athlete) => {
-    // Buscar última atividade
-    const jumpsResponse = await fetch(`${API_BASE_URL}/jumps/athlete/${athlete.id}?limit=1`, {
-      headers: getHeaders()
-    });
-    
-    let lastActivity = 'Sem atividade';
-    if (jumpsResponse.ok) {
-      const jumps = await jumpsResponse.json();
-      if (jumps.length > 0) {
-        lastActivity = formatDate(jumps[0].date);
-      }
-    }
-    
-    return { ...athlete, lastActivity };
+  const athletesWithStats = entries.map(entry => ({
+    ...entry.atleta,
+    lastActivity: entry.ultimo_salto ? formatDate(entry.ultimo_salto.date) : 'Sem atividade'
   }));
   
   container.innerHTML = athletesWithStats.map(athlete => `
@@ -192,6 +179,51 @@ async function displayAthletes(athletes) {
   `).join('');
 }
 
+/* === ATUALIZAÇÃO EM TEMPO REAL (eventos dos atletas) === */
+let refreshTimer = null;
+
+function scheduleRefresh() {
+  // Agrupa rajadas de eventos (ex.: sincronização offline) em uma recarga
+  clearTimeout(refreshTimer);
+  refreshTimer = setTimeout(() => {
+    dashboardPromise = null;
+    loadDashboardStats();
+    loadMyAthletes(false);
+  }, 1000);
+}
+
+async function subscribeToAthleteEvents(reconnecting = false) {
+  if (!window.EventSource) return;
+  
+  // EventSource não envia headers: em vez do token de acesso, a URL leva
+  // um ticket de curta duração, válido só para abrir o stream
+  let ticket;
+  try {
+    const response = await fetch(`${API_BASE_URL}/realtime/ticket`, { method: 'POST', headers: getHeaders() });
+    if (!response.ok) return;
+    ticket = (await response.json()).ticket;
+  } catch (error) {
+    setTimeout(() => subscribeToAthleteEvents(true), 5000);
+    return;
+  }
+  
+  const source = new EventSource(`${API_BASE_URL}/realtime/coach?ticket=${encodeURIComponent(ticket)}`);
+  let connected = false;
+  
+  // Ao reconectar, eventos do intervalo podem ter sido perdidos
+  source.addEventListener('open', () => {
+    if (connected || reconnecting) scheduleRefresh();
+    connected = true;
+  });
+  // Reconexão recusada (ticket expirado): pede um ticket novo
+  source.addEventListener('error', () => {
+    if (source.readyState === EventSource.CLOSED) {
+      setTimeout(() => subscribeToAthleteEvents(true), 3000);
+    }
+  });
+  ['salto', 'marca', 'perdidos'].forEach(type => source.addEventListener(type, scheduleRefresh));
+}
+
 /* === VER DETALHES DO ATLETA === */
 function viewAthleteDetails(athleteId) {
   window.location.href = `/coach-analise.html?athlete=${athleteId}`;
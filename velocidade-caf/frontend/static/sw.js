@@ -85,7 +85,12 @@ self.addEventListener('fetch', event => {
   if (url.origin !== location.origin && !url.hostname.includes('cdn')) {
     return;
   }
-  
+
+  // Streams de eventos (EventSource) não terminam: não passam pelo cache
+  if (request.headers.get('Accept') === 'text/event-stream') {
+    return;
+  }
+
   // Estratégia para chamadas de API
   if (url.pathname.startsWith('/api/')) {
     event.respondWith(networkFirst(request));